@@ -12,21 +12,22 @@ from utils.webpage_analyzer import (
     is_followup_question
 )
 from utils.providers import (
+    ProviderPool,
     select_best_provider_with_priority,
-    select_random_available_provider,
     get_client
 )
 from utils.query_analyzer import (
     needs_search,
-    extract_city_from_query,
-    extract_city_from_time_query,
-    extract_league_from_query,
     is_drug_inquiry,
     extract_drug_name,
     is_paper_search,
     extract_keywords_for_paper_search,
     is_time_query,
     is_pharmacy_search,  
+    build_query_cache_key,
+    analyze_query,
+    plan_fanout,
+    FANOUT_INTENTS,
     LEAGUE_MAPPING
 )
 # Import weather, football, drug, paper search, culture event, and web search modules
@@ -38,6 +39,15 @@ from utils.culture_event import CultureEventAPI
 from utils.web_search import WebSearchAPI
 from utils.drug_store import DrugStoreAPI  
 from utils.hos import SeoulHospitalAPI
+from utils.cache import MemoryCache
+from utils.cache_backends import create_cache_backend
+from utils.cache_warmer import CacheWarmer, build_default_warm_tasks
+from utils.event_loop import get_background_loop
+from utils.fanout import fan_out
+from utils.llm_executor import LLMBusyError, LLMExecutor
+from utils.morph_analyzer import get_morph_analyzer
+from utils.near_duplicate import NearDuplicateCache
+from utils.prompt_builder import PromptAssembler
 
 # set logger
 logging.basicConfig(level=logging.INFO)  # 디버깅을 위해 INFO 레벨로 변경
@@ -45,43 +55,22 @@ logger = logging.getLogger("HybridChat")
 logging.getLogger("streamlit").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# set cach
-cache = Cache("cache_directory")
-
-class MemoryCache:
-    def __init__(self, max_size=1000):
-        self.cache = {}
-        self.expiry = {}
-        self.max_size = max_size
-        self.access_count = {}
-
-    def get(self, key):
-        if key in self.cache and time.time() < self.expiry[key]:
-            self.access_count[key] = self.access_count.get(key, 0) + 1
-            return self.cache[key]
-        return cache.get(key)
-
-    def setex(self, key, ttl, value):
-        # 캐시 크기 제한
-        if len(self.cache) >= self.max_size:
-            self._evict_least_used()
-
-        self.cache[key] = value
-        self.expiry[key] = time.time() + ttl
-        self.access_count[key] = 1
-        cache.set(key, value, expire=ttl)
-
-    def _evict_least_used(self):
-        """가장 적게 사용된 캐시 항목 제거"""
-        if not self.access_count:
-            return
-
-        least_used_key = min(self.access_count, key=self.access_count.get)
-        self.cache.pop(least_used_key, None)
-        self.expiry.pop(least_used_key, None)
-        self.access_count.pop(least_used_key, None)
-
-cache_handler = MemoryCache()
+# 공유 캐시 백엔드 (memory | disk | redis), replica 여러 개면 redis로 캐시 공유
+cache_backend = create_cache_backend(CACHE_BACKEND, directory="cache_directory", redis_url=REDIS_URL)
+
+# 항목 수 대신 추정 바이트로 메모리 사용량 제한 (namespace별 상한 포함)
+cache_handler = MemoryCache(
+    max_size=100_000,
+    backend=cache_backend,
+    max_bytes=CACHE_MAX_BYTES,
+    namespace_quotas={
+        "query": CACHE_MAX_BYTES // 4,
+        "hospital": CACHE_MAX_BYTES // 4,
+        "pharmacy": CACHE_MAX_BYTES // 4,
+        "league_standings": CACHE_MAX_BYTES // 8,
+        "league_scorers": CACHE_MAX_BYTES // 8
+    }
+)
 
 # 날짜 일괄적 수정 
 def format_date(fordate):
@@ -157,17 +146,42 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 @st.cache_resource
 def initialize_apis():
     """API 클래스들을 초기화합니다 (캐싱 적용)"""
-    return {
-        'weather': WeatherAPI(cache_handler=cache_handler, WEATHER_API_KEY=WEATHER_API_KEY),
-        'football': FootballAPI(api_key=SPORTS_API_KEY, cache_handler=cache_handler),
+    # cache_ttl = (soft, hard): soft 이후에는 stale 값을 바로 반환하고 백그라운드에서 갱신
+    apis = {
+        'weather': WeatherAPI(cache_handler=cache_handler, WEATHER_API_KEY=WEATHER_API_KEY, cache_ttl={
+            "city_search": 86400,
+            "weather": (1800, 3 * 3600),
+            "forecast": (3600, 6 * 3600)
+        }),
+        'football': FootballAPI(api_key=SPORTS_API_KEY, cache_handler=cache_handler, cache_ttl=(600, 6 * 3600)),
         'drug': DrugAPI(api_key=DRUG_API_KEY, cache_handler=cache_handler),
-        'drug_store': DrugStoreAPI(api_key=DRUG_STORE_KEY, cache_handler=cache_handler),
-        'hospital': SeoulHospitalAPI(api_key=HOSPITAL_KEY, cache_handler=cache_handler),  # 🔵 병원 API 추가
+        'drug_store': DrugStoreAPI(api_key=DRUG_STORE_KEY, cache_handler=cache_handler, cache_ttl=(1800, 6 * 3600)),
+        'hospital': SeoulHospitalAPI(api_key=HOSPITAL_KEY, cache_handler=cache_handler, cache_ttl=(1800, 6 * 3600)),  # 🔵 병원 API 추가
         'paper_search': PaperSearchAPI(ncbi_key=NCBI_KEY, cache_handler=cache_handler),
-        'culture_event': CultureEventAPI(api_key=CULTURE_API_KEY, cache_handler=cache_handler),
-        'web_search': WebSearchAPI(client_id=NAVER_CLIENT_ID, client_secret=NAVER_CLIENT_SECRET, cache_handler=cache_handler)
+        'culture_event': CultureEventAPI(api_key=CULTURE_API_KEY, cache_handler=cache_handler,
+                                         cache_ttl=(3600, 12 * 3600), xml_cache_ttl=(1800, 12 * 3600)),
+        'web_search': WebSearchAPI(client_id=NAVER_CLIENT_ID, client_secret=NAVER_CLIENT_SECRET, cache_handler=cache_handler,
+                                   cache_ttl=(3600, 24 * 3600))
     }
 
+    # 배포 직후 자주 쓰이는 키(구별 병원/약국, 리그, 서울 날씨)를 백그라운드에서 미리 조회
+    if CACHE_WARMUP_ENABLED:
+        CacheWarmer(build_default_warm_tasks(apis)).start(interval=CACHE_WARMUP_INTERVAL or None)
+    return apis
+
+@st.cache_resource
+def get_morph_service():
+    """프로세스 전체 형태소 분석기 (백그라운드 로딩, 준비 전에는 키워드 매칭으로 라우팅)"""
+    return get_morph_analyzer().configure(
+        backend=MORPH_ANALYZER,
+        workers=MORPH_ANALYZER_WORKERS,
+        timeout=MORPH_ANALYZER_TIMEOUT,
+        cache_size=MORPH_CACHE_SIZE
+    ).start()
+
+# 첫 질문이 JVM 기동을 기다리지 않도록 시작할 때 로딩 (캐시 워밍이 질문을 분석하기 전에 설정 적용)
+get_morph_service()
+
 # 전역 변수 대신 함수 호출
 apis = initialize_apis()
 weather_api = apis['weather']
@@ -182,6 +196,29 @@ hospital_api = apis['hospital']  # 🔵 병원 API 인스턴스화
 st.set_page_config(page_title="AI 챗봇", page_icon="🤖")
 
 # 세션 상태 초기화 부분에 검색 결과 컨텍스트 추가
+@st.cache_resource
+def get_provider_pool():
+    """프로세스 전체 프로바이더 풀 (백그라운드 상태 확인 포함)"""
+    return ProviderPool(
+        providers=LLM_PROVIDERS,
+        health_check_ttl=PROVIDER_HEALTH_CHECK_TTL,
+        hedge_enabled=LLM_HEDGED_REQUESTS,
+        max_inflight=LLM_MAX_CONCURRENCY,
+        first_token_timeout=LLM_FIRST_TOKEN_TIMEOUT,
+        chunk_timeout=LLM_STREAM_CHUNK_TIMEOUT
+    ).start()
+
+@st.cache_resource
+def get_llm_executor():
+    """프로세스 전체 LLM 호출 executor (동시 실행 제한 + 사용자별 공정 대기열)"""
+    return LLMExecutor(
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        max_queue_depth=LLM_MAX_QUEUE_DEPTH,
+        max_queued_per_user=LLM_MAX_QUEUED_PER_USER
+    )
+
+LLM_BUSY_RESPONSE = "지금 요청이 많아 답변을 준비할 수 없어요. 잠시 후 다시 시도해 주세요. 🙏"
+
 def init_session_state():
     if "is_logged_in" not in st.session_state:
         st.session_state.is_logged_in = False
@@ -192,9 +229,9 @@ def init_session_state():
     if "session_id" not in st.session_state:
         st.session_state.session_id = str(uuid.uuid4())
 
-    # 🔴 client와 provider는 한 번만 초기화
+    # 🔴 client와 provider는 한 번만 초기화 (공유 풀에서 즉시 빌림, 세션별 프로브 없음)
     if "client" not in st.session_state or "provider_name" not in st.session_state:
-        client, provider_name = select_random_available_provider()
+        client, provider_name = get_provider_pool().borrow()
         st.session_state.client = client
         st.session_state.provider_name = provider_name
         logger.info(f"세션 초기화 - 선택된 프로바이더: {provider_name}")
@@ -213,7 +250,28 @@ def create_or_get_user(nickname):
     new_user = supabase.table("users").insert({"nickname": nickname, "created_at": datetime.now().isoformat()}).execute()
     return new_user.data[0]["id"], False
 
-def save_chat_history(user_id, session_id, question, answer, time_taken):
+_chat_history_has_ttft = None
+
+def chat_history_has_ttft_column():
+    """
+    chat_history 테이블에 time_to_first_token 컬럼이 있는지 확인 (프로세스당 한 번)
+    컬럼 추가 전 배포에서는 이 값을 빼고 저장 (config/migrations/001_chat_history_time_to_first_token.sql)
+    """
+    global _chat_history_has_ttft
+    if _chat_history_has_ttft is None:
+        try:
+            supabase.table("chat_history").select("time_to_first_token").limit(1).execute()
+            _chat_history_has_ttft = True
+        except Exception as e:
+            if "time_to_first_token" not in str(e):
+                # 네트워크 오류 등은 다음 저장 때 다시 확인
+                return False
+            logger.warning("chat_history.time_to_first_token 컬럼이 없어 첫 토큰 시간은 저장하지 않습니다. "
+                           "config/migrations/001_chat_history_time_to_first_token.sql을 적용하세요.")
+            _chat_history_has_ttft = False
+    return _chat_history_has_ttft
+
+def save_chat_history(user_id, session_id, question, answer, time_taken, time_to_first_token=None):
     try:
         # answer가 딕셔너리이고 table 키에 DataFrame이 포함된 경우
         if isinstance(answer, dict) and "table" in answer and isinstance(answer["table"], pd.DataFrame):
@@ -234,81 +292,147 @@ def save_chat_history(user_id, session_id, question, answer, time_taken):
 
         logger.info(f"Saving chat history: user_id={user_id}, session_id={session_id}, question={question}, answer_type={type(answer_to_save)}")
 
-        supabase.table("chat_history").insert({
+        record = {
             "user_id": user_id,
             "session_id": session_id,
             "question": question,
             "answer": answer_to_save,
             "time_taken": time_taken,
             "created_at": datetime.now().isoformat()
-        }).execute()
+        }
+        if time_to_first_token is not None and chat_history_has_ttft_column():
+            record["time_to_first_token"] = time_to_first_token
+        supabase.table("chat_history").insert(record).execute()
     except Exception as e:
         logger.error(f"Failed to save chat history: {str(e)}", exc_info=True)
 
-def async_save_chat_history(user_id, session_id, question, answer, time_taken):
-    threading.Thread(target=save_chat_history, args=(user_id, session_id, question, answer, time_taken)).start()
+def async_save_chat_history(user_id, session_id, question, answer, time_taken, time_to_first_token=None):
+    threading.Thread(
+        target=save_chat_history,
+        args=(user_id, session_id, question, answer, time_taken, time_to_first_token)
+    ).start()
 
 # 대화형 응답 (비동기)
-conversation_cache = MemoryCache()
+conversation_cache = MemoryCache(
+    max_size=100_000,
+    backend=cache_backend,
+    max_bytes=CONVERSATION_CACHE_MAX_BYTES,
+    namespace_quotas={"conv": CONVERSATION_CACHE_MAX_BYTES}
+)
+# 띄어쓰기/문장부호만 다른 질문은 같은 답변 사용 (질문 유형 + 검색 컨텍스트 단위)
+conversation_answers = NearDuplicateCache(conversation_cache, prefix="conv")
+# 대화 프롬프트 토큰 예산
+prompt_assembler = PromptAssembler(max_tokens=PROMPT_TOKEN_BUDGET, max_turns=PROMPT_MAX_TURNS)
 _client_instance = None
 
-# 대화형 응답 함수 수정
-async def get_conversational_response(query, chat_history):
-    logger.info(f"대화형 응답 시작 - 쿼리: '{query}'")
-
-    # 캐시 확인
-    cache_key = f"conv:{needs_search(query)}:{query}"
-    cached = conversation_cache.get(cache_key)
-    if cached:
-        return cached
+def conversation_session():
+    """
+    대화 응답에 필요한 세션 값을 스크립트 스레드에서 미리 읽습니다.
+    (응답 코루틴은 공유 이벤트 루프 스레드에서 실행되어 st.session_state에 접근할 수 없음)
+    """
+    # 🔴 세션 상태의 client 사용 (프로바이더가 unhealthy로 바뀐 경우에만 풀에서 다시 빌림)
+    provider_pool = get_provider_pool()
+    if not provider_pool.is_healthy(st.session_state.provider_name):
+        st.session_state.client, st.session_state.provider_name = provider_pool.borrow()
 
     # 현재 검색 컨텍스트 가져오기
     current_context = None
+    current_context_id = None
     if hasattr(st, 'session_state') and 'current_context' in st.session_state:
         current_context_id = st.session_state.current_context
         if current_context_id and current_context_id in st.session_state.search_contexts:
             current_context = st.session_state.search_contexts[current_context_id]
+        else:
+            current_context_id = None
+
+    return {
+        # 공정 대기열 단위 (로그인 전에는 세션 단위)
+        "user": st.session_state.get("user_id") or st.session_state.session_id,
+        "llm_executor": get_llm_executor(),
+        "provider_pool": provider_pool,
+        "client": st.session_state.client,
+        "provider_name": st.session_state.provider_name,
+        "current_context": current_context,
+        "context_id": current_context_id
+    }
+
+# 대화형 응답 함수 수정
+async def stream_conversational_response(query, chat_history, session, stream=True, on_complete=None):
+    """
+    대화형 응답을 텍스트 조각 단위로 yield 하는 async generator입니다 (session: conversation_session() 결과).
+    stream=True면 ProviderPool.stream_completion이 첫 토큰을 hedge 하고, stream=False면 hedged_completion으로 전체 응답을 한 번에 yield 합니다.
+    응답이 끝까지 생성되면 전체 텍스트를 캐시에 저장하고 on_complete(전체 텍스트)를 호출합니다.
+    """
+    logger.info(f"대화형 응답 시작 - 쿼리: '{query}'")
+
+    plan = analyze_query(query)
+    # 캐시 확인 (같은 검색 컨텍스트 안에서 정확히 같거나 거의 같은 질문)
+    cache_scope = (plan.intent, session["context_id"])
+    cached = conversation_answers.get(query, cache_scope)
+    if cached:
+        yield cached
+        return
+
+    current_context = session["current_context"]
+    # 블로킹 호출(웹페이지 요약, LLM 요청)은 공유 루프를 막지 않도록 LLM executor에서 실행
+    llm_executor = session["llm_executor"]
+    user = session["user"]
 
-    # 순서 기반 링크 요청 확인
+    # 순서 기반 링크 요청 확인 (쿼리에 순서 참조/URL이 없으면 패턴 검사 생략)
     try:
-        is_numbered_request, numbered_url = is_numbered_link_request(query, current_context)
+        is_numbered_request, numbered_url = (
+            is_numbered_link_request(query, current_context) if plan.ordinals else (False, None)
+        )
         logger.info(f"순서 기반 요청: {is_numbered_request}, URL: {numbered_url}")
 
         if is_numbered_request and numbered_url:
             try:
                 logger.info(f"웹페이지 요약 시작: {numbered_url}")
                 # 🔴 세션 상태의 client 전달
-                summary = summarize_webpage_content(numbered_url, query, st.session_state.client)
-                conversation_cache.setex(cache_key, 600, summary)
-                return summary
+                summary = await asyncio.wrap_future(
+                    llm_executor.submit(user, summarize_webpage_content, numbered_url, query, session["client"])
+                )
+                conversation_answers.setex(query, cache_scope, 600, summary)
+                yield summary
+                return
+            except LLMBusyError:
+                yield LLM_BUSY_RESPONSE
+                return
             except Exception as e:
                 logger.error(f"웹페이지 요약 오류: {str(e)}")
-                return f"해당 링크의 내용을 가져올 수 없습니다: {str(e)} 😓"
+                yield f"해당 링크의 내용을 가져올 수 없습니다: {str(e)} 😓"
+                return
 
         # 일반 URL 요약 요청 확인
-        is_url_request, url = is_url_summarization_request(query)
+        is_url_request, url = is_url_summarization_request(query) if plan.urls else (False, None)
         logger.info(f"URL 요약 요청: {is_url_request}, URL: {url}")
 
         if is_url_request and url:
             try:
                 logger.info(f"직접 URL 요약 시작: {url}")
                 # 🔴 세션 상태의 client 전달
-                summary = summarize_webpage_content(url, query, st.session_state.client)
-                conversation_cache.setex(cache_key, 600, summary)
-                return summary
+                summary = await asyncio.wrap_future(
+                    llm_executor.submit(user, summarize_webpage_content, url, query, session["client"])
+                )
+                conversation_answers.setex(query, cache_scope, 600, summary)
+                yield summary
+                return
+            except LLMBusyError:
+                yield LLM_BUSY_RESPONSE
+                return
             except Exception as e:
                 logger.error(f"URL 요약 오류: {str(e)}")
-                return f"해당 링크의 내용을 가져올 수 없습니다: {str(e)} 😓"
+                yield f"해당 링크의 내용을 가져올 수 없습니다: {str(e)} 😓"
+                return
 
     except Exception as e:
         logger.error(f"링크 요약 처리 중 오류: {str(e)}")
 
-    # 일반 대화 처리
-    messages = [
-        {"role": "system", "content": "친절한 AI 챗봇입니다. 적절한 이모지 사용: ✅(완료), ❓(질문), 😊(친절)"}
-    ]
+    # 일반 대화 처리 (토큰 예산 안에서 질문 > 검색 컨텍스트 > 최근 대화 순으로 조립)
+    system_template = "친절한 AI 챗봇입니다. 적절한 이모지 사용: ✅(완료), ❓(질문), 😊(친절)"
+    context_sections = []
 
-    # 검색 컨텍스트 처리 (기존 로직 유지)
+    # 검색 컨텍스트 처리 (기존 로직 유지, 예산에 맞춰 자를 수 있도록 항목 단위로 구성)
     if current_context:
         context_type = current_context["type"]
         context_query = current_context["query"]
@@ -316,71 +440,104 @@ async def get_conversational_response(query, chat_history):
 
         # 컨텍스트 유형에 따라 다른 지시 추가
         if context_type == "naver_search":
-            # 테이블 데이터인 경우 처리
+            # 테이블 데이터인 경우 처리 (행 단위, 한글은 이스케이프하지 않음)
             if isinstance(context_result, dict) and "table" in context_result:
-                table_json = context_result["table"].to_json(orient="records")
-                context_desc = f"사용자가 '{context_query}'에 대해 검색했고, 다음 테이블 형태의 결과를 받았습니다: {table_json}"
+                context_sections.append(f"사용자가 '{context_query}'에 대해 검색했고, 다음 테이블 형태의 결과를 받았습니다 (한 줄에 한 행):")
+                context_sections.extend(
+                    json.dumps(row, ensure_ascii=False, default=str)
+                    for row in context_result["table"].to_dict(orient="records")
+                )
             else:
                 # 정규 표현식으로 웹 검색 결과만 추출
                 cleaned_results = re.findall(r"\*\*결과 \d+\*\*\s*\n\n📄 \*\*제목\*\*: (.*?)\n\n📝 \*\*내용\*\*: (.*?)(?=\n\n🔗|\n\n더 궁금한)", context_result, re.DOTALL)
-                context_desc = f"사용자가 '{context_query}'에 대해 웹 검색을 했고, 다음 결과를 받았습니다:\n\n"
+                context_sections.append(f"사용자가 '{context_query}'에 대해 웹 검색을 했고, 다음 결과를 받았습니다:\n")
                 for i, (title, content) in enumerate(cleaned_results, 1):
-                    context_desc += f"{i}. 제목: {title.strip()}\n   내용: {content.strip()}\n\n"
+                    context_sections.append(f"{i}. 제목: {title.strip()}\n   내용: {content.strip()}\n")
 
                 # 검색 결과에서 URL을 추출하여 웹페이지 요약 제안
                 urls_in_context = extract_urls_from_text(context_result)
                 logger.info(f"검색 결과에서 추출된 URL 개수: {len(urls_in_context)}")
                 if urls_in_context:
-                    context_desc += f"\n\n검색 결과에 총 {len(urls_in_context)}개의 링크가 있습니다:\n"
+                    links_desc = f"\n검색 결과에 총 {len(urls_in_context)}개의 링크가 있습니다:\n"
                     for i, url in enumerate(urls_in_context, 1):
-                        context_desc += f"{i}. {url}\n"
-                    context_desc += "\n특정 링크의 전체 내용이 궁금하시면 다음과 같이 질문해주세요:\n"
-                    context_desc += "- '첫 번째 링크 요약해줘' 또는 '3번째 링크 요약해줘'\n"
-                    context_desc += "- 'URL + 요약해줘' 형태로 직접 URL 지정"
+                        links_desc += f"{i}. {url}\n"
+                    links_desc += "\n특정 링크의 전체 내용이 궁금하시면 다음과 같이 질문해주세요:\n"
+                    links_desc += "- '첫 번째 링크 요약해줘' 또는 '3번째 링크 요약해줘'\n"
+                    links_desc += "- 'URL + 요약해줘' 형태로 직접 URL 지정"
+                    context_sections.append(links_desc)
 
         # 다른 유형의 컨텍스트 처리 (약품 정보, 논문 등)
         elif context_type == "drug":
-            context_desc = f"사용자가 '{context_query}' 약품에 대한 정보를 검색했습니다. 약품 정보를 기반으로 사용자의 질문에 답변해주세요."
+            context_sections.append(f"사용자가 '{context_query}' 약품에 대한 정보를 검색했습니다. 약품 정보를 기반으로 사용자의 질문에 답변해주세요.")
         else:
-            context_desc = f"사용자가 '{context_query}'에 대해 검색했습니다."
+            context_sections.append(f"사용자가 '{context_query}'에 대해 검색했습니다.")
 
         # 공통 지시사항
-        system_prompt = (
+        system_template = (
             "친절한 AI 챗봇입니다. 적절한 이모지 사용: ✅(완료), ❓(질문), 😊(친절).\n\n"
-            f"{context_desc}\n\n"
+            "{context}\n\n"
             "사용자의 후속 질문은 이 검색 결과에 관한 것일 수 있습니다. 검색 결과의 내용을 기반으로 답변하세요.\n"
             "요약을 요청받으면 중요한 정보를 간결하게 요약하고, 설명을 요청받으면 더 자세한 정보를 제공하세요.\n"
             "검색 결과에 관련 정보가 없다면 정직하게 모른다고 답변하세요.\n"
             "사용자가 '첫 번째 링크', '3번째 링크' 등 순서로 링크를 언급하면 해당 순서의 웹페이지 전체 내용을 요약해드린다고 안내하세요.\n"
             "URL이나 링크에 대한 질문을 받으면, 해당 링크의 전체 내용을 확인하고 싶다면 '순서 + 링크 요약해줘' 또는 'URL + 요약해줘' 형태로 질문하라고 안내해주세요."
         )
-        messages[0]["content"] = system_prompt
-
-    # 최근 대화 기록 추가
-    messages.extend([{"role": msg["role"], "content": msg["content"]} 
-                    for msg in chat_history[-4:] if "더 궁금한 점 있나요?" not in msg["content"]])
 
-    # 현재 질문 추가
-    messages.append({"role": "user", "content": query})
+    # 최근 대화 기록 + 현재 질문 (요청마다 구성별 토큰 수 로그)
+    messages, _ = prompt_assembler.assemble(
+        system_template, query, context_sections, chat_history,
+        skip_history=lambda content: isinstance(content, str) and "더 궁금한 점 있나요?" in content
+    )
 
-    # 🔴 세션 상태의 client 사용 (새로 선택하지 않음)
+    provider_pool = session["provider_pool"]
+    provider_name = session["provider_name"]
+    parts = []
     try:
-        client = st.session_state.client
-        logger.info(f"기존 세션 client 사용: {st.session_state.provider_name}")
-
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None, lambda: client.chat.completions.create(
-                model="gpt-4o-mini", messages=messages
-            )
-        )
-        result = response.choices[0].message.content if response.choices else "응답을 생성할 수 없습니다."
+        logger.info(f"기존 세션 프로바이더 사용: {provider_name}")
+
+        if stream:
+            # g4f stream=True 조각을 LLM executor 슬롯 하나에서 받아 바로 전달 (첫 토큰이 늦으면 풀이 다른 프로바이더로 hedge)
+            chunks = provider_pool.stream_completion(messages, primary=provider_name)
+            async for text in llm_executor.stream(user, chunks):
+                parts.append(text)
+                yield text
+        else:
+            # 세션 프로바이더가 p95 안에 응답하지 않으면 풀이 다른 프로바이더로 hedge (지연/오류 기록 포함)
+            response, answered_by = await asyncio.wrap_future(llm_executor.submit(
+                user, lambda: provider_pool.hedged_completion(messages, primary=provider_name)
+            ))
+            if answered_by != provider_name:
+                logger.info(f"hedged 요청 응답 프로바이더: {answered_by}")
+            if response.choices and response.choices[0].message.content:
+                parts.append(response.choices[0].message.content)
+                yield parts[0]
+    except LLMBusyError:
+        yield LLM_BUSY_RESPONSE
+        return
     except Exception as e:
         logger.error(f"대화 응답 생성 중 오류: {str(e)}", exc_info=True)
-        result = "응답을 생성하는 중 문제가 발생했습니다."
-
-    conversation_cache.setex(cache_key, 600, result)
-    return result
+        # 중간에 끊긴 응답/오류 메시지는 캐시하지 않음
+        if not parts:
+            yield "응답을 생성하는 중 문제가 발생했습니다."
+        return
+
+    if not parts:
+        yield "응답을 생성할 수 없습니다."
+        return
+    result = "".join(parts)
+    conversation_answers.setex(query, cache_scope, 600, result)
+    if on_complete is not None:
+        on_complete(result)
+
+async def get_conversational_response(query, chat_history, session):
+    """대화형 응답 전체를 한 번에 반환합니다 (process_query(stream=False) 경로, 채팅 화면은 스트리밍 사용)."""
+    return "".join([chunk async for chunk in stream_conversational_response(query, chat_history, session, stream=False)])
+
+async def track_first_token(chunks, timing):
+    """첫 조각이 나온 시각을 timing["first_token"]에 기록하며 조각을 그대로 전달합니다."""
+    async for chunk in chunks:
+        timing.setdefault("first_token", time.time())
+        yield chunk
 
 GREETINGS = ["안녕", "하이", "헬로", "ㅎㅇ", "왓업", "할롱", "헤이"]
 GREETING_RESPONSE = "안녕하세요! 반갑습니다. 무엇을 도와드릴까요? 😊"
@@ -574,98 +731,49 @@ GREETING_RESPONSE = "안녕하세요! 반갑습니다. 무엇을 도와드릴까
 #         return result
 
 
-def process_query(query):
-    cache_key = f"query:{hash(query)}"
-    cached = cache_handler.get(cache_key)
-    if cached is not None:
-        return cached
-
-    query_type = needs_search(query)
-    query_lower = query.strip().lower().replace(" ", "")
-
-    logger.info(f"🎯 쿼리 타입: {query_type}")
+def answer_with_api(plan):
+    """
+    공공/외부 API로 답하는 의도(FANOUT_INTENTS)의 응답을 만듭니다 (캐시 저장은 호출하는 쪽에서).
+    st.session_state를 쓰지 않으므로 공유 이벤트 루프의 executor 스레드에서도 호출할 수 있습니다.
+    """
+    query = plan.query
+    query_type = plan.intent
 
     # 약국 검색 케이스
     if query_type == "pharmacy_search":
-        result = drug_store_api.search_pharmacies(query)
-        cache_handler.setex(cache_key, 600, result)
-        return result
+        return drug_store_api.search_pharmacies(query, plan=plan)
 
     # 🔵 병원 검색 케이스 (query_type에만 의존)
     elif query_type == "hospital_search":
-        result = hospital_api.search_hospitals(query)
-        cache_handler.setex(cache_key, 600, result)
-        return result
-
-    # 네이버 검색 케이스
-    elif query_type == "naver_search":
-        logger.info(f"네이버 검색 직접 호출: '{query}'")
-        result = web_search_api.search_and_create_context(query, st.session_state)
-        logger.info(f"검색 후 컨텍스트 상태: {st.session_state.current_context}")
-        if hasattr(st.session_state, 'search_contexts'):
-            logger.info(f"저장된 컨텍스트 수: {len(st.session_state.search_contexts)}")
-        cache_handler.setex(cache_key, 600, result)
-        return result
+        return hospital_api.search_hospitals(query, plan=plan)
 
     # 문화행사 검색 케이스
     elif query_type == "cultural_event":
-        result = culture_event_api.search_cultural_events(query)
-        cache_handler.setex(cache_key, 600, result)
-        return result
+        return culture_event_api.search_cultural_events(query)
 
     # 날씨 관련 쿼리
     elif query_type == "weather" or query_type == "tomorrow_weather":
-        result = weather_api.get_forecast_by_day(extract_city_from_query(query), 1) if query_type == "tomorrow_weather" else weather_api.get_city_weather(extract_city_from_query(query))
-        cache_handler.setex(cache_key, 600, result)
-        return result
-
-    # 시간 관련 쿼리
-    elif query_type == "time":
-        if "오늘날짜" in query_lower or "현재날짜" in query_lower or "금일날짜" in query_lower:
-            result = get_kst_time()
-        else:
-            city = extract_city_from_time_query(query)
-            result = get_time_by_city(city)
-        cache_handler.setex(cache_key, 600, result)
-        return result
-
-    # 축구 리그 순위
-    elif query_type == "league_standings":
-        league_key = extract_league_from_query(query)
-        if league_key in LEAGUE_MAPPING:
-            league_info = LEAGUE_MAPPING[league_key]
+        return weather_api.get_forecast_by_day(plan.city, 1) if query_type == "tomorrow_weather" else weather_api.get_city_weather(plan.city)
+
+    # 축구 리그 순위 / 득점 순위
+    elif query_type in ("league_standings", "league_scorers"):
+        league_key = plan.league
+        if league_key not in LEAGUE_MAPPING:
+            return "지원하지 않는 리그입니다. 😓 지원 리그: EPL, LaLiga, Bundesliga, Serie A, Ligue 1, ChampionsLeague"
+        league_info = LEAGUE_MAPPING[league_key]
+        if query_type == "league_standings":
             result = football_api.fetch_league_standings(league_info["code"], league_info["name"])
-            if "error" not in result:
-                result = {
-                    "header": f"### {result['league_name']} 리그 순위 🏆",
-                    "table": result["data"].to_dict(orient="records"),
-                    "footer": "더 궁금한 점 있나요? 😊"
-                }
-            cache_handler.setex(cache_key, 600, result)
-            return result
+            header = f"### {result.get('league_name')} 리그 순위 🏆"
         else:
-            result = "지원하지 않는 리그입니다. 😓 지원 리그: EPL, LaLiga, Bundesliga, Serie A, Ligue 1, ChampionsLeague"
-            cache_handler.setex(cache_key, 600, result)
-            return result
-
-    # 축구 득점 순위
-    elif query_type == "league_scorers":
-        league_key = extract_league_from_query(query)
-        if league_key in LEAGUE_MAPPING:
-            league_info = LEAGUE_MAPPING[league_key]
             result = football_api.fetch_league_scorers(league_info["code"], league_info["name"])
-            if "error" not in result:
-                result = {
-                    "header": f"### {result['league_name']} 득점 순위 ⚽ (상위 10명)",
-                    "table": result["data"].to_dict(orient="records"),
-                    "footer": "더 궁금한 점 있나요? 😊"
-                }
-            cache_handler.setex(cache_key, 600, result)
-            return result
-        else:
-            result = "지원하지 않는 리그입니다. 😓 지원 리그: EPL, LaLiga, Bundesliga, Serie A, Ligue 1, ChampionsLeague"
-            cache_handler.setex(cache_key, 600, result)
+            header = f"### {result.get('league_name')} 득점 순위 ⚽ (상위 10명)"
+        if "error" in result:
             return result
+        return {
+            "header": header,
+            "table": result["data"].to_dict(orient="records"),
+            "footer": "더 궁금한 점 있나요? 😊"
+        }
 
     # 챔피언스리그 관련
     elif query_type == "cl_knockout":
@@ -676,25 +784,74 @@ def process_query(query):
                 "table": result,
                 "footer": "더 궁금한 점 있나요? 😊"
             }
+        return result
+
+    # 논문 검색
+    elif query_type == "arxiv_search":
+        keywords = query.replace("공학논문", "").replace("arxiv", "").strip()
+        return paper_search_api.get_arxiv_papers(keywords)
+
+    elif query_type == "pubmed_search":
+        keywords = query.replace("의학논문", "").strip()
+        return paper_search_api.get_pubmed_papers(keywords)
+
+    return "아직 지원하지 않는 기능이에요. 😅"
+
+
+def process_query(query, stream=False):
+    # 쿼리는 여기서 한 번만 분석하고, 각 분기와 API 래퍼는 같은 QueryPlan을 사용
+    plan = analyze_query(query)
+    query_type = plan.intent
+
+    # 프로세스/재시작과 무관한 정규화 키 (디스크 캐시 공유)
+    # 일반 대화 답변은 검색 컨텍스트에 따라 달라지므로 이 키(컨텍스트 없음)를 쓰지 않고
+    # stream_conversational_response 안의 (의도, 컨텍스트) 범위 캐시만 사용
+    cache_key = build_query_cache_key(query, plan=plan)
+    if query_type != "conversation":
+        cached = cache_handler.get(cache_key)
+        if cached is not None:
+            return cached
+
+    query_lower = query.strip().lower().replace(" ", "")
+
+    logger.info(f"🎯 쿼리 타입: {query_type}")
+
+    # 여러 요청이 섞인 질문은 나눠서 동시에 처리 (총 시간 ≈ 가장 느린 요청, 일부가 예산을 넘기면 캐시하지 않음)
+    fanout_plans = plan_fanout(query, plan)
+    if fanout_plans:
+        result, complete = get_background_loop().run(fan_out(fanout_plans, answer_with_api, FANOUT_LATENCY_BUDGET))
+        if complete:
+            cache_handler.setex(cache_key, 600, result)
+        return result
+
+    # API 조회 (약국, 병원, 문화행사, 날씨, 축구, 논문)
+    if query_type in FANOUT_INTENTS:
+        result = answer_with_api(plan)
         cache_handler.setex(cache_key, 600, result)
         return result
 
-    # 약품 검색
-    elif query_type == "drug":
-        result = drug_api.get_drug_info(query)
+    # 네이버 검색 케이스
+    if query_type == "naver_search":
+        logger.info(f"네이버 검색 직접 호출: '{query}'")
+        result = web_search_api.search_and_create_context(query, st.session_state)
+        logger.info(f"검색 후 컨텍스트 상태: {st.session_state.current_context}")
+        if hasattr(st.session_state, 'search_contexts'):
+            logger.info(f"저장된 컨텍스트 수: {len(st.session_state.search_contexts)}")
         cache_handler.setex(cache_key, 600, result)
         return result
 
-    # 논문 검색
-    elif query_type == "arxiv_search":
-        keywords = query.replace("공학논문", "").replace("arxiv", "").strip()
-        result = paper_search_api.get_arxiv_papers(keywords)
+    # 시간 관련 쿼리
+    elif query_type == "time":
+        if "오늘날짜" in query_lower or "현재날짜" in query_lower or "금일날짜" in query_lower:
+            result = get_kst_time()
+        else:
+            result = get_time_by_city(plan.city)
         cache_handler.setex(cache_key, 600, result)
         return result
 
-    elif query_type == "pubmed_search":
-        keywords = query.replace("의학논문", "").strip()
-        result = paper_search_api.get_pubmed_papers(keywords)
+    # 약품 검색
+    elif query_type == "drug":
+        result = drug_api.get_drug_info(query, plan=plan)
         cache_handler.setex(cache_key, 600, result)
         return result
 
@@ -753,11 +910,13 @@ def process_query(query):
     # 일반 대화
     elif query_type == "conversation":
         if query_lower in GREETINGS:
-            result = GREETING_RESPONSE
-        else:
-            result = asyncio.run(get_conversational_response(query, st.session_state.messages))
-        cache_handler.setex(cache_key, 600, result)
-        return result
+            return GREETING_RESPONSE
+        if stream:
+            # 조각 단위로 화면에 출력, 캐시는 전체 응답이 모인 뒤 컨텍스트 범위 캐시에 저장
+            return stream_conversational_response(query, st.session_state.messages, conversation_session())
+        return get_background_loop().run(
+            get_conversational_response(query, st.session_state.messages, conversation_session())
+        )
 
     else:
         result = "아직 지원하지 않는 기능이에요. 😅"
@@ -928,10 +1087,58 @@ def show_chat_dashboard():
             - 영어 검색 가능
             """)
 
+        if CACHE_ADMIN_PANEL:
+            show_cache_admin_panel()
+
     # 채팅 인터페이스
     display_chat_messages()
     handle_user_input()
 
+def show_cache_admin_panel():
+    """캐시 namespace별 적중/미스/지연 통계 (CACHE_ADMIN_PANEL=true일 때만 표시)"""
+    with st.expander("🛠️ 캐시 통계"):
+        for name, handler in (("cache_handler", cache_handler), ("conversation_cache", conversation_cache)):
+            snapshot = handler.snapshot()
+            totals = snapshot["totals"]
+            st.markdown(f"**{name}**")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("적중률", f"{totals['hit_rate'] * 100:.1f}%")
+            col2.metric("항목 수", totals["size"])
+            col3.metric("메모리", f"{totals['bytes'] / 1024 / 1024:.1f}MB")
+
+            rows = []
+            for namespace, stats in snapshot["namespaces"].items():
+                latency = stats.get("latency", {})
+                rows.append({
+                    "namespace": namespace,
+                    "hits": stats.get("hits", 0),
+                    "disk_hits": stats.get("disk_hits", 0),
+                    "misses": stats.get("misses", 0),
+                    "negative_hits": stats.get("negative_hits", 0),
+                    "evictions": stats.get("evictions", 0),
+                    "expirations": stats.get("expirations", 0),
+                    "hit_rate": stats.get("hit_rate", 0.0),
+                    "p50_ms": latency.get("p50_ms", 0.0),
+                    "p95_ms": latency.get("p95_ms", 0.0),
+                    "bytes": stats.get("bytes", 0)
+                })
+            if rows:
+                st.dataframe(pd.DataFrame(rows).set_index("namespace"))
+
+        near_stats = conversation_answers.get_stats()
+        st.caption(f"유사 질문 적중 {near_stats['near_hits']}회 (색인된 질문 {near_stats['indexed']}개)")
+
+        st.markdown("**LLM 프로바이더**")
+        st.dataframe(pd.DataFrame(get_provider_pool().snapshot()).T)
+
+        llm_stats = get_llm_executor().snapshot()
+        st.markdown("**LLM 대기열**")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("실행 중", f"{llm_stats['active']}/{llm_stats['max_concurrency']}")
+        col2.metric("대기", llm_stats["queued"])
+        col3.metric("거절", llm_stats["rejected"])
+        col4.metric("대기 p95", f"{llm_stats['wait_p95_ms']}ms")
+
 def display_chat_messages():
     """채팅 메시지 표시"""
     for message in st.session_state.messages:
@@ -959,22 +1166,30 @@ def handle_user_input():
 
                 # 후속 질문인지 확인
                 if is_followup_question(user_prompt) and st.session_state.current_context:
-                    response = asyncio.run(get_conversational_response(user_prompt, st.session_state.messages))
+                    response = stream_conversational_response(user_prompt, st.session_state.messages, conversation_session())
                 else:
                     if needs_search(user_prompt) is None:
                         st.session_state.current_context = None
-                    response = process_query(user_prompt)
+                    response = process_query(user_prompt, stream=True)
+
+                # LLM 대화 응답은 조각이 오는 대로 안내 문구 자리에 출력 (반환값은 모인 전체 텍스트)
+                timing = {}
+                streamed = inspect.isasyncgen(response)
+                if streamed:
+                    response = placeholder.write_stream(get_background_loop().iterate(track_first_token(response, timing)))
+                else:
+                    placeholder.empty()
 
                 end_time = time.time()
                 time_taken = end_time - start_time
-
-                placeholder.empty()
+                time_to_first_token = timing.get("first_token", end_time) - start_time
+                logger.info(f"⏱️ 응답 시간 - 첫 토큰: {time_to_first_token:.2f}초, 전체: {time_taken:.2f}초")
 
                 if isinstance(response, dict) and "table" in response:
                     st.markdown(response["header"])
                     st.dataframe(response["table"])
                     st.markdown(response["footer"])
-                else:
+                elif not streamed:
                     st.markdown(response, unsafe_allow_html=True)
 
                 st.session_state.messages.append({"role": "assistant", "content": response})
@@ -985,7 +1200,8 @@ def handle_user_input():
                     st.session_state.session_id,
                     user_prompt,
                     response,
-                    time_taken
+                    time_taken,
+                    time_to_first_token
                 )
 
             except Exception as e:
@@ -1,6 +1,7 @@
 # set lib
 from config.imports import *
 from config.env import *
+from utils.cache import MemoryCache
 
 # set logger
 logging.basicConfig(level=logging.WARNING if os.getenv("ENV") == "production" else logging.INFO)
@@ -11,22 +12,7 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 # set cach
 cache = Cache("cache_directory")
 
-class MemoryCache:
-    def __init__(self):
-        self.cache = {}
-        self.expiry = {}
-    
-    def get(self, key):
-        if key in self.cache and time.time() < self.expiry[key]:
-            return self.cache[key]
-        return cache.get(key)
-    
-    def setex(self, key, ttl, value):
-        self.cache[key] = value
-        self.expiry[key] = time.time() + ttl
-        cache.set(key, value, expire=ttl)
-
-cache_handler = MemoryCache()
+cache_handler = MemoryCache(disk_cache=cache)
 
 # 날짜 일괄적 수정 
 def format_date(fordate):
@@ -801,7 +787,7 @@ def get_pubmed_papers(query, max_results=5):
     return response
     
 # 대화형 응답 (비동기)
-conversation_cache = MemoryCache()
+conversation_cache = MemoryCache(disk_cache=cache)
 _client_instance = None
 
 def get_client():
@@ -0,0 +1 @@
+# benchmarks 패키지
@@ -0,0 +1,77 @@
+# benchmarks/cache_backend_contract.py
+"""
+캐시 백엔드 계약 확인: 메모리 / diskcache / Redis 프로토콜(LocalRedisStandIn)
+
+세 백엔드에 같은 시나리오를 실행해 TTL 의미가 같은지 확인합니다.
+- 만료 전 조회는 값과 만료/soft 경계를 돌려주고, 만료 후에는 None
+- soft TTL 경계가 보존되어 다른 프로세스(새 MemoryCache)에서도 stale 판정이 같음
+- 이미 만료된 항목은 기록하지 않음
+마지막으로 두 MemoryCache(= 두 replica)가 같은 백엔드를 공유할 때 한쪽 setex가 다른 쪽에서 보이는지 확인합니다.
+
+실행: python -m benchmarks.cache_backend_contract
+"""
+import tempfile
+import time
+
+from diskcache import Cache
+
+from utils.cache import MemoryCache
+from utils.cache_backends import DiskCacheBackend, InProcessBackend, LocalRedisStandIn, RedisBackend
+
+TOLERANCE = 0.05  # 초 (Redis PTTL은 ms 단위로 반올림)
+
+
+def check_backend(backend):
+    now = time.time()
+    backend.set_many([
+        ("weather:서울", "맑음", now + 0.4, now + 0.2),
+        ("drug:타이레놀", {"name": "타이레놀"}, now + 60, now + 60),
+        ("expired:key", "x", now - 1, now - 1),
+    ])
+
+    value, expires_at, stale_at = backend.get("weather:서울")
+    assert value == "맑음"
+    assert abs(expires_at - (now + 0.4)) < TOLERANCE, expires_at - now
+    assert abs(stale_at - (now + 0.2)) < TOLERANCE, stale_at - now
+    assert backend.get("drug:타이레놀")[0] == {"name": "타이레놀"}
+    assert backend.get("expired:key") is None
+    assert backend.get("missing:key") is None
+
+    # soft 경계는 새 MemoryCache(다른 replica)에서도 동일하게 판정
+    replica = MemoryCache(backend=backend, write_behind=False)
+    assert replica.get_with_state("weather:서울") == ("맑음", False)
+    time.sleep(0.25)
+    assert MemoryCache(backend=backend, write_behind=False).get_with_state("weather:서울") == ("맑음", True)
+    time.sleep(0.2)
+    assert backend.get("weather:서울") is None
+
+    backend.delete("drug:타이레놀")
+    assert backend.get("drug:타이레놀") is None
+
+
+def check_shared(backend):
+    replica_a = MemoryCache(backend=backend)
+    replica_b = MemoryCache(backend=backend)
+    replica_a.setex("league_standings:PL", (60, 600), {"league_name": "EPL"})
+    replica_a.flush()
+    assert replica_b.get("league_standings:PL") == {"league_name": "EPL"}
+    assert replica_b.get_stats()["disk_hits"] == 1
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        backends = [
+            InProcessBackend(),
+            DiskCacheBackend(Cache(directory)),
+            RedisBackend(LocalRedisStandIn()),
+        ]
+        for backend in backends:
+            started = time.perf_counter()
+            check_backend(backend)
+            check_shared(backend)
+            print(f"{backend.name:>6}: OK ({time.perf_counter() - started:.2f}s)")
+        backends[1].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/cache_compression.py
+"""
+캐시 값 압축 벤치마크: 메모리 사용량 / 백엔드 저장 크기 / get·setex 지연
+
+wrapper들이 실제로 캐싱하는 형태의 값을 만들어 압축 안 함(compress_threshold=None)과
+기본 설정(threshold 이상 str/bytes 압축)을 비교합니다.
+- culture_xml: CultureEventAPI.fetch_xml 원본 XML (1000행)
+- webpage_summary: summarize_webpage_content 결과 (약 15,000자)
+- pdf_summary: PDF 요약 (약 5,000자)
+- naver_markdown: WebSearchAPI.format_search_results 결과 (5건, 임계값 미만)
+- hospital_markdown: 병원 검색 결과 페이지 (10건)
+
+실행: python -m benchmarks.cache_compression
+"""
+import pickle
+import random
+import time
+
+from utils.cache import MemoryCache, estimate_size
+from utils.cache_codec import default_codec
+
+ROUNDS = 2000
+
+DISTRICTS = ["강남구", "서초구", "종로구", "마포구", "송파구", "광진구", "용산구", "성동구"]
+WORDS = [
+    "인공지능", "모델", "데이터", "서비스", "사용자", "검색", "결과", "분석", "성능", "개선",
+    "서울시", "정책", "발표", "기술", "연구", "시장", "기업", "투자", "교육", "지원",
+    "플랫폼", "공개", "버전", "기능", "보안", "클라우드", "생성형", "확대", "협력", "전망",
+]
+
+
+def korean_text(rng, chars):
+    sentences = []
+    length = 0
+    while length < chars:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + "입니다. "
+        sentences.append(sentence)
+        length += len(sentence)
+    return "".join(sentences)[:chars]
+
+
+def culture_xml(rng, rows=1000):
+    parts = ["<culturalEventInfo><list_total_count>1000</list_total_count><RESULT><CODE>INFO-000</CODE></RESULT>"]
+    for i in range(rows):
+        district = rng.choice(DISTRICTS)
+        parts.append(
+            "<row>"
+            f"<CODENAME>{rng.choice(['클래식', '전시/미술', '뮤지컬/오페라', '축제-문화/예술'])}</CODENAME>"
+            f"<GUNAME>{district}</GUNAME>"
+            f"<TITLE>{korean_text(rng, 30)}</TITLE>"
+            f"<DATE>2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}~2025-12-31</DATE>"
+            f"<PLACE>{district} 문화회관 {rng.randint(1, 5)}층</PLACE>"
+            f"<USE_FEE>{rng.choice(['무료', '전석 30,000원', 'R석 50,000원 / S석 30,000원'])}</USE_FEE>"
+            f"<IS_FREE>{rng.choice(['무료', '유료'])}</IS_FREE>"
+            f"<HMPG_ADDR>https://culture.seoul.go.kr/culture/culture/cultureEvent/view.do?cultcode={100000 + i}</HMPG_ADDR>"
+            f"<MAIN_IMG>https://culture.seoul.go.kr/cmmn/file/getImage.do?atchFileId={rng.getrandbits(64):016x}</MAIN_IMG>"
+            "</row>"
+        )
+    parts.append("</culturalEventInfo>")
+    return "".join(parts)
+
+
+def naver_markdown(rng):
+    results = []
+    for i in range(1, 6):
+        results.append(
+            f"**결과 {i}**\n\n"
+            f"📄 **제목**: {korean_text(rng, 40)}\n\n"
+            f"📝 **내용**: {korean_text(rng, 100)}...\n\n"
+            f"🔗 **링크**: https://blog.example.com/{rng.getrandbits(40):x}"
+        )
+    return "🌐 **웹 검색 결과** \n\n" + "\n\n".join(results) + "\n\n더 궁금한 점 있나요? 😊"
+
+
+def hospital_markdown(rng):
+    lines = ["🏥 **강남구 병원 검색 결과** (총 312개, 1/32 페이지)\n"]
+    for i in range(1, 11):
+        lines.append(
+            f"**{i}. {rng.choice(['서울', '연세', '미래', '365'])}{rng.choice(['내과', '정형외과', '소아청소년과', '치과'])}의원**\n"
+            f"📍 주소: 서울특별시 강남구 테헤란로 {rng.randint(1, 500)}\n"
+            f"📞 전화: 02-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}\n"
+            f"🕒 평일: 0900~1800 / 토요일: 0900~1300\n"
+            f"🚑 응급실: {rng.choice(['운영', '미운영'])}\n"
+        )
+    return "\n".join(lines)
+
+
+def build_payloads():
+    rng = random.Random(42)
+    return {
+        "culture_xml": culture_xml(rng),
+        "webpage_summary": korean_text(rng, 15000),
+        "pdf_summary": korean_text(rng, 5000),
+        "naver_markdown": naver_markdown(rng),
+        "hospital_markdown": hospital_markdown(rng),
+    }
+
+
+def measure(cache, key, value):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        cache.setex(key, 600, value)
+    set_us = (time.perf_counter() - started) / ROUNDS * 1e6
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = cache.get(key)
+    get_us = (time.perf_counter() - started) / ROUNDS * 1e6
+    assert result == value
+
+    stored = (cache._protected.get(key) or cache._probation.get(key)).value
+    memory_bytes = estimate_size(stored)
+    return memory_bytes, len(pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)), set_us, get_us
+
+
+def main():
+    # 측정마다 새 문자열 사용 (pickle이 str에 UTF-8 표현을 캐싱해 getsizeof가 커지는 것 방지)
+    raw_payloads, packed_payloads = build_payloads(), build_payloads()
+    print(f"codec: {default_codec()}, rounds: {ROUNDS}")
+    print(f"{'payload':>18} | {'memory (raw -> stored)':>24} | {'backend bytes':>17} | {'setex µs':>13} | {'get µs':>13}")
+    raw_total = stored_total = 0
+    for name in raw_payloads:
+        raw = measure(MemoryCache(compress_threshold=None), name, raw_payloads[name])
+        packed = measure(MemoryCache(), name, packed_payloads[name])
+        raw_total += raw[0]
+        stored_total += packed[0]
+        print(
+            f"{name:>18} | {raw[0]:>10,} -> {packed[0]:>10,} | {raw[1]:>7,} -> {packed[1]:>7,} | "
+            f"{raw[2]:>5.1f} -> {packed[2]:>5.1f} | {raw[3]:>5.1f} -> {packed[3]:>5.1f}"
+        )
+    print(f"{'total':>18} | {raw_total:>10,} -> {stored_total:>10,} ({stored_total / raw_total:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/cache_eviction.py
+"""
+MemoryCache 축출 성능 비교 (기존 LFU min() 스캔 vs Segmented LRU + TTL heap)
+
+실행: python -m benchmarks.cache_eviction
+"""
+import random
+import time
+
+from utils.cache import MemoryCache
+
+
+class LegacyMemoryCache:
+    """기존 app.py MemoryCache (디스크 계층 제외)"""
+
+    def __init__(self, max_size=1000):
+        self.cache = {}
+        self.expiry = {}
+        self.max_size = max_size
+        self.access_count = {}
+
+    def get(self, key):
+        if key in self.cache and time.time() < self.expiry[key]:
+            self.access_count[key] = self.access_count.get(key, 0) + 1
+            return self.cache[key]
+        return None
+
+    def setex(self, key, ttl, value):
+        if len(self.cache) >= self.max_size:
+            self._evict_least_used()
+        self.cache[key] = value
+        self.expiry[key] = time.time() + ttl
+        self.access_count[key] = 1
+
+    def _evict_least_used(self):
+        if not self.access_count:
+            return
+        least_used_key = min(self.access_count, key=self.access_count.get)
+        self.cache.pop(least_used_key, None)
+        self.expiry.pop(least_used_key, None)
+        self.access_count.pop(least_used_key, None)
+
+
+def run_workload(cache, size, ops, seed=42):
+    """캐시를 가득 채운 뒤 get/setex 혼합 워크로드의 op당 평균 시간(us)을 반환"""
+    rng = random.Random(seed)
+    for i in range(size):
+        cache.setex(f"query:{i}", 600, i)
+
+    next_key = size
+    start = time.perf_counter()
+    for _ in range(ops):
+        if rng.random() < 0.5:
+            cache.get(f"query:{rng.randrange(next_key)}")
+        else:
+            cache.setex(f"query:{next_key}", 600, next_key)
+            next_key += 1
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main():
+    print(f"{'keys':>8} | {'legacy (us/op)':>15} | {'slru (us/op)':>13} | {'speedup':>8}")
+    for size in (1_000, 10_000, 100_000):
+        ops = 2_000 if size <= 10_000 else 400
+        legacy = run_workload(LegacyMemoryCache(max_size=size), size, ops)
+        slru = run_workload(MemoryCache(max_size=size), size, ops)
+        print(f"{size:>8} | {legacy:>15.2f} | {slru:>13.2f} | {legacy / slru:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
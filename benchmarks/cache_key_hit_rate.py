@@ -0,0 +1,72 @@
+# benchmarks/cache_key_hit_rate.py
+"""
+process_query 캐시 키 적중률 비교 (hash() 키 vs 정규화 키)
+
+재생 로그를 여러 프로세스 수명(재시작 또는 다른 워커)에 나눠 흘려보내고,
+공유 디스크 캐시에 키가 이미 있으면 적중으로 계산합니다.
+기존 키는 실제로 별도 파이썬 프로세스에서 hash()를 계산합니다 (PYTHONHASHSEED 랜덤).
+
+실행: python -m benchmarks.cache_key_hit_rate
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+
+from utils.query_analyzer import build_query_cache_key
+
+QUERY_LOG = [
+    "강남구 약국", "강남구약국 알려줘", "강남구 약국 2페이지", "서초구 약국", "서초구 약국 알려줘",
+    "광진구 병원", "광진구 병원 알려줘", "송파구 병원정보", "마포구 약국",
+    "서울 날씨", "서울날씨 알려줘", "서울 날씨?", "내일 부산 날씨", "내일 부산날씨 알려줘", "도쿄 날씨",
+    "EPL 리그순위", "epl 리그순위 보여줘", "라리가 리그순위", "분데스리가 득점순위", "EPL 득점순위",
+    "챔피언스리그 토너먼트", "현재 시간", "런던 시간 알려줘", "오늘 날짜",
+    "강남구 문화행사", "문화행사", "약품검색 타이레놀", "약품검색 게보린",
+    "공학논문 Transformers", "의학논문 Gene Therapy", "MBTI 검사", "다중지능",
+    "안녕", "하이",
+]
+
+
+def legacy_keys(queries):
+    """새 파이썬 프로세스에서 기존 방식(f"query:{hash(query)}") 키 계산"""
+    env = dict(os.environ)
+    env.pop("PYTHONHASHSEED", None)
+    code = "import sys, json; print(json.dumps([f'query:{hash(q)}' for q in json.load(sys.stdin)]))"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        input=json.dumps(queries, ensure_ascii=False),
+        capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def replay(lifetimes, key_fn):
+    store = set()
+    hits = total = 0
+    for queries in lifetimes:
+        for key in key_fn(queries):
+            total += 1
+            if key in store:
+                hits += 1
+            store.add(key)
+    return hits, total, len(store)
+
+
+def main(lifetimes_count=6, requests_per_lifetime=200, seed=7):
+    rng = random.Random(seed)
+    lifetimes = [
+        [rng.choice(QUERY_LOG) for _ in range(requests_per_lifetime)]
+        for _ in range(lifetimes_count)
+    ]
+
+    for name, key_fn in (
+        ("hash()", legacy_keys),
+        ("canonical", lambda qs: [build_query_cache_key(q) for q in qs]),
+    ):
+        hits, total, stored = replay(lifetimes, key_fn)
+        print(f"{name:>10}: hit rate {hits / total:6.1%} ({hits}/{total}), disk entries {stored}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/dataframe_serialization.py
+"""
+캐시 DataFrame 직렬화 벤치마크: pickle vs Arrow IPC (utils/columnar.py)
+
+FootballAPI가 캐싱하는 {"league_name", "data": DataFrame} 형태의 값을 기준으로
+백엔드 저장 크기와 직렬화/역직렬화 시간을 비교합니다 (Arrow는 행 수와 관계없이 강제 적용해서 측정,
+실제 캐시는 ARROW_MIN_ROWS 이상만 Arrow 사용).
+마지막으로 Arrow가 pickle보다 작아지는 행 수(교차점)를 찾아 ARROW_MIN_ROWS와 비교합니다.
+- standings: 리그 순위 (20행)
+- cl_standings: 챔피언스리그 순위 (36행, 그룹 열 포함)
+- scorers_10k: 큰 표에서의 추세 확인용 (10,000행)
+
+실행: python -m benchmarks.dataframe_serialization
+"""
+import pickle
+import random
+import time
+
+import pandas as pd
+
+from utils.columnar import ARROW_COMPRESSION, ARROW_MIN_ROWS, decode_tabular, encode_tabular
+
+ROUNDS = 500
+TEAMS = ["Arsenal", "Liverpool", "Manchester City", "Chelsea", "Aston Villa", "Tottenham Hotspur",
+         "Newcastle United", "Brighton & Hove Albion", "Real Madrid", "FC Barcelona", "Bayern München"]
+
+
+def standings_frame(rng, rows, with_group=False):
+    records = []
+    for position in range(1, rows + 1):
+        won, draw, lost = rng.randint(0, 25), rng.randint(0, 10), rng.randint(0, 15)
+        goals_for, goals_against = rng.randint(10, 90), rng.randint(10, 70)
+        record = {'순위': position, '팀': f"{rng.choice(TEAMS)} {position}", '경기': won + draw + lost,
+                  '승': won, '무': draw, '패': lost, '득점': goals_for, '실점': goals_against,
+                  '득실차': goals_for - goals_against, '포인트': won * 3 + draw}
+        if with_group:
+            record['그룹'] = f"GROUP_{'ABCDEFGH'[position % 8]}"
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+def timed(fn, rounds=ROUNDS):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return result, (time.perf_counter() - started) / rounds * 1e6
+
+
+def compare(name, value):
+    dump = lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+
+    pickled, pickle_dump_us = timed(lambda: dump(value))
+    _, pickle_load_us = timed(lambda: pickle.loads(pickled))
+
+    arrow_blob, arrow_dump_us = timed(lambda: dump(encode_tabular(value, min_rows=0)))
+    restored, arrow_load_us = timed(lambda: decode_tabular(pickle.loads(arrow_blob)))
+    pd.testing.assert_frame_equal(restored["data"], value["data"], check_dtype=False)
+
+    print(
+        f"{name:>13} | {len(pickled):>9,} -> {len(arrow_blob):>9,} | "
+        f"{pickle_dump_us:>8.1f} -> {arrow_dump_us:>8.1f} | {pickle_load_us:>8.1f} -> {arrow_load_us:>8.1f}"
+    )
+
+
+def size_crossover(seeds=(1, 7, 11), max_rows=200, step=4):
+    """Arrow 저장 크기가 pickle보다 작아지는 최소 행 수 (시드별 최댓값)"""
+    dump = lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+    crossover = 0
+    for seed in seeds:
+        rng = random.Random(seed)
+        for rows in range(step, max_rows + 1, step):
+            value = {"league_name": "synthetic", "data": standings_frame(rng, rows)}
+            if len(dump(encode_tabular(value, min_rows=0))) < len(dump(value)):
+                crossover = max(crossover, rows)
+                break
+        else:
+            return None
+    return crossover
+
+
+def main():
+    rng = random.Random(7)
+    values = {
+        "standings": {"league_name": "프리미어리그 (영국)", "data": standings_frame(rng, 20)},
+        "cl_standings": {"league_name": "챔피언스 리그", "data": standings_frame(rng, 36, with_group=True)},
+        "scorers_10k": {"league_name": "synthetic", "data": standings_frame(rng, 10_000)},
+    }
+
+    print(f"backend 저장 (pickle -> Arrow IPC, compression={ARROW_COMPRESSION})")
+    print(f"{'value':>13} | {'bytes':>22} | {'serialize µs':>20} | {'deserialize µs':>20}")
+    for name, value in values.items():
+        compare(name, value)
+
+    crossover = size_crossover()
+    print(f"\nArrow가 pickle보다 작아지는 행 수: {crossover} (ARROW_MIN_ROWS={ARROW_MIN_ROWS})")
+
+
+if __name__ == "__main__":
+    main()
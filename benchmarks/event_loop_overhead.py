@@ -0,0 +1,59 @@
+# benchmarks/event_loop_overhead.py
+"""
+턴당 비동기 실행 오버헤드: 턴마다 asyncio.run vs 공유 BackgroundEventLoop (utils/event_loop.py)
+
+get_conversational_response와 같은 모양의 코루틴으로 두 경우를 비교합니다.
+- executor_call: run_in_executor로 블로킹 호출 1회 (LLM 요청 자리, 호출 자체는 즉시 반환)
+- stream_20: 20개 조각을 yield 하는 async generator 소비 (st.write_stream 경로, 이전: Streamlit의 턴별 새 루프)
+
+실행: python -m benchmarks.event_loop_overhead
+"""
+import asyncio
+import statistics
+import time
+
+from streamlit.type_util import async_generator_to_sync
+
+from utils.event_loop import BackgroundEventLoop
+
+TURNS = 300
+
+
+async def executor_call():
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: "응답")
+
+
+async def stream_chunks(count=20):
+    loop = asyncio.get_running_loop()
+    for i in range(count):
+        yield await loop.run_in_executor(None, str, i)
+
+
+def timed(fn, turns=TURNS):
+    samples = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def report(name, before, after):
+    print(f"{name:>14} | {before[0]:>9.1f} -> {after[0]:>9.1f} | {before[1]:>9.1f} -> {after[1]:>9.1f}")
+
+
+def main():
+    background = BackgroundEventLoop(name="bench-loop")
+    print(f"turns: {TURNS}")
+    print(f"{'case':>14} | {'median µs (before -> after)':>22} | {'p99 µs (before -> after)':>22}")
+    report("executor_call", timed(lambda: asyncio.run(executor_call())),
+           timed(lambda: background.run(executor_call())))
+    report("stream_20", timed(lambda: list(async_generator_to_sync(stream_chunks()))),
+           timed(lambda: list(background.iterate(stream_chunks()))))
+    background.stop()
+
+
+if __name__ == "__main__":
+    main()
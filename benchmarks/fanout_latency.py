@@ -0,0 +1,76 @@
+# benchmarks/fanout_latency.py
+"""
+복합 질문 처리 시간: 의도별 API를 차례로 호출 vs utils/fanout.fan_out으로 동시 호출
+
+utils/query_analyzer.plan_fanout으로 나눈 실제 QueryPlan에, 공공 API 응답 시간을 흉내 낸 handler(time.sleep)를 붙여 비교합니다.
+- 차례로 호출하면 전체 시간 ≈ 요청 시간의 합, 동시에 호출하면 ≈ 가장 느린 요청
+- 예산(budget)보다 느린 요청이 섞이면 예산 시점에 나머지만 합쳐서 응답하는지 확인
+
+실행: python -m benchmarks.fanout_latency
+"""
+import logging
+import time
+
+from utils.event_loop import BackgroundEventLoop
+from utils.fanout import fan_out
+from utils.query_analyzer import plan_fanout
+
+# 의도별 흉내 응답 시간 (초)
+LATENCIES = {
+    "weather": 0.35,
+    "tomorrow_weather": 0.35,
+    "league_standings": 0.6,
+    "league_scorers": 0.6,
+    "pharmacy_search": 0.8,
+    "hospital_search": 0.9,
+    "cultural_event": 0.5,
+    "arxiv_search": 0.7,
+    "pubmed_search": 0.7,
+}
+
+QUERIES = [
+    "서울 날씨랑 EPL 순위 알려줘",
+    "강남구 약국이랑 병원",
+    "내일 부산 날씨, 마포구 문화행사, 라리가 득점 순위",
+]
+
+
+def make_handler(latencies):
+    def handler(plan):
+        time.sleep(latencies[plan.intent])
+        if plan.intent == "league_standings":
+            return {"header": f"### {plan.league} 리그 순위 🏆", "table": [{"순위": 1, "팀": "팀A"}, {"순위": 2, "팀": "팀B"}], "footer": ""}
+        return f"{plan.intent} 결과 ({plan.query})"
+    return handler
+
+
+def main():
+    logging.disable(logging.INFO)
+    runner = BackgroundEventLoop(name="bench-fanout")
+    handler = make_handler(LATENCIES)
+
+    for query in QUERIES:
+        plans = plan_fanout(query)
+        started = time.perf_counter()
+        for plan in plans:
+            handler(plan)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        merged, complete = runner.run(fan_out(plans, handler, budget=5))
+        concurrent = time.perf_counter() - started
+        print(f"{query!r}: {[p.intent for p in plans]}")
+        print(f"  차례로 {sequential:.2f}초 -> 동시 {concurrent:.2f}초 (가장 느린 요청 {max(LATENCIES[p.intent] for p in plans):.2f}초, 완료 {complete})")
+
+    # 예산보다 느린 요청이 섞인 경우
+    slow = dict(LATENCIES, hospital_search=3.0)
+    plans = plan_fanout("강남구 약국이랑 병원")
+    started = time.perf_counter()
+    merged, complete = runner.run(fan_out(plans, make_handler(slow), budget=1.0))
+    print(f"예산 1초, 병원 API 3초: {time.perf_counter() - started:.2f}초에 응답 (완료 {complete})")
+    print(merged)
+    runner.stop()
+
+
+if __name__ == "__main__":
+    main()
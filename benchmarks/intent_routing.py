@@ -0,0 +1,129 @@
+# benchmarks/intent_routing.py
+"""
+의도 라우팅 회귀 점검: 라벨 코퍼스(benchmarks/data/routing_corpus.jsonl)로 정확도와 처리량을 측정합니다.
+
+- 의도별 정밀도/재현율과 자주 틀리는 (정답 -> 예측) 쌍
+- LLM(conversation)으로 가는 비율: 정답 기준 vs 라우터 기준 (API로 갈 질문이 LLM으로 새는 비율)
+- 캐시를 끈 처리량: classify_query, analyze_query(엔티티 추출 포함)를 lru_cache 없이 직접 호출한 QPS와 p50/p99 지연
+  (형태소 분석기는 준비될 때까지 기다린 뒤 측정, 분석기 자체의 지연은 benchmarks.morph_analyzer_latency)
+- benchmarks/data/routing_baseline.json과 비교해 정확도가 떨어지면 종료 코드 1
+  (기준 파일이 없으면 이번 결과로 만듦. 라우팅을 의도적으로 바꿨다면 파일을 지우고 다시 실행해서 갱신)
+
+네트워크/API 키 없이 실행됩니다 (라우팅과 엔티티 추출만 측정, API 호출 없음).
+
+실행: python -m benchmarks.intent_routing
+"""
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.routing_corpus import CORPUS_PATH, build_corpus, load_corpus
+from utils.morph_analyzer import get_morph_analyzer
+from utils.query_analyzer import analyze_query_uncached, classify_query
+
+BASELINE_PATH = Path(__file__).parent / "data" / "routing_baseline.json"
+# 기준보다 이만큼 넘게 떨어지면 회귀로 판단 (의도별 재현율은 코퍼스가 작은 의도도 있어 여유를 둠)
+ACCURACY_TOLERANCE = 0.002
+RECALL_TOLERANCE = 0.02
+ROUNDS = 3
+
+
+def accuracy_report(corpus, predict):
+    """정답/예측 비교 -> (전체 정확도, {의도: (개수, 정밀도, 재현율)}, 오분류 Counter, 예측 목록)"""
+    predictions = [predict(item["query"]) for item in corpus]
+    expected = [item["intent"] for item in corpus]
+    support = Counter(expected)
+    predicted = Counter(predictions)
+    correct = Counter(e for e, p in zip(expected, predictions) if e == p)
+    confusions = Counter((e, p) for e, p in zip(expected, predictions) if e != p)
+
+    per_intent = {}
+    for intent in sorted(support, key=lambda i: -support[i]):
+        precision = correct[intent] / predicted[intent] if predicted[intent] else 0.0
+        recall = correct[intent] / support[intent]
+        per_intent[intent] = (support[intent], precision, recall)
+    return sum(correct.values()) / len(corpus), per_intent, confusions, predictions
+
+
+def throughput(queries, func, rounds=ROUNDS):
+    """캐시 없이 func(query)를 반복 호출 -> (QPS, p50 µs, p99 µs)"""
+    latencies = []
+    total = 0.0
+    for _ in range(rounds):
+        for query in queries:
+            started = time.perf_counter()
+            func(query)
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            total += elapsed
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    return len(latencies) / total, statistics.median(latencies) * 1e6, p99 * 1e6
+
+
+def check_baseline(accuracy, per_intent):
+    """기준 파일과 비교해 회귀 목록을 반환 (기준이 없으면 저장하고 빈 목록)"""
+    current = {"accuracy": round(accuracy, 4), "recall": {intent: round(r, 4) for intent, (_, _, r) in per_intent.items()}}
+    if not BASELINE_PATH.exists():
+        BASELINE_PATH.write_text(json.dumps(current, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n기준 파일이 없어 이번 결과로 저장했습니다: {BASELINE_PATH}")
+        return []
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    regressions = []
+    if accuracy < baseline["accuracy"] - ACCURACY_TOLERANCE:
+        regressions.append(f"전체 정확도 {baseline['accuracy']:.2%} -> {accuracy:.2%}")
+    for intent, recall in baseline["recall"].items():
+        now = current["recall"].get(intent, 0.0)
+        if now < recall - RECALL_TOLERANCE:
+            regressions.append(f"{intent} 재현율 {recall:.2%} -> {now:.2%}")
+    return regressions
+
+
+def main():
+    logging.disable(logging.INFO)
+    corpus = load_corpus() if CORPUS_PATH.exists() else build_corpus()
+    queries = [item["query"] for item in corpus]
+    print(f"코퍼스: {len(corpus):,}개 질문, 의도 {len({item['intent'] for item in corpus})}종")
+    # 형태소 분석기 로딩 중에는 키워드 매칭만 쓰므로 결과가 섞이지 않게 준비될 때까지 대기
+    analyzer = get_morph_analyzer()
+    analyzer.wait_ready(timeout=60)
+    print(f"형태소 분석기: {analyzer.backend or '없음 (키워드 매칭만)'}")
+
+    accuracy, per_intent, confusions, predictions = accuracy_report(corpus, lambda q: classify_query(q).intent)
+    print(f"\n전체 정확도: {accuracy:.2%}")
+    print(f"{'의도':<18}{'개수':>6}{'정밀도':>9}{'재현율':>9}")
+    for intent, (count, precision, recall) in per_intent.items():
+        print(f"{intent:<18}{count:>6}{precision:>10.1%}{recall:>10.1%}")
+
+    print("\n자주 틀리는 경우 (정답 -> 예측):")
+    for (expected, predicted), count in confusions.most_common(10):
+        example = next(item["query"] for item, p in zip(corpus, predictions) if item["intent"] == expected and p == predicted)
+        print(f"  {expected} -> {predicted}: {count}건 (예: {example!r})")
+
+    expected_llm = sum(item["intent"] == "conversation" for item in corpus) / len(corpus)
+    routed_llm = predictions.count("conversation") / len(corpus)
+    leaked = sum(p == "conversation" and item["intent"] != "conversation" for item, p in zip(corpus, predictions)) / len(corpus)
+    print(f"\nLLM으로 가는 비율: 정답 {expected_llm:.1%}, 라우터 {routed_llm:.1%} (API 질문이 LLM으로 샌 비율 {leaked:.1%})")
+
+    # lru_cache를 거치지 않는 함수를 직접 호출 (classify_query는 캐시 없음)
+    print(f"\n처리량 (캐시 없음, {ROUNDS}회 반복):")
+    for name, func in [("classify_query", classify_query), ("analyze_query", analyze_query_uncached)]:
+        qps, p50, p99 = throughput(queries, func)
+        print(f"  {name:<15}{qps:>12,.0f} QPS   p50 {p50:6.1f}µs   p99 {p99:6.1f}µs")
+
+    regressions = check_baseline(accuracy, per_intent)
+    if regressions:
+        print("\n❌ 라우팅 정확도 회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\n✅ 기준 대비 정확도 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
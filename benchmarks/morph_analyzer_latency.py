@@ -0,0 +1,65 @@
+# benchmarks/morph_analyzer_latency.py
+"""
+형태소 분석기(utils/morph_analyzer)를 켰을 때 쿼리 분석 지연: 키워드 매칭만 vs 분석기 사용 (첫 분석 / 메모이즈된 재분석)
+
+라우팅 코퍼스(benchmarks/data/routing_corpus.jsonl) 전체를 analyze_query의 lru_cache 없이 분석하면서
+p50/p99를 비교하고, 분석기를 켜서 달라진 라우팅/시설명 추출 예시를 보여줍니다.
+konlpy(JVM)를 쓸 수 없는 환경에서는 soynlp 사전 분석기로 측정됩니다.
+
+실행: python -m benchmarks.morph_analyzer_latency
+"""
+import logging
+import statistics
+import time
+
+from benchmarks.routing_corpus import CORPUS_PATH, build_corpus, load_corpus
+from utils.morph_analyzer import MorphAnalyzer, set_morph_analyzer
+from utils.query_analyzer import analyze_query_uncached
+
+EXAMPLES = ["강남구 약국이 어디 있어?", "마포구 연세치과병원 찾아줘", "국회의원 선거 일정이 궁금해", "송파구 하나약국이 몇 시까지 해?"]
+
+
+def measure(queries):
+    """쿼리마다 analyze_query(캐시 없음) 지연 -> (p50 µs, p99 µs, 결과 목록)"""
+    latencies, plans = [], []
+    for query in queries:
+        started = time.perf_counter()
+        plans.append(analyze_query_uncached(query))
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6, plans
+
+
+def use_analyzer(backend):
+    """query_analyzer가 쓰는 공유 분석기를 새 인스턴스로 교체 (메모이즈 캐시가 빈 상태)"""
+    analyzer = MorphAnalyzer(backend=backend)
+    analyzer.wait_ready(timeout=60)
+    return set_morph_analyzer(analyzer)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    corpus = load_corpus() if CORPUS_PATH.exists() else build_corpus()
+    queries = [item["query"] for item in corpus]
+
+    use_analyzer("off")
+    measure(queries)  # 정규식/매처 워밍업
+    p50, p99, baseline_plans = measure(queries)
+    print(f"키워드 매칭만          p50 {p50:6.1f}µs   p99 {p99:6.1f}µs")
+
+    analyzer = use_analyzer("okt")
+    p50, p99, plans = measure(queries)
+    print(f"분석기({analyzer.backend}) 첫 분석   p50 {p50:6.1f}µs   p99 {p99:6.1f}µs")
+    p50, p99, plans = measure(queries)
+    print(f"분석기({analyzer.backend}) 재분석    p50 {p50:6.1f}µs   p99 {p99:6.1f}µs")
+
+    routed = sum(a.intent != b.intent for a, b in zip(baseline_plans, plans))
+    named = sum(a.place_name != b.place_name for a, b in zip(baseline_plans, plans))
+    print(f"\n분석기 사용으로 달라진 결과: 의도 {routed}건, 시설명 {named}건 / {len(queries):,}건")
+    for query in EXAMPLES:
+        plan = analyze_query_uncached(query)
+        print(f"  {query!r}: {plan.intent}, 시설명 {plan.place_name!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# benchmarks/query_classifier_throughput.py
+"""
+쿼리 의도 분류 처리량: 기존 키워드별 in/re.search 체인 vs 컴파일된 분류기 (utils/query_analyzer.classify_query)
+
+키워드/지역구/시간 표현/잡음 단어를 무작위로 섞은 쿼리로
+1) 두 구현의 라우팅 결과(needs_search, is_hospital_search, is_pharmacy_search, is_time_query)가 모두 같은지 확인하고
+2) lru_cache를 거치지 않은 분류 처리량(QPS)을 비교합니다 (로그 출력은 끈 상태로 측정).
+   처리량은 키워드가 빽빽한 위 쿼리와, 실제 트래픽 대부분인 키워드 없는 대화 문장 두 가지로 잽니다.
+기존 구현은 아래 legacy_* 함수에 로그 호출만 빼고 그대로 옮겨 두었습니다.
+키워드 매칭끼리 비교하므로 형태소 분석기("국회의원"의 "의원" 확인 등)는 끄고 측정합니다
+(분석기를 켠 라우팅 정확도/지연은 benchmarks.intent_routing, benchmarks.morph_analyzer_latency).
+
+실행: python -m benchmarks.query_classifier_throughput
+"""
+import logging
+import random
+import re
+import time
+
+from utils.keyword_matcher import ahocorasick
+from utils.morph_analyzer import MorphAnalyzer, set_morph_analyzer
+from utils.query_analyzer import (
+    GREETINGS,
+    SEOUL_DISTRICTS,
+    classify_query,
+    is_hospital_search,
+    is_pharmacy_search,
+    is_time_query,
+    needs_search,
+)
+
+QUERIES = 20_000
+
+
+# --- 기존 구현 (변경 전 utils/query_analyzer.py) ---
+def legacy_is_time_query(query):
+    positive_patterns = [
+        r'(서울|도쿄|뉴욕|런던|파리|베를린|마드리드|로마|밀라노|시드니|홍콩|싱가포르|모스크바|두바이|라스베이거스|시카고|토론토|멜버른)\s*(시간|time)',
+        r'(현재|지금)\s*(시간|time)',
+        r'몇\s*시',
+        r'(오늘|현재|지금|금일)\s*(날짜|date)',
+        r'what\s*time',
+        r'시간\s*(알려|궁금)',
+        r'몇시인지',
+        r'time\s*in'
+    ]
+    negative_patterns = [
+        r'실시간.*?(축구|야구|농구|경기|스포츠|뉴스|주식|코인|정보)',
+        r'시간.*?(부족|없어|모자라|부족해|없다|남아)',
+        r'언제.*?시간',
+        r'시간대.*?날씨',
+        r'시간당',
+        r'시간.*?(걸려|소요|필요)',
+        r'몇.*?시간.*?(후|뒤|전)',
+        r'시간.*?(맞춰|맞추|조정)',
+        r'시간표',
+        r'시간.*?(예약|약속|일정)'
+    ]
+    for pattern in negative_patterns:
+        if re.search(pattern, query):
+            return False
+    for pattern in positive_patterns:
+        if re.search(pattern, query):
+            return True
+    return False
+
+
+def _legacy_public_api_search(query, keywords, facility):
+    query_lower = query.lower().replace(" ", "")
+    web_search_keywords = ["네이버검색", "웹검색", "인터넷검색", "온라인검색", "검색해줘", "검색해", "웹검색"]
+    for keyword in web_search_keywords:
+        if keyword in query_lower:
+            return False
+    for keyword in keywords:
+        if keyword in query_lower:
+            return True
+    for district in SEOUL_DISTRICTS:
+        if district in query and facility in query_lower:
+            return True
+    return False
+
+
+def legacy_is_hospital_search(query):
+    return _legacy_public_api_search(query, [
+        "병원정보", "병원운영", "병원시간", "서울병원", "병원찾기",
+        "병원위치", "병원운영시간", "의원", "클리닉", "진료소"
+    ], "병원")
+
+
+def legacy_is_pharmacy_search(query):
+    return _legacy_public_api_search(query, [
+        "약국", "약국정보", "약국검색", "약국운영", "약국시간",
+        "서울약국", "약국찾기", "약국위치", "약국운영시간"
+    ], "약국")
+
+
+def legacy_needs_search(query):
+    query_lower = query.strip().lower()
+    if "검색해줘" in query_lower or "검색해" in query_lower:
+        return "naver_search"
+    if legacy_is_pharmacy_search(query):
+        return "pharmacy_search"
+    if legacy_is_hospital_search(query):
+        return "hospital_search"
+    if "문화행사" in query_lower or "문화이벤트" in query_lower:
+        return "cultural_event"
+    if "날씨" in query_lower:
+        return "weather" if "내일" not in query_lower else "tomorrow_weather"
+    if "시간" in query_lower or "날짜" in query_lower:
+        if legacy_is_time_query(query_lower):
+            return "time"
+    if "리그순위" in query_lower:
+        return "league_standings"
+    if "리그득점순위" in query_lower or "득점순위" in query_lower:
+        return "league_scorers"
+    if ("챔피언스리그" in query_lower or "ucl" in query_lower) and (
+        "토너먼트" in query_lower or "knockout" in query_lower or "16강" in query_lower or "8강" in query_lower or "4강" in query_lower or "결승" in query_lower):
+        return "cl_knockout"
+    if "약품검색" in query_lower:
+        return "drug"
+    if "공학논문" in query_lower or "arxiv" in query_lower:
+        return "arxiv_search"
+    if "의학논문" in query_lower:
+        return "pubmed_search"
+    if "mbti검사" in query_lower:
+        return "mbti"
+    if "mbti유형설명" in query_lower or "mbti유형" in query_lower or "mbti설명" in query_lower:
+        return "mbti_types"
+    if "다중지능유형설명" in query_lower or "다중지능유형" in query_lower or "다중지능설명" in query_lower or \
+       "다중지능 유형 설명" in query.strip().lower() or "다중지능 유형" in query.strip().lower():
+        return "multi_iq_types"
+    if "다중지능직업" in query_lower or "다중지능추천" in query_lower or \
+       "다중지능 직업" in query.strip().lower() or "다중지능 추천" in query.strip().lower():
+        return "multi_iq_jobs"
+    if "다중지능검사" in query_lower or "다중지능 검사" in query.strip().lower():
+        return "multi_iq"
+    if "다중지능" in query_lower:
+        return "multi_iq_full"
+    if any(greeting in query_lower for greeting in GREETINGS):
+        return "conversation"
+    return "conversation"
+
+
+# --- 쿼리 생성 ---
+FRAGMENTS = [
+    "검색해줘", "검색해", "검색 해줘", "네이버 검색", "웹검색", "약국", "약국 위치", "병원", "병원 정보", "병원운영시간",
+    "의원", "클리닉", "진료소", "서울 병원", "문화행사", "문화 행사", "문화이벤트", "날씨", "내일", "시간", "날짜",
+    "현재 시간", "지금 몇 시", "몇시인지", "what time", "time in", "London time", "런던 시간", "실시간 축구",
+    "시간 부족", "시간표", "시간당", "언제 시간", "몇 시간 후", "시간대 날씨", "시간 알려줘", "오늘 날짜",
+    "리그순위", "리그 순위", "득점순위", "리그득점순위", "챔피언스리그", "UCL", "토너먼트", "16강", "결승",
+    "knockout", "약품검색", "공학논문", "arXiv", "의학논문", "MBTI검사", "MBTI 유형", "mbti설명", "MBTI유형설명",
+    "다중지능", "다중지능 유형", "다중지능유형설명", "다중지능 직업", "다중지능추천", "다중지능 검사", "다중지능설명",
+    "안녕", "하이", "헬로", "ㅎㅇ", "알려줘", "보여줘", "부탁해", "2페이지", "오늘", "서울", "도쿄", "EPL",
+    "인공지능", "파이썬", "맛집", "추천", "뉴스", "주식", "코인", "정보", "?", "!",
+]
+
+
+CONVERSATION_WORDS = [
+    "파이썬으로", "리스트를", "정렬하는", "방법을", "자세히", "설명해", "주세요", "점심", "메뉴", "좀", "해줄래",
+    "인공지능이", "무엇인지", "간단하게", "이", "코드에서", "에러가", "나는", "이유가", "뭘까", "영어로", "번역해줘",
+    "how", "do", "i", "sort", "a", "list", "in", "python", "면접", "준비는", "어떻게", "하면", "좋을까",
+]
+
+
+def build_conversations(count, seed=13):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(CONVERSATION_WORDS) for _ in range(rng.randint(4, 14))) for _ in range(count)]
+
+
+def build_queries(count, seed=11):
+    rng = random.Random(seed)
+    words = FRAGMENTS + SEOUL_DISTRICTS
+    queries = []
+    for _ in range(count):
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 4))]
+        query = "".join(part + rng.choice(["", " ", " ", "  "]) for part in parts)
+        queries.append(rng.choice(["", " "]) + query)
+    return queries
+
+
+def check_identical(queries):
+    checks = (
+        ("needs_search", needs_search, legacy_needs_search),
+        ("is_pharmacy_search", is_pharmacy_search, legacy_is_pharmacy_search),
+        ("is_hospital_search", is_hospital_search, legacy_is_hospital_search),
+        ("is_time_query", is_time_query, legacy_is_time_query),
+    )
+    for name, new, old in checks:
+        mismatches = [q for q in queries if new(q) != old(q)]
+        assert not mismatches, (name, mismatches[:5])
+        print(f"{name:>18}: {len(queries):,}개 쿼리 결과 동일")
+
+
+def throughput(fn, queries):
+    started = time.perf_counter()
+    for query in queries:
+        fn(query)
+    elapsed = time.perf_counter() - started
+    return len(queries) / elapsed
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    set_morph_analyzer(MorphAnalyzer(backend="off").start())
+    print(f"키워드 매처: {'pyahocorasick' if ahocorasick is not None else '정규식 트라이 (pyahocorasick 없음)'}")
+    queries = build_queries(QUERIES)
+    check_identical(queries)
+
+    intents = {}
+    for query in queries:
+        intent = legacy_needs_search(query)
+        intents[intent] = intents.get(intent, 0) + 1
+    print(f"의도 분포: {dict(sorted(intents.items(), key=lambda kv: -kv[1]))}")
+
+    conversations = build_conversations(QUERIES)
+    check_identical(conversations)
+    for label, corpus in (("키워드 혼합 쿼리", queries), ("대화 문장", conversations)):
+        old_qps = throughput(legacy_needs_search, corpus)
+        new_qps = throughput(lambda q: classify_query(q).intent, corpus)
+        print(f"처리량 - {label} (lru_cache 없이): {old_qps:,.0f} -> {new_qps:,.0f} queries/s ({new_qps / old_qps:.1f}x)")
+
+    sample = "강남구 약국 운영시간 알려줘"
+    print(f"예시: {sample!r} -> {classify_query(sample)}")
+
+
+if __name__ == "__main__":
+    main()
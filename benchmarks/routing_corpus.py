@@ -0,0 +1,193 @@
+# benchmarks/routing_corpus.py
+"""
+의도 라우팅 평가용 라벨 코퍼스 생성기 (benchmarks/data/routing_corpus.jsonl)
+
+실제 사용자 질문 모양의 한국어/영어 템플릿에 도시, 지역구, 리그, 약품명, 주제 등을 채워 만듭니다.
+라벨은 needs_search 결과가 아니라 "이 질문이 가야 할 경로"입니다.
+그래서 띄어쓰기 변형("EPL 리그 순위"), 활용형("강남구 병원은 어디야"), 함정("국회의원 선거")처럼
+현재 라우터가 틀리는 질문도 그대로 들어 있고, 틀린 비율은 intent_routing 리포트에 나타납니다.
+시드가 고정되어 있어 다시 만들어도 같은 파일이 나옵니다 (템플릿을 바꿨을 때만 다시 생성해서 커밋).
+
+실행: python -m benchmarks.routing_corpus
+"""
+import json
+import random
+from pathlib import Path
+
+CORPUS_PATH = Path(__file__).parent / "data" / "routing_corpus.jsonl"
+SEED = 2024
+
+CITIES = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "제주", "수원", "춘천", "도쿄", "오사카", "뉴욕", "런던", "파리", "베를린", "시드니", "홍콩"]
+CITIES_EN = ["Seoul", "Busan", "Tokyo", "New York", "London", "Paris", "Berlin", "Sydney"]
+DISTRICTS = [
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구", "노원구", "도봉구", "동대문구", "동작구",
+    "마포구", "서대문구", "서초구", "성동구", "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중랑구"
+]
+LEAGUES = ["EPL", "epl", "프리미어리그", "라리가", "LaLiga", "분데스리가", "세리에A", "리그1", "Ligue1"]
+DRUGS = ["타이레놀", "게보린", "판콜에이", "베아제", "훼스탈", "이부프로펜", "아스피린", "지르텍", "무좀약", "후시딘"]
+PAPER_TOPICS = ["transformer", "diffusion model", "graph neural network", "reinforcement learning", "LLM agents", "speech recognition", "federated learning", "quantum computing"]
+MEDICAL_TOPICS = ["gene therapy", "alzheimer", "diabetes", "cancer immunotherapy", "covid-19 vaccine", "microbiome", "hypertension"]
+SEARCH_TOPICS = ["아이폰 17 출시일", "오늘 코스피", "손흥민 근황", "비트코인 시세", "삼성전자 주가", "맛있는 김치찌개 레시피", "제주도 여행 코스", "최신 AI 뉴스", "파이썬 3.13 변경점"]
+MBTI_TYPES = ["INTJ", "INFP", "ENFP", "ISTJ", "ESTP", "ENTJ", "ISFJ", "INTP"]
+IQ_TYPES = ["언어지능", "논리수학지능", "공간지능", "음악지능", "대인관계지능", "자기이해지능", "자연친화지능", "신체운동지능"]
+CONVERSATION_TOPICS = [
+    "파이썬에서 리스트 정렬하는 방법", "자바스크립트 클로저", "재귀 함수", "SQL 조인", "도커 컨테이너", "깃 리베이스",
+    "운동 루틴", "다이어트 식단", "면접 준비", "영어 공부 방법", "블랙홀", "광합성", "조선 왕조", "인플레이션",
+    "스트레스 관리", "독서 습관", "글쓰기 요령", "시간 관리 방법", "여행 준비물", "요리 초보 팁",
+]
+CONVERSATION_EN = [
+    "how do I reverse a linked list in python", "explain the difference between tcp and udp", "write a haiku about autumn",
+    "what is the capital of australia", "give me tips for a job interview", "summarize the theory of relativity",
+    "how does a hash map work", "recommend a good sci-fi novel", "translate 'good morning' into japanese",
+]
+
+# 의도 -> [(템플릿, 슬롯 목록)]
+TEMPLATES = {
+    "weather": [
+        ("{city} 날씨", "city"), ("{city} 날씨 어때?", "city"), ("오늘 {city} 날씨 알려줘", "city"),
+        ("{city}의 날씨는?", "city"), ("지금 {city} 날씨 좋아?", "city"), ("{city}날씨", "city"),
+        ("weather in {city_en}", "city_en"), ("{city} 날씨가 어때요", "city"),
+    ],
+    "tomorrow_weather": [
+        ("내일 {city} 날씨", "city"), ("{city} 내일 날씨 어때?", "city"), ("내일 {city} 날씨 알려줘", "city"),
+        ("내일 {city}에 비 와? 날씨 알려줘", "city"),
+    ],
+    "time": [
+        ("{city} 시간", "city"), ("{city} 시간 알려줘", "city"), ("현재 시간", None), ("지금 시간 알려줘", None),
+        ("오늘 날짜", None), ("오늘 날짜 알려줘", None), ("{city} 현재 시간 궁금해", "city"),
+        ("{city} 지금 몇 시야?", "city"), ("what time is it in {city_en}", "city_en"),
+    ],
+    "pharmacy_search": [
+        ("{district} 약국", "district"), ("{district} 약국 알려줘", "district"), ("{district} 약국 2페이지", "district"),
+        ("{district}에 있는 약국 찾아줘", "district"), ("{district} 약국 운영시간", "district"),
+        ("{district} 약국이 어디 있어?", "district"), ("{district}약국", "district"), ("{district} 약국 3", "district"),
+    ],
+    "hospital_search": [
+        ("{district} 병원", "district"), ("{district} 병원 정보", "district"), ("{district} 병원정보", "district"),
+        ("{district} 의원 찾아줘", "district"), ("{district} 치과병원", "district"), ("{district} 한의원 알려줘", "district"),
+        ("{district} 클리닉", "district"), ("{district} 병원 2페이지", "district"), ("{district} 병원은 어디야", "district"),
+        ("{district} 근처 병원 운영시간", "district"),
+    ],
+    "naver_search": [
+        ("{topic} 검색해줘", "topic"), ("{topic} 검색해 줘", "topic"), ("네이버에서 {topic} 검색해줘", "topic"),
+        ("{topic} 좀 검색해봐", "topic"), ("{topic} 검색해", "topic"),
+    ],
+    "cultural_event": [
+        ("{district} 문화행사", "district"), ("문화행사 {district}", "district"), ("{district} 문화행사 알려줘", "district"),
+        ("이번 주 문화이벤트 알려줘", None), ("문화행사", None), ("{district} 문화 행사 있어?", "district"),
+    ],
+    "league_standings": [
+        ("{league} 리그순위", "league"), ("{league} 리그순위 보여줘", "league"), ("{league} 리그 순위", "league"),
+        ("{league} 순위 알려줘", "league"),
+    ],
+    "league_scorers": [
+        ("{league} 득점순위", "league"), ("{league} 리그득점순위", "league"), ("{league} 득점순위 알려줘", "league"),
+        ("{league} 득점 순위", "league"),
+    ],
+    "cl_knockout": [
+        ("챔피언스리그 16강 결과", None), ("챔피언스리그 토너먼트", None), ("UCL 8강 일정", None), ("챔피언스리그 결승", None),
+        ("ucl knockout", None), ("챔피언스리그 4강 결과 알려줘", None),
+    ],
+    "drug": [
+        ("약품검색 {drug}", "drug"), ("{drug} 약품검색", "drug"), ("약품검색 {drug} 알려줘", "drug"),
+    ],
+    "arxiv_search": [
+        ("공학논문 {paper}", "paper"), ("arxiv {paper}", "paper"), ("arXiv {paper} 논문", "paper"),
+    ],
+    "pubmed_search": [
+        ("의학논문 {medical}", "medical"), ("의학논문 {medical} 찾아줘", "medical"),
+    ],
+    "mbti": [
+        ("MBTI검사", None), ("mbti검사 하고 싶어", None), ("MBTI검사 링크", None), ("MBTI 검사", None),
+    ],
+    "mbti_types": [
+        ("MBTI유형 {mbti}", "mbti"), ("{mbti} mbti설명", "mbti"), ("MBTI유형설명", None), ("mbti유형 알려줘", None),
+    ],
+    "multi_iq_types": [
+        ("다중지능 유형", None), ("다중지능유형 {iq}", "iq"), ("{iq} 다중지능설명", "iq"), ("다중지능 유형 설명", None),
+    ],
+    "multi_iq_jobs": [
+        ("다중지능 직업 {iq}", "iq"), ("{iq} 다중지능추천", "iq"), ("다중지능직업", None),
+    ],
+    "multi_iq": [
+        ("다중지능 검사", None), ("다중지능검사 하고 싶어", None),
+    ],
+    "multi_iq_full": [
+        ("다중지능", None), ("다중지능이 뭐야", None),
+    ],
+    "conversation": [
+        ("{conv} 알려줘", "conv"), ("{conv}에 대해 설명해줘", "conv"), ("{conv} 좀 자세히 알려줄래?", "conv"),
+        ("{conv_en}", "conv_en"), ("안녕", None), ("안녕하세요", None), ("하이", None), ("헤이 반가워", None),
+        ("고마워", None), ("너는 누구야?", None), ("오늘 기분이 별로야", None),
+        # 키워드가 들어 있지만 API 경로가 아닌 질문
+        ("국회의원 선거 일정이 궁금해", None), ("날씨가 좋으면 뭐 하고 놀까", None), ("시간이 부족해서 고민이야", None),
+        ("서울에서 부산까지 몇 시간 걸려?", None), ("회의 시간표 만들어줘", None), ("약국에서 일하는 약사의 하루", None),
+        ("{conv} 시간 관리랑 같이 설명해줘", "conv"), ("실시간 축구 중계 어디서 봐?", None),
+    ],
+}
+
+SLOTS = {
+    "city": CITIES, "city_en": CITIES_EN, "district": DISTRICTS, "league": LEAGUES, "drug": DRUGS,
+    "paper": PAPER_TOPICS, "medical": MEDICAL_TOPICS, "topic": SEARCH_TOPICS, "mbti": MBTI_TYPES, "iq": IQ_TYPES,
+    "conv": CONVERSATION_TOPICS, "conv_en": CONVERSATION_EN,
+}
+
+# 의도별 목표 개수 (실제 트래픽처럼 일반 대화가 가장 많음)
+TARGET_COUNTS = {
+    "conversation": 900, "pharmacy_search": 260, "hospital_search": 300, "weather": 220, "tomorrow_weather": 90,
+    "time": 150, "naver_search": 160, "cultural_event": 120, "league_standings": 110, "league_scorers": 110,
+    "cl_knockout": 30, "drug": 60, "arxiv_search": 60, "pubmed_search": 40, "mbti": 20, "mbti_types": 40,
+    "multi_iq_types": 40, "multi_iq_jobs": 30, "multi_iq": 10, "multi_iq_full": 10,
+}
+
+# 사용자 입력 흉내: 끝 문장부호, 대소문자, 앞뒤 공백
+SUFFIXES = ["", "", "", "?", "!", " 부탁해", "~"]
+
+
+def expand(template, slot):
+    if slot is None:
+        return [template]
+    return [template.format(**{slot: value}) for value in SLOTS[slot]]
+
+
+def build_corpus(seed=SEED):
+    rng = random.Random(seed)
+    corpus = []
+    for intent, templates in TEMPLATES.items():
+        candidates = sorted({query for template, slot in templates for query in expand(template, slot)})
+        rng.shuffle(candidates)
+        target = TARGET_COUNTS[intent]
+        queries = []
+        # 기본 형태를 먼저 모두 쓰고, 모자라면 접미사/공백 변형을 더함
+        while len(queries) < target:
+            base = candidates[len(queries) % len(candidates)]
+            if len(queries) < len(candidates):
+                queries.append(base)
+            else:
+                variant = base + rng.choice(SUFFIXES)
+                queries.append(rng.choice(["", " "]) + variant if rng.random() < 0.1 else variant)
+        corpus.extend({"query": query, "intent": intent} for query in queries)
+    rng.shuffle(corpus)
+    return corpus
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    corpus = build_corpus()
+    CORPUS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+        for item in corpus:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    counts = {}
+    for item in corpus:
+        counts[item["intent"]] = counts.get(item["intent"], 0) + 1
+    print(f"{len(corpus):,}개 질문 -> {CORPUS_PATH}")
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/singleflight_concurrency.py
+"""
+single-flight 동시성 확인: N개의 동시 호출자 -> upstream 호출 1회
+
+requests.get을 느린 가짜 응답으로 바꿔 FootballAPI / CultureEventAPI에
+동시에 같은 요청을 보내고 실제 upstream 호출 횟수를 셉니다.
+
+실행: python -m benchmarks.singleflight_concurrency
+"""
+import threading
+import time
+from unittest import mock
+
+from utils.cache import MemoryCache
+from utils.culture_event import CultureEventAPI
+from utils.football import FootballAPI
+
+CALLERS = 32
+
+STANDINGS_JSON = {
+    "standings": [{"table": [
+        {"position": 1, "team": {"name": "Arsenal"}, "playedGames": 10, "won": 8, "draw": 1,
+         "lost": 1, "goalsFor": 20, "goalsAgainst": 6, "points": 25}
+    ]}]
+}
+CULTURE_XML = "<culturalEventInfo><row><GUNAME>강남구</GUNAME><TITLE>공연</TITLE><DATE>2099-01-01</DATE></row></culturalEventInfo>"
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.content = payload.encode("utf-8") if isinstance(payload, str) else b""
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def run_concurrently(fn):
+    barrier = threading.Barrier(CALLERS)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(fn())
+
+    threads = [threading.Thread(target=worker) for _ in range(CALLERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def check(name, module_path, payload, call):
+    upstream_calls = []
+
+    def slow_get(*args, **kwargs):
+        upstream_calls.append(args)
+        time.sleep(0.3)
+        return FakeResponse(payload)
+
+    with mock.patch(f"{module_path}.requests.get", side_effect=slow_get):
+        results = run_concurrently(call)
+
+    assert len(results) == CALLERS
+    assert len(upstream_calls) == 1, f"{name}: upstream 호출 {len(upstream_calls)}회"
+    print(f"{name:>22}: {CALLERS} callers -> {len(upstream_calls)} upstream call")
+
+
+def main():
+    football = FootballAPI(api_key="test", cache_handler=MemoryCache())
+    check("fetch_league_standings", "utils.football", STANDINGS_JSON,
+          lambda: football.fetch_league_standings("PL", "프리미어리그 (영국)"))
+
+    culture = CultureEventAPI(api_key="test", cache_handler=MemoryCache())
+    check("fetch_xml", "utils.culture_event", CULTURE_XML, culture.fetch_xml)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,4 +14,49 @@ SPORTS_API_KEY = os.getenv("SPORTS_API_KEY")
 CULTURE_API_KEY = os.getenv("CULTURE_API_KEY")
 DRUG_STORE_KEY = os.getenv("DRUG_STORE_KEY")
 HOSPITAL_KEY = os.getenv("HOSPITAL_KEY")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
\ No newline at end of file
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# 메모리 캐시 바이트 예산 (기본 256MB / 대화 캐시 64MB)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CONVERSATION_CACHE_MAX_BYTES = int(os.getenv("CONVERSATION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# 사이드바 캐시 통계 패널 표시 여부 (운영자용)
+CACHE_ADMIN_PANEL = os.getenv("CACHE_ADMIN_PANEL", "false").lower() in ("1", "true", "yes")
+
+# 시작 시 캐시 워밍 (CACHE_WARMUP_INTERVAL > 0 이면 해당 초마다 반복)
+CACHE_WARMUP_ENABLED = os.getenv("CACHE_WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_WARMUP_INTERVAL = int(os.getenv("CACHE_WARMUP_INTERVAL", 0))
+
+# 공유 캐시 백엔드: memory | disk | redis (redis는 REDIS_URL 필요)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "disk")
+REDIS_URL = os.getenv("REDIS_URL")
+
+# LLM 프로바이더 풀 상태 확인 주기 (초)
+PROVIDER_HEALTH_CHECK_TTL = int(os.getenv("PROVIDER_HEALTH_CHECK_TTL", 300))
+
+# LLM 프로바이더 목록 (쉼표 구분, 앞쪽이 우선) / 느린 요청을 두 번째 프로바이더로 hedge 할지 여부
+LLM_PROVIDERS = [p.strip() for p in os.getenv("LLM_PROVIDERS", "Liaobots").split(",") if p.strip()]
+LLM_HEDGED_REQUESTS = os.getenv("LLM_HEDGED_REQUESTS", "true").lower() in ("1", "true", "yes")
+
+# 스트리밍 응답 제한 시간 (초): 첫 조각까지 / 조각 사이 (넘으면 스트림을 끊고 TimeoutError)
+LLM_FIRST_TOKEN_TIMEOUT = float(os.getenv("LLM_FIRST_TOKEN_TIMEOUT", 30))
+LLM_STREAM_CHUNK_TIMEOUT = float(os.getenv("LLM_STREAM_CHUNK_TIMEOUT", 30))
+
+# LLM 호출 동시 실행 수 / 전체 대기열 깊이 / 사용자별 대기 요청 수 (초과 시 바로 "요청이 많음" 응답)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_MAX_QUEUE_DEPTH = int(os.getenv("LLM_MAX_QUEUE_DEPTH", 32))
+LLM_MAX_QUEUED_PER_USER = int(os.getenv("LLM_MAX_QUEUED_PER_USER", 4))
+
+# 대화 프롬프트 토큰 예산 (시스템 지시 + 검색 컨텍스트 + 최근 대화 + 질문) / 포함할 최근 대화 턴 수
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 3000))
+PROMPT_MAX_TURNS = int(os.getenv("PROMPT_MAX_TURNS", 4))
+
+# 여러 요청이 섞인 질문("서울 날씨랑 EPL 순위")을 나눠 동시에 처리할 때 전체 대기 시간 예산 (초)
+FANOUT_LATENCY_BUDGET = float(os.getenv("FANOUT_LATENCY_BUDGET", 8))
+
+# 한국어 형태소 분석기: okt | komoran | mecab (konlpy, JVM 필요) | soynlp | off
+# konlpy를 못 쓰면 soynlp 사전 분석기로 대체, 로딩 전에는 키워드 매칭만 사용
+MORPH_ANALYZER = os.getenv("MORPH_ANALYZER", "okt")
+MORPH_ANALYZER_WORKERS = int(os.getenv("MORPH_ANALYZER_WORKERS", 2))
+MORPH_ANALYZER_TIMEOUT = float(os.getenv("MORPH_ANALYZER_TIMEOUT", 0.05))
+MORPH_CACHE_SIZE = int(os.getenv("MORPH_CACHE_SIZE", 4096))
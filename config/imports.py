@@ -2,6 +2,7 @@
 # Standard library imports
 import asyncio
 import atexit
+import inspect
 import json
 import random
 import logging
@@ -26,7 +27,6 @@ from functools import lru_cache
 # Third-party imports
 import aiohttp
 import arxiv
-import nest_asyncio
 import pandas as pd
 import pytz
 import requests
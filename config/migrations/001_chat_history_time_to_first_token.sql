@@ -0,0 +1,3 @@
+-- chat_history: 스트리밍 응답의 첫 토큰까지 걸린 시간 (초, 스트리밍하지 않은 응답은 NULL)
+-- Supabase SQL Editor에서 한 번 실행 (적용 전에는 app.py가 이 컬럼 없이 저장)
+ALTER TABLE chat_history ADD COLUMN IF NOT EXISTS time_to_first_token double precision;
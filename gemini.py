@@ -710,6 +710,7 @@ import json
 import requests
 from bs4 import BeautifulSoup
 import re
+import time
 import logging
 from youtube_transcript_api import YouTubeTranscriptApi
 from urllib.parse import urlparse, parse_qs
@@ -727,6 +728,40 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- 스트리밍 응답 ---
+def stream_gemini_response(chat_session, prompt, spinner_text, timing=None, error_label=None):
+    """
+    send_message(stream=True) 응답을 텍스트 조각 단위로 yield 합니다 (st.write_stream용).
+    timing에 첫 조각까지의 시간(time_to_first_token)과 전체 시간(total_time)을 초 단위로 기록합니다.
+    error_label이 있으면 오류를 메시지로 출력하고, 없으면 예외를 그대로 전달합니다.
+    """
+    timing = {} if timing is None else timing
+    started = time.perf_counter()
+    try:
+        # 첫 조각을 받을 때까지 spinner 표시
+        with st.spinner(spinner_text):
+            response = chat_session.send_message(prompt, stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # 안전 필터 등으로 텍스트가 없는 조각
+                continue
+            if text:
+                timing.setdefault("time_to_first_token", time.perf_counter() - started)
+                yield text
+    except Exception as e:
+        if error_label is None:
+            raise
+        logger.error(f"{error_label} 중 오류: {str(e)}")
+        yield f"❌ {error_label} 중 오류가 발생했습니다: {str(e)}"
+    finally:
+        timing["total_time"] = time.perf_counter() - started
+        logger.info(
+            f"⏱️ Gemini 응답 시간 - 첫 토큰: {timing.get('time_to_first_token', timing['total_time']):.2f}초, "
+            f"전체: {timing['total_time']:.2f}초"
+        )
+
 # --- 유튜브 처리 함수들 ---
 def extract_video_id(url):
     """유튜브 URL에서 비디오 ID 추출"""
@@ -790,8 +825,8 @@ def is_youtube_summarization_request(query):
                         return True, url
     return False, None
 
-def summarize_youtube_with_gemini(url, user_query, chat_session, detected_lang):
-    """유튜브 비디오를 Gemini로 요약"""
+def summarize_youtube_with_gemini(url, user_query, chat_session, detected_lang, timing=None):
+    """유튜브 비디오를 Gemini로 요약 (요약은 스트리밍 generator로, 사전 단계 오류는 문자열로 반환)"""
     try:
         video_id = extract_video_id(url)
         if not video_id:
@@ -876,9 +911,7 @@ Format:
 
 ⏱️ **Estimated Watch Time**: Approximate video length (if available)
 """
-        with st.spinner("🤖 Gemini가 유튜브 내용을 요약하는 중..."):
-            response = chat_session.send_message(prompt)
-            return response.text
+        return stream_gemini_response(chat_session, prompt, "🤖 Gemini가 유튜브 내용을 요약하는 중...", timing, error_label="유튜브 요약")
     except Exception as e:
         logger.error(f"유튜브 요약 중 오류: {str(e)}")
         return f"❌ 유튜브 요약 중 오류가 발생했습니다: {str(e)}"
@@ -930,8 +963,8 @@ def fetch_webpage_content(url):
         logger.error(f"웹페이지 내용 추출 오류: {str(e)}")
         return f"❌ '{url}' 내용을 가져올 수 없습니다. 오류: {str(e)}"
 
-def summarize_webpage_with_gemini(url, user_query, chat_session, detected_lang):
-    """웹페이지 내용을 Gemini로 요약"""
+def summarize_webpage_with_gemini(url, user_query, chat_session, detected_lang, timing=None):
+    """웹페이지 내용을 Gemini로 요약 (요약은 스트리밍 generator로, 사전 단계 오류는 문자열로 반환)"""
     try:
         with st.spinner("🌐 웹페이지 내용을 가져오는 중..."):
             content = fetch_webpage_content(url)
@@ -1000,9 +1033,7 @@ Format:
 
 💡 **Conclusion**: Brief conclusion or key message
 """
-        with st.spinner("🤖 Gemini가 내용을 요약하는 중..."):
-            response = chat_session.send_message(prompt)
-            return response.text
+        return stream_gemini_response(chat_session, prompt, "🤖 Gemini가 내용을 요약하는 중...", timing, error_label="웹페이지 요약")
     except Exception as e:
         logger.error(f"웹페이지 요약 중 오류: {str(e)}")
         return f"❌ 웹페이지 요약 중 오류가 발생했습니다: {str(e)}"
@@ -1043,8 +1074,8 @@ def fetch_pdf_text(url, max_chars=8000):
     except Exception as e:
         return f"❌ PDF 파일을 처리할 수 없습니다: {e}", None
 
-def summarize_pdf_with_gemini(url, user_query, chat_session, detected_lang):
-    """PDF 내용을 Gemini로 요약"""
+def summarize_pdf_with_gemini(url, user_query, chat_session, detected_lang, timing=None):
+    """PDF 내용을 Gemini로 요약 (요약은 스트리밍 generator로, 사전 단계 오류는 문자열로 반환)"""
     try:
         content, metadata = fetch_pdf_text(url)
         if content.startswith("❌"):
@@ -1125,9 +1156,7 @@ Format:
 
 💡 **Key Contribution**: Main contribution or significance of the research
 """
-        with st.spinner("🤖 Gemini가 논문을 요약하는 중..."):
-            response = chat_session.send_message(prompt)
-            return response.text
+        return stream_gemini_response(chat_session, prompt, "🤖 Gemini가 논문을 요약하는 중...", timing, error_label="논문 요약")
     except Exception as e:
         logger.error(f"논문 요약 중 오류: {str(e)}")
         return f"❌ 논문 요약 중 오류가 발생했습니다: {str(e)}"
@@ -1301,26 +1330,27 @@ if prompt := st.chat_input("💬 메시지를 입력하세요. (예시: 웹페
     is_pdf_request, pdf_url = is_pdf_summarization_request(prompt)
     
     try:
+        timing = {}
         if is_youtube_request:
-            response_text = summarize_youtube_with_gemini(youtube_url, prompt, st.session_state.chat_session, detected_lang)
-            increment_usage()
+            response = summarize_youtube_with_gemini(youtube_url, prompt, st.session_state.chat_session, detected_lang, timing)
         elif is_webpage_request:
-            response_text = summarize_webpage_with_gemini(webpage_url, prompt, st.session_state.chat_session, detected_lang)
-            increment_usage()
+            response = summarize_webpage_with_gemini(webpage_url, prompt, st.session_state.chat_session, detected_lang, timing)
         elif is_pdf_request:
-            response_text = summarize_pdf_with_gemini(pdf_url, prompt, st.session_state.chat_session, detected_lang)
-            increment_usage()
+            response = summarize_pdf_with_gemini(pdf_url, prompt, st.session_state.chat_session, detected_lang, timing)
         else:
-            with st.spinner("🤖 Gemini가 답변을 생성하는 중..."):
-                system_prompt = get_system_prompt(detected_lang)
-                full_prompt = f"{system_prompt}\n\nUser: {prompt}"
-                response = st.session_state.chat_session.send_message(full_prompt)
-                response_text = response.text
-                increment_usage()
-        
+            system_prompt = get_system_prompt(detected_lang)
+            full_prompt = f"{system_prompt}\n\nUser: {prompt}"
+            response = stream_gemini_response(st.session_state.chat_session, full_prompt, "🤖 Gemini가 답변을 생성하는 중...", timing)
+
+        # 요약/답변은 생성되는 대로 출력 (write_stream이 전체 텍스트를 반환)
         with st.chat_message("assistant", avatar="🤖"):
-            st.markdown(response_text)
-        st.session_state.messages.append({"role": "assistant", "content": response_text})
+            if isinstance(response, str):
+                st.markdown(response)
+                response_text = response
+            else:
+                response_text = st.write_stream(response)
+        increment_usage()
+        st.session_state.messages.append({"role": "assistant", "content": response_text, "timing": timing})
         st.rerun()
     except Exception as e:
         st.error(f"❌ 메시지 전송 중 오류가 발생했습니다: {e}")
@@ -0,0 +1,441 @@
+# utils/cache.py
+import atexit
+import heapq
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from utils.cache_backends import CacheBackend, DiskCacheBackend
+from utils.cache_codec import DEFAULT_COMPRESS_THRESHOLD, CompressedValue, compress_value, decompress_value
+from utils.cache_stats import CacheStatsRecorder
+from utils.columnar import decode_tabular, encode_tabular
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_ttl(ttl):
+    """TTL 설정(int 또는 (soft, hard))을 (soft_ttl, hard_ttl) 튜플로 변환합니다."""
+    if isinstance(ttl, (tuple, list)):
+        soft_ttl, hard_ttl = ttl
+        return min(soft_ttl, hard_ttl), hard_ttl
+    return ttl, ttl
+
+
+def namespace_ttl(cache_ttl, namespace, default):
+    """
+    namespace의 TTL을 반환합니다.
+    - cache_ttl이 {namespace: ttl} dict면 해당 namespace 값 (없으면 default)
+    - ttl 숫자 또는 (soft, hard) 튜플이면 모든 namespace에 같은 값, None이면 default
+    """
+    if cache_ttl is None:
+        return default
+    if isinstance(cache_ttl, dict):
+        return cache_ttl.get(namespace, default)
+    if isinstance(cache_ttl, (int, float, tuple)) and not isinstance(cache_ttl, bool):
+        return cache_ttl
+    raise TypeError(f"지원하지 않는 cache_ttl 형식입니다: {type(cache_ttl).__name__}")
+
+
+def key_namespace(key):
+    """캐시 키의 namespace (첫 ':' 앞부분, 예: "hospital:강남구:1" -> "hospital")"""
+    if isinstance(key, str):
+        return key.split(":", 1)[0]
+    return ""
+
+
+def estimate_size(value, _depth=0):
+    """캐시 값의 메모리 크기(바이트)를 추정합니다."""
+    if isinstance(value, CompressedValue):
+        return sys.getsizeof(value) + sys.getsizeof(value.data)
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        # pandas DataFrame / Series
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except Exception:
+            pass
+
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+class NegativeResult:
+    """'찾을 수 없음' 기록 (짧은 TTL로 캐싱, cached_call이 message로 풀어서 반환)"""
+    __slots__ = ("message",)
+
+    def __init__(self, message=None):
+        self.message = message
+
+    def __repr__(self):
+        return f"NegativeResult({self.message!r})"
+
+
+class _Entry:
+    """메모리 캐시 항목 (stale_at 이후는 stale, expires_at 이후는 만료)"""
+    __slots__ = ("value", "expires_at", "stale_at", "size", "namespace")
+
+    def __init__(self, value, expires_at, stale_at, size, namespace):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_at = stale_at
+        self.size = size
+        self.namespace = namespace
+
+
+class MemoryCache:
+    """
+    메모리 + 공유 백엔드 2단 캐시
+    - 메모리: Segmented LRU (probation / protected 구간), get/setex 모두 O(1)
+    - 만료: TTL min-heap으로 만료된 항목을 즉시 회수 (죽은 항목이 자리를 차지하지 않음)
+    - 백엔드: CacheBackend (utils/cache_backends.py, 선택)
+      - disk_cache에 diskcache.Cache를 넘기면 DiskCacheBackend로 감쌈
+      - replica 간 공유는 backend=RedisBackend(...)
+      - 메모리 미스 시 백엔드 값을 남은 TTL 그대로 메모리로 승격 (통계상 disk_hits)
+      - setex의 백엔드 쓰기는 백그라운드 write-behind 큐에서 배치 처리
+      - ARROW_MIN_ROWS 이상인 DataFrame 값은 백엔드에 Arrow IPC로 저장 (메모리 계층은 DataFrame 그대로, utils/columnar.py)
+    - TTL: setex에 (soft, hard) 튜플을 넘기면 soft TTL 이후 stale 상태로 표시
+      (stale-while-revalidate, get_with_state 참고)
+    - 용량: 항목 수(max_size)와 추정 바이트(max_bytes), namespace별 바이트 상한
+      (namespace_quotas, 예: {"conv": 32MB, "hospital": 64MB})을 함께 적용
+    - NegativeResult 값의 적중은 negative_hits로 따로 집계
+    - namespace별 적중/미스/백엔드 적중/축출/만료/조회 지연은 snapshot()으로 조회
+    - compress_threshold 이상의 str/bytes 값은 압축해서 메모리/백엔드에 보관하고 get 시점에 복원
+      (None이면 압축 안 함, utils/cache_codec.py)
+    """
+
+    def __init__(self, max_size=1000, disk_cache=None, protected_ratio=0.8,
+                 write_behind=True, write_queue_size=1000, write_batch_size=50,
+                 max_bytes=None, namespace_quotas=None, backend=None,
+                 compress_threshold=DEFAULT_COMPRESS_THRESHOLD, compression=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.namespace_quotas = dict(namespace_quotas or {})
+        if backend is None and disk_cache is not None:
+            backend = disk_cache if isinstance(disk_cache, CacheBackend) else DiskCacheBackend(disk_cache)
+        self.backend = backend
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        self.protected_size = max(1, int(max_size * protected_ratio))
+        self._probation = OrderedDict()  # 한 번 접근된 항목 (신규)
+        self._protected = OrderedDict()  # 두 번 이상 접근된 항목
+        self._expiry_heap = []  # (expires_at, key)
+        self._lock = threading.RLock()
+
+        # 바이트 계산: 전체 / namespace별 합계, namespace별 접근 순서 (quota 축출용)
+        self._bytes = 0
+        self._ns_bytes = {}
+        self._ns_keys = {}
+
+        # 통계
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.stats = CacheStatsRecorder()
+
+        # 백엔드 write-behind
+        self.write_behind = write_behind and backend is not None
+        self.write_batch_size = write_batch_size
+        self._write_queue = queue.Queue(maxsize=write_queue_size)
+        self._pending = {}  # 아직 백엔드에 반영되지 않은 항목: key -> (value, expires_at, stale_at)
+        self._writer = None
+        if self.write_behind:
+            self._writer = threading.Thread(target=self._write_loop, name="cache-write-behind", daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._probation) + len(self._protected)
+
+    def get(self, key):
+        return self.get_with_state(key)[0]
+
+    def get_with_state(self, key):
+        """(값, stale 여부)를 반환합니다. hard TTL이 지난 항목은 (None, False)."""
+        started = time.perf_counter()
+        value, is_stale, outcome = self._lookup(key)
+        if isinstance(value, CompressedValue):
+            try:
+                value = decompress_value(value)
+            except Exception as e:
+                logger.error(f"캐시 값 압축 해제 실패 ({key}): {str(e)}")
+                value, is_stale, outcome = None, False, "miss"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        negative = isinstance(value, NegativeResult)
+
+        with self._lock:
+            if outcome == "hit":
+                self.memory_hits += 1
+            elif outcome == "disk_hit":
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            if negative:
+                self.negative_hits += 1
+        self.stats.record_lookup(key_namespace(key), outcome, elapsed_ms, negative)
+        return value, is_stale
+
+    def _lookup(self, key):
+        """(값, stale 여부, "hit" | "disk_hit" | "miss")를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+
+            entry = self._probation.pop(key, None)
+            if entry is not None:
+                # 재접근된 항목은 protected 구간으로 승격
+                self._protected[key] = entry
+                self._shrink_protected()
+                self._ns_keys[entry.namespace].move_to_end(key)
+                return entry.value, now >= entry.stale_at, "hit"
+
+            entry = self._protected.get(key)
+            if entry is not None:
+                self._protected.move_to_end(key)
+                self._ns_keys[entry.namespace].move_to_end(key)
+                return entry.value, now >= entry.stale_at, "hit"
+
+            pending = self._pending.get(key)
+            if pending is not None and pending[1] > now:
+                self._store(key, pending[0], pending[1], pending[2])
+                return pending[0], now >= pending[2], "hit"
+
+        if self.backend is None:
+            return None, False, "miss"
+
+        try:
+            item = self.backend.get(key)
+            if item is not None:
+                item = (decode_tabular(item[0]), item[1], item[2])
+        except Exception as e:
+            # 공유 백엔드 장애는 미스로 처리 (upstream에서 다시 가져옴)
+            logger.error(f"캐시 백엔드 조회 실패 ({self.backend.name}): {str(e)}")
+            item = None
+        if item is None:
+            return None, False, "miss"
+
+        # 백엔드 적중 -> 남은 TTL로 메모리 승격 (이후 적중은 백엔드 조회/역직렬화 없음)
+        value, expires_at, stale_at = item
+        with self._lock:
+            self._store(key, value, expires_at, stale_at)
+        return value, now >= stale_at, "disk_hit"
+
+    def setex(self, key, ttl, value):
+        """ttl은 초 단위 int 또는 (soft_ttl, hard_ttl) 튜플"""
+        soft_ttl, hard_ttl = resolve_ttl(ttl)
+        now = time.time()
+        expires_at = now + hard_ttl
+        stale_at = now + soft_ttl
+        if self.compress_threshold is not None:
+            value = compress_value(value, self.compress_threshold, self.compression)
+        with self._lock:
+            self._store(key, value, expires_at, stale_at)
+        self.stats.increment(key_namespace(key), "sets")
+
+        if self.backend is None:
+            return
+        if not self.write_behind:
+            self._write_batch([(key, value, expires_at, stale_at)])
+            return
+
+        with self._lock:
+            self._pending[key] = (value, expires_at, stale_at)
+        try:
+            self._write_queue.put_nowait((key, value, expires_at, stale_at))
+        except queue.Full:
+            # 큐가 가득 차면 요청 경로에서 직접 기록 (backpressure)
+            self._write_batch([(key, value, expires_at, stale_at)])
+
+    def flush(self):
+        """대기 중인 백엔드 쓰기를 모두 반영합니다 (종료 시 호출)."""
+        if not self.write_behind:
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write_batch(batch)
+        for _ in batch:
+            self._write_queue.task_done()
+        # 작성 스레드가 처리 중인 배치까지 대기
+        self._write_queue.join()
+
+    def get_stats(self):
+        """메모리/백엔드 적중 통계를 반환합니다."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "size": len(self._probation) + len(self._protected),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "pending_writes": len(self._pending),
+                "backend": self.backend.name if self.backend is not None else None
+            }
+
+    def snapshot(self):
+        """전체 통계 + namespace별 통계(바이트 포함)를 반환합니다."""
+        namespaces = self.stats.snapshot()
+        for namespace, usage in self.get_namespace_bytes().items():
+            namespaces.setdefault(namespace, {}).update(usage)
+        return {"totals": self.get_stats(), "namespaces": namespaces}
+
+    def get_namespace_bytes(self):
+        """namespace별 현재 바이트/항목 수/상한을 반환합니다."""
+        with self._lock:
+            return {
+                namespace: {
+                    "bytes": self._ns_bytes.get(namespace, 0),
+                    "entries": len(keys),
+                    "quota": self.namespace_quotas.get(namespace)
+                }
+                for namespace, keys in self._ns_keys.items()
+            }
+
+    def _store(self, key, value, expires_at, stale_at):
+        """메모리 계층에 저장 (lock 안에서 호출)"""
+        self._purge_expired(time.time())
+
+        namespace = key_namespace(key)
+        size = estimate_size(value)
+        quota = self.namespace_quotas.get(namespace)
+        if (self.max_bytes is not None and size > self.max_bytes) or (quota is not None and size > quota):
+            # 예산보다 큰 값은 메모리에 두지 않음 (백엔드 계층만 사용)
+            self._remove(key)
+            logger.debug(f"메모리 예산 초과 항목은 캐싱 생략: {key} ({size} bytes)")
+            return
+
+        entry = self._protected.get(key)
+        if entry is not None:
+            self._account(entry, -1)
+            entry.value = value
+            entry.expires_at = expires_at
+            entry.stale_at = stale_at
+            entry.size = size
+            self._protected.move_to_end(key)
+        else:
+            self._remove(key)
+            entry = _Entry(value, expires_at, stale_at, size, namespace)
+            self._probation[key] = entry
+        self._account(entry, 1)
+        self._ns_keys.setdefault(namespace, OrderedDict())[key] = None
+        self._ns_keys[namespace].move_to_end(key)
+
+        # namespace 상한: 같은 namespace에서 가장 오래 쓰이지 않은 항목부터 축출
+        if quota is not None:
+            while self._ns_bytes[namespace] > quota:
+                self._remove(next(iter(self._ns_keys[namespace])))
+                self.stats.increment(namespace, "evictions")
+        # 전체 항목 수 / 바이트 제한
+        while len(self._probation) + len(self._protected) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes):
+            self._evict_one()
+
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        self._compact_heap()
+
+    def _account(self, entry, sign):
+        """전체/namespace 바이트 합계 갱신"""
+        delta = sign * entry.size
+        self._bytes += delta
+        self._ns_bytes[entry.namespace] = self._ns_bytes.get(entry.namespace, 0) + delta
+
+    def _remove(self, key):
+        """메모리 계층에서 항목 제거 (lock 안에서 호출)"""
+        entry = self._probation.pop(key, None)
+        if entry is None:
+            entry = self._protected.pop(key, None)
+        if entry is None:
+            return None
+        self._account(entry, -1)
+        keys = self._ns_keys[entry.namespace]
+        del keys[key]
+        if not keys:
+            del self._ns_keys[entry.namespace]
+            del self._ns_bytes[entry.namespace]
+        return entry
+
+    def _write_loop(self):
+        """write-behind 작성 스레드: 큐에서 최대 write_batch_size개씩 모아 기록"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        try:
+            self.backend.set_many([
+                (key, encode_tabular(value), expires_at, stale_at)
+                for key, value, expires_at, stale_at in batch
+            ])
+        except Exception as e:
+            logger.error(f"캐시 백엔드 기록 실패 ({self.backend.name}): {str(e)}")
+        finally:
+            with self._lock:
+                for key, value, expires_at, _ in batch:
+                    pending = self._pending.get(key)
+                    if pending is not None and pending[0] is value and pending[1] == expires_at:
+                        del self._pending[key]
+
+    def _evict_one(self):
+        """probation 구간의 가장 오래된 항목부터 제거"""
+        segment = self._probation or self._protected
+        if segment:
+            entry = self._remove(next(iter(segment)))
+            self.stats.increment(entry.namespace, "evictions")
+
+    def _shrink_protected(self):
+        """protected 구간이 가득 차면 가장 오래된 항목을 probation으로 강등"""
+        while len(self._protected) > self.protected_size:
+            key, entry = self._protected.popitem(last=False)
+            self._probation[key] = entry
+
+    def _purge_expired(self, now):
+        """만료 시각이 지난 항목을 heap 순서대로 제거"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._probation.get(key) or self._protected.get(key)
+            # 갱신/제거된 항목의 오래된 heap 기록은 무시
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.stats.increment(entry.namespace, "expirations")
+
+    def _compact_heap(self):
+        """덮어쓰기/축출로 쌓인 오래된 heap 기록 정리 (분할 상환 O(1))"""
+        live = len(self._probation) + len(self._protected)
+        if len(self._expiry_heap) <= 2 * live + 64:
+            return
+        self._expiry_heap = [
+            (entry.expires_at, key)
+            for segment in (self._probation, self._protected)
+            for key, entry in segment.items()
+        ]
+        heapq.heapify(self._expiry_heap)
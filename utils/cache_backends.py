@@ -0,0 +1,230 @@
+# utils/cache_backends.py
+import logging
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+NO_EXPIRY = float("inf")
+
+
+class CacheBackend:
+    """
+    MemoryCache 뒤의 공유 캐시 계층 인터페이스
+    - 시각은 모두 time.time() 기준 절대값 (expires_at: 만료, stale_at: soft TTL 경계)
+    - get: 만료 전이면 (value, expires_at, stale_at), 없거나 만료면 None
+    - set_many: [(key, value, expires_at, stale_at), ...] 일괄 기록 (이미 만료된 항목은 건너뜀)
+    """
+
+    name = "base"
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set_many(self, items):
+        raise NotImplementedError
+
+    def set(self, key, value, expires_at, stale_at=None):
+        self.set_many([(key, value, expires_at, expires_at if stale_at is None else stale_at)])
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class InProcessBackend(CacheBackend):
+    """프로세스 내부 dict 저장소 (단일 프로세스/개발용)"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._data[key]
+                return None
+            return item
+
+    def set_many(self, items):
+        now = time.time()
+        with self._lock:
+            for key, value, expires_at, stale_at in items:
+                if expires_at > now:
+                    self._data[key] = (value, expires_at, stale_at)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class DiskCacheBackend(CacheBackend):
+    """diskcache.Cache 저장소 (같은 호스트의 프로세스끼리 공유, soft TTL 경계는 tag에 보관)"""
+
+    name = "disk"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, key):
+        value, expire_time, tag = self.cache.get(key, expire_time=True, tag=True)
+        if value is None:
+            return None
+        expires_at = NO_EXPIRY if expire_time is None else expire_time
+        stale_at = tag if isinstance(tag, float) else expires_at
+        return value, expires_at, stale_at
+
+    def set_many(self, items):
+        now = time.time()
+        with self.cache.transact():
+            for key, value, expires_at, stale_at in items:
+                if expires_at <= now:
+                    continue
+                expire = None if expires_at == NO_EXPIRY else expires_at - now
+                tag = stale_at if stale_at < expires_at else None
+                self.cache.set(key, value, expire=expire, tag=tag)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+    def close(self):
+        self.cache.close()
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis 프로토콜 저장소 (여러 호스트의 replica끼리 공유)
+    - 값은 pickle((value, stale_at))로 저장, 만료는 Redis PX/PTTL에 맡김
+    - client: redis-py 호환 객체 (get / set(px=) / pttl / pipeline)
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix="chatbot:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, prefix="chatbot:"):
+        import redis  # 선택 의존성: Redis 백엔드를 쓸 때만 필요
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def get(self, key):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + key)
+        pipe.pttl(self.prefix + key)
+        payload, pttl = pipe.execute()
+        if payload is None:
+            return None
+        try:
+            value, stale_at = pickle.loads(payload)
+        except Exception as e:
+            logger.error(f"Redis 캐시 역직렬화 실패 ({key}): {str(e)}")
+            return None
+        # PTTL: -1은 만료 없음, -2는 키 없음
+        if pttl == -2:
+            return None
+        expires_at = NO_EXPIRY if pttl == -1 else time.time() + pttl / 1000
+        return value, expires_at, min(stale_at, expires_at)
+
+    def set_many(self, items):
+        now = time.time()
+        pipe = self.client.pipeline()
+        for key, value, expires_at, stale_at in items:
+            if expires_at <= now:
+                continue
+            payload = pickle.dumps((value, stale_at), protocol=pickle.HIGHEST_PROTOCOL)
+            if expires_at == NO_EXPIRY:
+                pipe.set(self.prefix + key, payload)
+            else:
+                pipe.set(self.prefix + key, payload, px=max(1, int((expires_at - now) * 1000)))
+        pipe.execute()
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+class LocalRedisStandIn:
+    """
+    RedisBackend가 쓰는 redis-py 명령만 흉내 내는 프로세스 내 대체물 (Redis 서버 없이 검증용)
+    - get / set(px=) / pttl / delete / pipeline
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (bytes, expires_at 또는 None)
+
+    def _alive(self, key, now):
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= now:
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key):
+        with self._lock:
+            item = self._alive(key, time.time())
+            return None if item is None else item[0]
+
+    def set(self, key, value, px=None):
+        with self._lock:
+            self._data[key] = (value, None if px is None else time.time() + px / 1000)
+        return True
+
+    def pttl(self, key):
+        with self._lock:
+            now = time.time()
+            item = self._alive(key, now)
+            if item is None:
+                return -2
+            if item[1] is None:
+                return -1
+            return int((item[1] - now) * 1000)
+
+    def delete(self, key):
+        with self._lock:
+            return 1 if self._data.pop(key, None) is not None else 0
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue_command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue_command
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+def create_cache_backend(kind="disk", directory="cache_directory", redis_url=None):
+    """설정값(memory | disk | redis)에 맞는 백엔드를 생성합니다."""
+    if kind == "memory":
+        return InProcessBackend()
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("redis 백엔드에는 REDIS_URL이 필요합니다.")
+        return RedisBackend.from_url(redis_url)
+    from diskcache import Cache
+    return DiskCacheBackend(Cache(directory))
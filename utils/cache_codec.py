@@ -0,0 +1,85 @@
+# utils/cache_codec.py
+import logging
+import zlib
+
+try:
+    import zstandard  # 선택 의존성: 설치되어 있으면 zstd 사용
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 이 크기(바이트) 이상의 문자열/바이트 값만 압축
+DEFAULT_COMPRESS_THRESHOLD = 4096
+# 압축 후 크기가 원본의 이 비율을 넘으면 압축하지 않음 (이득이 작음)
+MAX_COMPRESSED_RATIO = 0.9
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+
+class CompressedValue:
+    """압축된 캐시 값 (get 시점에 풀어서 반환)"""
+    __slots__ = ("codec", "data", "is_text", "raw_size")
+
+    def __init__(self, codec, data, is_text, raw_size):
+        self.codec = codec
+        self.data = data
+        self.is_text = is_text
+        self.raw_size = raw_size
+
+    def __getstate__(self):
+        return (self.codec, self.data, self.is_text, self.raw_size)
+
+    def __setstate__(self, state):
+        self.codec, self.data, self.is_text, self.raw_size = state
+
+    def __repr__(self):
+        return f"CompressedValue({self.codec}, {len(self.data)}/{self.raw_size} bytes)"
+
+
+def default_codec():
+    """사용 가능한 압축 방식 (zstd 우선, 없으면 zlib)"""
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress_value(value, threshold=DEFAULT_COMPRESS_THRESHOLD, codec=None):
+    """threshold 이상인 str/bytes 값을 CompressedValue로 바꿉니다. 그 외 값은 그대로 반환합니다."""
+    if isinstance(value, str):
+        # 한글은 UTF-8로 3바이트이므로 길이*3 >= threshold 인 경우만 인코딩 시도
+        if len(value) * 3 < threshold:
+            return value
+        raw = value.encode("utf-8")
+        is_text = True
+    elif isinstance(value, bytes):
+        raw = value
+        is_text = False
+    else:
+        return value
+
+    if len(raw) < threshold:
+        return value
+
+    codec = codec or default_codec()
+    if codec == "zstd" and _zstd_compressor is not None:
+        data = _zstd_compressor.compress(raw)
+    else:
+        codec = "zlib"
+        data = zlib.compress(raw, 6)
+
+    if len(data) > len(raw) * MAX_COMPRESSED_RATIO:
+        return value
+    return CompressedValue(codec, data, is_text, len(raw))
+
+
+def decompress_value(value):
+    """CompressedValue면 원래 값으로 복원하고, 아니면 그대로 반환합니다."""
+    if not isinstance(value, CompressedValue):
+        return value
+    if value.codec == "zstd":
+        if _zstd_decompressor is None:
+            raise RuntimeError("zstd로 압축된 캐시 값이지만 zstandard가 설치되어 있지 않습니다.")
+        raw = _zstd_decompressor.decompress(value.data, max_output_size=value.raw_size)
+    else:
+        raw = zlib.decompress(value.data)
+    return raw.decode("utf-8") if value.is_text else raw
@@ -0,0 +1,107 @@
+# utils/cache_stats.py
+import bisect
+import threading
+
+# 조회 지연 히스토그램 구간 경계 (ms)
+LATENCY_BUCKETS_MS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500)
+
+
+class LatencyHistogram:
+    """고정 구간 지연 히스토그램 (기록 O(log 구간 수), 메모리 고정)"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # 마지막 칸은 최대 경계 초과
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.counts[bisect.bisect_left(self.bounds, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, q):
+        """구간 상한으로 근사한 백분위수 (ms)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        labels = [f"<={b}ms" for b in self.bounds] + [f">{self.bounds[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 4),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class NamespaceStats:
+    """캐시 키 namespace(drug, naver, hospital, conv ...)별 카운터"""
+
+    FIELDS = ("hits", "disk_hits", "misses", "negative_hits", "sets", "evictions", "expirations")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self.latency = LatencyHistogram()
+
+    def snapshot(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        lookups = self.hits + self.disk_hits + self.misses
+        data["hit_rate"] = round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+        data["latency"] = self.latency.snapshot()
+        return data
+
+
+class CacheStatsRecorder:
+    """namespace별 통계 기록기 (MemoryCache가 get/setex/축출/만료 시 호출)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._namespaces = {}
+
+    def _get(self, namespace):
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces[namespace] = NamespaceStats()
+        return stats
+
+    def record_lookup(self, namespace, outcome, elapsed_ms, negative=False):
+        """outcome: "hit" | "disk_hit" | "miss" """
+        with self._lock:
+            stats = self._get(namespace)
+            if outcome == "hit":
+                stats.hits += 1
+            elif outcome == "disk_hit":
+                stats.disk_hits += 1
+            else:
+                stats.misses += 1
+            if negative:
+                stats.negative_hits += 1
+            stats.latency.record(elapsed_ms)
+
+    def increment(self, namespace, field, amount=1):
+        with self._lock:
+            stats = self._get(namespace)
+            setattr(stats, field, getattr(stats, field) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {namespace: stats.snapshot() for namespace, stats in sorted(self._namespaces.items())}
+
+    def reset(self):
+        with self._lock:
+            self._namespaces.clear()
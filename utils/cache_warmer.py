@@ -0,0 +1,202 @@
+# utils/cache_warmer.py
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.query_analyzer import LEAGUE_MAPPING, SEOUL_DISTRICTS
+
+logger = logging.getLogger(__name__)
+
+# name: 로그용 이름, upstream: 요청 간격 제한을 공유하는 외부 API 이름, fn: 인자 없는 호출
+WarmTask = namedtuple("WarmTask", ["name", "upstream", "fn"])
+
+# upstream별 최소 요청 간격 (초)
+DEFAULT_RATE_LIMITS = {
+    "football": 6.0,        # football-data.org 무료 플랜: 분당 10회
+    "seoul_openapi": 0.5,   # 서울 열린데이터광장 (병원/약국)
+    "openweathermap": 0.2
+}
+
+# upstream별 동시 요청 수 (기본 1)
+DEFAULT_UPSTREAM_CONCURRENCY = {
+    "seoul_openapi": 2
+}
+
+# API 클래스는 실패해도 예외 대신 안내 문구를 반환하므로 문구로 실패를 판별
+# (weather/hos/drug_store의 오류 메시지, _fetch_*_data의 status=error message는 접두어로 비교)
+_FAILURE_MARKERS = ("오류가 발생했습니다", "가져올 수 없습니다", "도시를 찾을 수 없습니다", "처리될 수 없습니다")
+_FAILURE_PREFIXES = ("API 오류:", "데이터 요청 오류:", "XML 파싱 오류:", "오류 발생:",
+                     "네트워크 오류:", "데이터 파싱 오류:", "알 수 없는 오류:")
+
+
+def _failure_reason(result):
+    """워밍 결과가 실패 응답이면 사유를, 정상이면 None을 반환합니다."""
+    if result is None:
+        return "빈 응답"
+    if isinstance(result, dict):
+        # football: {"league_name", "error"}, 내부 조회: {"status": "error", "message"}
+        if result.get("error"):
+            return result["error"]
+        if result.get("status") == "error":
+            return result.get("message") or "status=error"
+        return None
+    if isinstance(result, str):
+        text = result.strip()
+        if text.startswith(_FAILURE_PREFIXES) or any(marker in text for marker in _FAILURE_MARKERS):
+            return text
+    return None
+
+
+class _RateLimiter:
+    """upstream별 최소 요청 간격 보장 (여러 작업 스레드가 공유)"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_for = max(0.0, self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.min_interval
+        if wait_for:
+            time.sleep(wait_for)
+
+
+def build_default_warm_tasks(apis, districts=SEOUL_DISTRICTS, leagues=None, cities=("서울",)):
+    """
+    자주 들어오는 쿼리의 워밍 작업 목록을 만듭니다.
+    - 25개 구 병원/약국, LEAGUE_MAPPING 6개 리그 순위/득점, 서울 날씨/내일 예보
+    """
+    leagues = LEAGUE_MAPPING.values() if leagues is None else leagues
+    tasks = []
+
+    for city in cities:
+        tasks.append(WarmTask(f"weather:{city}", "openweathermap",
+                              lambda city=city: apis["weather"].get_city_weather(city)))
+        tasks.append(WarmTask(f"forecast:{city}", "openweathermap",
+                              lambda city=city: apis["weather"].get_forecast_by_day(city, 1)))
+
+    for league in leagues:
+        code, name = league["code"], league["name"]
+        tasks.append(WarmTask(f"league_standings:{code}", "football",
+                              lambda code=code, name=name: apis["football"].fetch_league_standings(code, name)))
+        tasks.append(WarmTask(f"league_scorers:{code}", "football",
+                              lambda code=code, name=name: apis["football"].fetch_league_scorers(code, name)))
+
+    for district in districts:
+        tasks.append(WarmTask(f"hospital:{district}", "seoul_openapi",
+                              lambda district=district: apis["hospital"].search_hospitals(f"{district} 병원")))
+        tasks.append(WarmTask(f"pharmacy:{district}", "seoul_openapi",
+                              lambda district=district: apis["drug_store"].search_pharmacies(f"{district} 약국")))
+
+    return tasks
+
+
+class CacheWarmer:
+    """
+    배포 직후 콜드 캐시 지연을 줄이기 위해 자주 쓰이는 키를 API 클래스로 미리 조회합니다.
+    - max_workers: 전체 동시 실행 수 제한
+    - rate_limits: upstream별 최소 요청 간격 (초)
+    - upstream_concurrency: upstream별 동시 요청 수 (작업을 upstream별 순차 lane으로 나눠 실행하므로
+      느린 upstream의 대기가 다른 upstream을 막지 않음)
+    - 결과는 각 API 클래스가 평소처럼 캐시에 저장 (실패 응답은 저장되지 않음)
+    - API 클래스가 예외 대신 돌려주는 오류 문구/error dict도 실패로 집계
+    """
+
+    def __init__(self, tasks, max_workers=4, rate_limits=None, upstream_concurrency=None):
+        self.tasks = list(tasks)
+        self.max_workers = max_workers
+        limits = dict(DEFAULT_RATE_LIMITS)
+        limits.update(rate_limits or {})
+        self._limiters = {upstream: _RateLimiter(interval) for upstream, interval in limits.items()}
+        self.upstream_concurrency = dict(DEFAULT_UPSTREAM_CONCURRENCY)
+        self.upstream_concurrency.update(upstream_concurrency or {})
+        self.last_report = None
+        self._stop = threading.Event()
+
+    def run(self):
+        """모든 워밍 작업을 실행하고 소요 시간 보고서를 반환합니다."""
+        started = time.perf_counter()
+        succeeded = 0
+        failed = []
+        upstream_seconds = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cache-warmer") as executor:
+            futures = [executor.submit(self._run_lane, lane) for lane in self._build_lanes()]
+            for future in as_completed(futures):
+                for task, ok, elapsed in future.result():
+                    upstream_seconds[task.upstream] = upstream_seconds.get(task.upstream, 0.0) + elapsed
+                    if ok:
+                        succeeded += 1
+                    else:
+                        failed.append(task.name)
+
+        report = {
+            "total": len(self.tasks),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+            "upstream_seconds": {k: round(v, 2) for k, v in upstream_seconds.items()}
+        }
+        self.last_report = report
+        logger.info(
+            f"🔥 캐시 워밍 완료: {report['succeeded']}/{report['total']} 성공, "
+            f"{report['elapsed_seconds']}초 소요"
+        )
+        return report
+
+    def start(self, interval=None):
+        """백그라운드 스레드에서 실행합니다. interval(초)을 주면 주기적으로 반복합니다."""
+        thread = threading.Thread(target=self._loop, args=(interval,), name="cache-warmer", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"캐시 워밍 오류: {str(e)}")
+            if not interval or self._stop.wait(interval):
+                break
+
+    def _build_lanes(self):
+        """upstream별 작업을 동시 요청 수만큼의 순차 lane으로 분배"""
+        grouped = {}
+        for task in self.tasks:
+            grouped.setdefault(task.upstream, []).append(task)
+        lanes = []
+        for upstream, tasks in grouped.items():
+            n = max(1, self.upstream_concurrency.get(upstream, 1))
+            lanes.extend(tasks[i::n] for i in range(min(n, len(tasks))))
+        return lanes
+
+    def _run_lane(self, lane):
+        results = []
+        for task in lane:
+            if self._stop.is_set():
+                break
+            results.append((task, *self._run_task(task)))
+        return results
+
+    def _run_task(self, task):
+        limiter = self._limiters.get(task.upstream)
+        if limiter is not None:
+            limiter.wait()
+        started = time.perf_counter()
+        try:
+            reason = _failure_reason(task.fn())
+        except Exception as e:
+            reason = str(e)
+        elapsed = time.perf_counter() - started
+        if reason is not None:
+            logger.warning(f"캐시 워밍 실패 ({task.name}): {reason}")
+            return False, elapsed
+        return True, elapsed
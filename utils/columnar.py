@@ -0,0 +1,83 @@
+# utils/columnar.py
+import logging
+
+import pandas as pd
+
+try:
+    import pyarrow as pa  # 선택 의존성: 없으면 DataFrame을 그대로(pickle) 저장
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# 이 행 수 이상인 DataFrame만 Arrow로 저장 (benchmarks/dataframe_serialization.py의 크기 교차점 측정:
+# 40~44행부터 lz4 Arrow가 pickle보다 작고 그보다 작은 표는 pickle이 더 작음, 여유를 두고 48행)
+# Arrow는 행 수와 관계없이 직렬화가 pickle보다 느리지만 인코딩은 write-behind 스레드, 디코딩은 백엔드 적중 때만 발생
+ARROW_MIN_ROWS = 48
+# IPC 버퍼 압축 (pyarrow 내장 코덱)
+ARROW_COMPRESSION = "lz4" if pa is not None and pa.Codec.is_available("lz4") else None
+
+
+class ArrowFrame:
+    """Arrow IPC stream으로 직렬화된 DataFrame (캐시 백엔드 저장용)"""
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __getstate__(self):
+        return self.payload
+
+    def __setstate__(self, state):
+        self.payload = state
+
+    def __repr__(self):
+        return f"ArrowFrame({len(self.payload)} bytes)"
+
+
+def frame_to_arrow(df):
+    """DataFrame -> Arrow IPC bytes"""
+    table = pa.Table.from_pandas(df, preserve_index=None)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=ARROW_COMPRESSION)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_to_frame(payload):
+    """Arrow IPC bytes -> DataFrame (압축 버퍼를 풀어서 읽음, split_blocks로 블록 병합 복사 생략)"""
+    table = pa.ipc.open_stream(pa.py_buffer(payload)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _is_large_frame(value, min_rows):
+    return isinstance(value, pd.DataFrame) and len(value) >= min_rows
+
+
+def encode_tabular(value, min_rows=ARROW_MIN_ROWS):
+    """
+    min_rows 이상인 DataFrame, 또는 그런 DataFrame을 값으로 가진 dict(예: FootballAPI 결과)의
+    DataFrame을 ArrowFrame으로 바꿉니다.
+    """
+    if pa is None:
+        return value
+    try:
+        if _is_large_frame(value, min_rows):
+            return ArrowFrame(frame_to_arrow(value))
+        if isinstance(value, dict) and any(_is_large_frame(v, min_rows) for v in value.values()):
+            return {k: ArrowFrame(frame_to_arrow(v)) if _is_large_frame(v, min_rows) else v for k, v in value.items()}
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        # Arrow로 표현할 수 없는 열(혼합 object 등)은 기존처럼 pickle
+        logger.warning(f"Arrow 직렬화 실패, pickle로 저장: {str(e)}")
+    return value
+
+
+def decode_tabular(value):
+    """encode_tabular의 역변환"""
+    if isinstance(value, ArrowFrame):
+        return arrow_to_frame(value.payload)
+    if isinstance(value, dict) and any(isinstance(v, ArrowFrame) for v in value.values()):
+        return {k: arrow_to_frame(v.payload) if isinstance(v, ArrowFrame) else v for k, v in value.items()}
+    return value
+
@@ -4,26 +4,33 @@ import random
 import re
 import logging
 from datetime import datetime
+from utils.singleflight import cached_call
 
 logger = logging.getLogger(__name__)
 
 class CultureEventAPI:
-    def __init__(self, api_key, cache_handler, cache_ttl=3600):
+    def __init__(self, api_key, cache_handler, cache_ttl=3600, xml_cache_ttl=1800):
         self.api_key = api_key
         self.cache = cache_handler
         self.cache_ttl = cache_ttl
+        self.xml_cache_ttl = xml_cache_ttl
         self.base_url = "http://openapi.seoul.go.kr:8088"
     
     def fetch_xml(self):
         """API 키를 사용하여 XML 데이터를 가져옵니다."""
         cache_key = f"culture_xml:{self.api_key}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            try:
-                return ET.fromstring(cached)
-            except ET.ParseError:
-                pass
+        xml_content = cached_call(self.cache, cache_key, lambda: self._fetch_xml_content(cache_key))
+        if xml_content is None:
+            return None
         
+        try:
+            return ET.fromstring(xml_content)
+        except ET.ParseError as e:
+            logger.error(f"XML 파싱 실패: {e}")
+            return None
+    
+    def _fetch_xml_content(self, cache_key):
+        """문화행사 XML 원문을 가져와 캐시에 저장합니다."""
         url = f"{self.base_url}/{self.api_key}/xml/culturalEventInfo/1/100/"
         try:
             response = requests.get(url, timeout=5)
@@ -31,16 +38,11 @@ class CultureEventAPI:
             xml_content = response.content.decode('utf-8')
             
             # XML 캐싱 (30분)
-            self.cache.setex(cache_key, 1800, xml_content)
-            
-            root = ET.fromstring(xml_content)
-            return root
+            self.cache.setex(cache_key, self.xml_cache_ttl, xml_content)
+            return xml_content
         except requests.exceptions.RequestException as e:
             logger.error(f"문화행사 API 호출 실패: {e}")
             return None
-        except ET.ParseError as e:
-            logger.error(f"XML 파싱 실패: {e}")
-            return None
     
     def select_target_district(self, root, target_district=""):
         """
@@ -79,10 +81,11 @@ class CultureEventAPI:
     def get_future_events(self, target_district="", max_events=10):
         """API 키와 target_district(빈 문자열이면 랜덤 선택)를 받아 미래 행사를 반환합니다."""
         cache_key = f"culture_events:{target_district}:{max_events}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key,
+                           lambda: self._build_future_events(target_district, max_events, cache_key))
+
+    def _build_future_events(self, target_district, max_events, cache_key):
+        """XML에서 미래 행사를 추려 캐시에 저장합니다."""
         root = self.fetch_xml()
         if not root:
             return "문화행사 정보를 가져올 수 없습니다. 😓"
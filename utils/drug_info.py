@@ -1,24 +1,27 @@
 import requests
 import urllib.parse
 import logging
+from utils.cache import NegativeResult
+from utils.singleflight import cached_call
 
 logger = logging.getLogger(__name__)
 
 class DrugAPI:
-    def __init__(self, api_key, cache_handler, cache_ttl=86400):
+    def __init__(self, api_key, cache_handler, cache_ttl=86400, negative_ttl=600):
         self.api_key = api_key
         self.cache = cache_handler
         self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
         self.base_url = 'http://apis.data.go.kr/1471000/DrbEasyDrugInfoService/getDrbEasyDrugList'
     
-    def get_drug_info(self, drug_query):
-        """의약품 정보를 검색하고 반환합니다."""
-        drug_name = drug_query.replace("약품검색", "").strip()
+    def get_drug_info(self, drug_query, plan=None):
+        """의약품 정보를 검색하고 반환합니다. (plan: query_analyzer.QueryPlan, 있으면 약품명을 다시 추출하지 않음)"""
+        drug_name = plan.drug_name if plan is not None else drug_query.replace("약품검색", "").strip()
         cache_key = f"drug:{drug_name}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_drug_info(drug_name, cache_key))
+    
+    def _fetch_drug_info(self, drug_name, cache_key):
+        """공공 API에서 의약품 정보를 조회합니다."""
         params = {
             'serviceKey': self.api_key,
             'pageNo': '1',
@@ -38,7 +41,10 @@ class DrugAPI:
                 self.cache.setex(cache_key, self.cache_ttl, result)
                 return result
             
-            return f"'{drug_name}'의 공식 정보를 찾을 수 없습니다."
+            # 정상 응답의 '결과 없음'만 짧게 캐싱 (타임아웃/5xx는 아래 except에서 캐싱 없이 반환)
+            message = f"'{drug_name}'의 공식 정보를 찾을 수 없습니다."
+            self.cache.setex(cache_key, self.negative_ttl, NegativeResult(message))
+            return message
             
         except Exception as e:
             logger.error(f"약품 API 오류: {str(e)}")
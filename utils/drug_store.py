@@ -3,42 +3,54 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 import logging
 import pytz
-import re
+from utils.query_analyzer import analyze_query, build_query_plan
+from utils.singleflight import cached_call, single_flight
 
 logger = logging.getLogger(__name__)
 
 class DrugStoreAPI:
-    def __init__(self, api_key, cache_handler=None):
+    def __init__(self, api_key, cache_handler=None, cache_ttl=1800):
         self.api_key = api_key
         self.cache_handler = cache_handler
+        self.cache_ttl = cache_ttl
         self.base_url = "http://openapi.seoul.go.kr:8088"
     
-    def search_pharmacies(self, query, limit=10):
-        """약국 검색 및 정보 조회 (페이지네이션)"""
+    def search_pharmacies(self, query, limit=10, plan=None):
+        """
+        약국 검색 및 정보 조회 (페이지네이션)
+        - plan: query_analyzer.QueryPlan (없으면 여기서 분석, 지역구/약국명/페이지를 다시 파싱하지 않음)
+        """
         try:
             logger.info(f"약국 검색 요청: '{query}'")
-            
-            # 🔴 페이지 번호 추출
-            page = self._extract_page_number(query)
+            if plan is None:
+                plan = analyze_query(query)
+            if plan.intent != "pharmacy_search":
+                plan = build_query_plan(query, "pharmacy_search")
+            page = plan.page
             
             # 캐시 확인 (페이지 포함)
             cache_key = f"pharmacy:{query}:{limit}:{page}"
-            if self.cache_handler:
-                cached = self.cache_handler.get(cache_key)
-                if cached:
-                    logger.info("캐시에서 약국 정보 반환")
-                    return cached
+            return cached_call(self.cache_handler, cache_key, lambda: self._search_pharmacies(plan, limit, page, cache_key))
             
-            # 지역구 추출
-            district = self._extract_district(query)
-            pharmacy_name = self._extract_pharmacy_name(query)
+        except Exception as e:
+            logger.error(f"약국 검색 중 오류: {str(e)}")
+            return f"약국 정보를 가져오는 중 오류가 발생했습니다: {str(e)} 😓"
+    
+    def _search_pharmacies(self, plan, limit, page, cache_key):
+        """약국 데이터를 조회/필터링/포맷팅하고 캐시에 저장합니다."""
+        try:
+            district = plan.district
+            pharmacy_name = plan.place_name
             
             logger.info(f"추출된 지역구: {district}")
             logger.info(f"추출된 약국명: {pharmacy_name}")
             logger.info(f"추출된 페이지: {page}")
             
-            # 🔴 전체 데이터 가져오기 (지역구 검색 시 500개)
-            result = self._fetch_pharmacy_data(district, pharmacy_name, limit)
+            # 🔴 전체 데이터 가져오기 (지역구 검색 시 500개, 동시 요청은 하나로 합침)
+            result = single_flight.do(
+                f"pharmacy_data:{district}:{pharmacy_name}:{limit}",
+                lambda: self._fetch_pharmacy_data(district, pharmacy_name, limit)
+            )
             
             if result["status"] == "error":
                 return result["message"]
@@ -84,7 +96,7 @@ class DrugStoreAPI:
             
             # 캐시 저장 (30분)
             if self.cache_handler:
-                self.cache_handler.setex(cache_key, 1800, formatted_result)
+                self.cache_handler.setex(cache_key, self.cache_ttl, formatted_result)
             
             return formatted_result
             
@@ -92,61 +104,6 @@ class DrugStoreAPI:
             logger.error(f"약국 검색 중 오류: {str(e)}")
             return f"약국 정보를 가져오는 중 오류가 발생했습니다: {str(e)} 😓"
     
-    def _extract_page_number(self, query):
-        """쿼리에서 페이지 번호 추출"""
-        # "광진구 약국 2페이지", "광진구 약국 3", "광진구 약국 더보기" 등
-        page_patterns = [
-            r'(\d+)페이지',
-            r'(\d+)번째',
-            r'페이지\s*(\d+)',
-            r'(\d+)p',
-            r'(\d+)$'  # 마지막에 숫자만 있는 경우
-        ]
-        
-        for pattern in page_patterns:
-            match = re.search(pattern, query)
-            if match:
-                page_num = int(match.group(1))
-                return max(1, page_num)  # 최소 1페이지
-        
-        return 1  # 기본 1페이지
-    
-    def _extract_district(self, query):
-        """쿼리에서 지역구 추출"""
-        districts = [
-            "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
-            "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
-            "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
-        ]
-        
-        for district in districts:
-            if district in query:
-                return district
-        return None
-    
-    def _extract_pharmacy_name(self, query):
-        """쿼리에서 약국명 추출"""
-        keywords_to_remove = ["약국", "약국명", "약국검색", "약국정보", "서울시", "검색"]
-        
-        cleaned_query = query
-        for keyword in keywords_to_remove:
-            cleaned_query = cleaned_query.replace(keyword, "")
-        
-        cleaned_query = cleaned_query.strip()
-        
-        # 지역구 제거
-        district = self._extract_district(query)
-        if district:
-            cleaned_query = cleaned_query.replace(district, "")
-        
-        cleaned_query = cleaned_query.strip()
-        
-        # 너무 짧거나 의미없는 경우 None 반환
-        if len(cleaned_query) < 2:
-            return None
-        
-        return cleaned_query
-    
     def _fetch_pharmacy_data(self, district=None, name=None, limit=10):
         """서울시 약국 API 호출"""
         try:
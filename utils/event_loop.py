@@ -0,0 +1,100 @@
+# utils/event_loop.py
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """
+    프로세스 전체에서 공유하는 asyncio 이벤트 루프 (전용 데몬 스레드에서 run_forever)
+    - 턴마다 asyncio.run으로 루프/기본 executor를 만들고 닫지 않음
+    - 어떤 스레드에서든 submit()/run()/iterate()로 코루틴과 async generator 실행
+    - run_in_executor(None, ...)는 하나의 공유 executor 사용
+    주의: 루프 스레드에는 Streamlit 스크립트 컨텍스트가 없으므로 st.session_state는 호출하는 쪽에서 미리 읽어 전달합니다.
+    """
+
+    def __init__(self, max_workers=16, name="async-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-executor"))
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._ready.set)
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        """코루틴을 루프에 예약하고 concurrent.futures.Future를 반환합니다."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("루프 스레드 안에서는 submit 대신 await를 사용하세요.")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout=None):
+        """코루틴을 루프에서 실행하고 결과를 기다립니다 (asyncio.run 대체)."""
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen):
+        """async generator를 루프에서 실행하며 값을 차례로 돌려주는 동기 generator (st.write_stream용)"""
+        items = queue.Queue()
+
+        async def pump():
+            # 조각마다 Future를 만들지 않고 한 task가 끝까지 돌며 큐로 전달
+            try:
+                async for item in agen:
+                    items.put((True, item))
+            except Exception as e:
+                items.put((False, e))
+                return
+            items.put((False, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                ok, item = items.get()
+                if not ok:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            # 소비자가 중간에 멈추면 task를 취소해 generator 정리 코드가 루프에서 실행되게 함
+            if not future.done():
+                future.cancel()
+
+    def stop(self):
+        """executor를 닫고 루프를 멈춥니다."""
+        async def shutdown():
+            await self._loop.shutdown_default_executor()
+
+        if self._loop.is_running():
+            try:
+                self.run(shutdown(), timeout=10)
+            except Exception as e:
+                logger.warning(f"이벤트 루프 종료 중 오류: {str(e)}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """프로세스 공유 BackgroundEventLoop (처음 호출할 때 시작)"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundEventLoop()
+            logger.info("백그라운드 이벤트 루프 시작")
+        return _background_loop
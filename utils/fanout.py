@@ -0,0 +1,68 @@
+# utils/fanout.py
+import asyncio
+import logging
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PART_SEPARATOR = "\n\n---\n\n"
+
+
+def table_to_markdown(table):
+    """표 응답(레코드 list 또는 DataFrame)을 마크다운 표로 변환합니다."""
+    rows = table.to_dict(orient="records") if isinstance(table, pd.DataFrame) else list(table)
+    if not rows:
+        return ""
+    if not isinstance(rows[0], dict):
+        return "\n".join(f"- {row}" for row in rows)
+    columns = list(rows[0].keys())
+    lines = ["| " + " | ".join(str(c) for c in columns) + " |", "|" + "---|" * len(columns)]
+    for row in rows:
+        lines.append("| " + " | ".join(str(row.get(c, "")).replace("|", "\\|") for c in columns) + " |")
+    return "\n".join(lines)
+
+
+def response_to_markdown(response):
+    """API 응답 하나를 마크다운 문자열로 (표 응답의 footer는 합칠 때 중복되므로 제외)"""
+    if isinstance(response, dict) and "table" in response:
+        return f"{response['header']}\n\n{table_to_markdown(response['table'])}"
+    return str(response)
+
+
+async def fan_out(plans, handler, budget):
+    """
+    plans의 각 QueryPlan에 대해 handler(plan)(블로킹 API 호출)를 루프의 공유 executor에서 동시에 실행합니다.
+    - 전체 대기 시간은 budget초로 제한 (총 시간 ≈ 가장 느린 요청, 합이 아님)
+    - 예산 안에 끝나지 않은 요청은 안내 문구로 대신하고, 실행은 계속되어 래퍼 캐시에 결과가 남음
+    반환: (합친 마크다운 응답, 모든 요청이 예산 안에 끝났는지)
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    elapsed = {}
+
+    def timed(plan):
+        try:
+            return handler(plan)
+        finally:
+            elapsed[plan.intent] = time.perf_counter() - started
+
+    tasks = [loop.run_in_executor(None, timed, plan) for plan in plans]
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+
+    parts = []
+    for plan, task in zip(plans, tasks):
+        if task not in done:
+            parts.append(f"⏱️ '{plan.query}' 응답이 {budget:g}초 안에 오지 않아 생략했어요. 잠시 후 다시 물어보시면 바로 보여드릴게요.")
+            continue
+        try:
+            parts.append(response_to_markdown(task.result()))
+        except Exception as e:
+            logger.error(f"복합 질문 처리 중 오류 ({plan.intent}): {str(e)}")
+            parts.append(f"'{plan.query}' 정보를 가져오는 중 오류가 발생했습니다: {str(e)} 😓")
+
+    total = time.perf_counter() - started
+    timings = ", ".join(f"{intent} {seconds:.2f}초" for intent, seconds in elapsed.items())
+    logger.info(f"🔀 복합 질문 {len(plans)}개 동시 처리: 전체 {total:.2f}초 ({timings}), 시간 초과 {len(pending)}개")
+    return PART_SEPARATOR.join(parts), not pending
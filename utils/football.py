@@ -1,6 +1,7 @@
 import requests
 import time
 import pandas as pd
+from utils.singleflight import cached_call, single_flight
 
 class FootballAPI:
     def __init__(self, api_key, cache_handler, cache_ttl=600):
@@ -11,10 +12,9 @@ class FootballAPI:
 
     def fetch_league_standings(self, league_code, league_name):
         cache_key = f"league_standings:{league_code}"
-        cached_data = self.cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        return cached_call(self.cache, cache_key, lambda: self._fetch_league_standings(league_code, league_name, cache_key))
 
+    def _fetch_league_standings(self, league_code, league_name, cache_key):
         url = f"{self.base_url}/{league_code}/standings"
         headers = {'X-Auth-Token': self.api_key}
         
@@ -68,10 +68,9 @@ class FootballAPI:
 
     def fetch_league_scorers(self, league_code, league_name):
         cache_key = f"league_scorers:{league_code}"
-        cached_data = self.cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        return cached_call(self.cache, cache_key, lambda: self._fetch_league_scorers(league_code, league_name, cache_key))
 
+    def _fetch_league_scorers(self, league_code, league_name, cache_key):
         url = f"{self.base_url}/{league_code}/scorers"
         headers = {'X-Auth-Token': self.api_key}
         
@@ -92,6 +91,9 @@ class FootballAPI:
             return {"league_name": league_name, "error": f"{league_name} 리그 득점순위 정보를 가져오는 중 문제가 발생했습니다: {str(e)} 😓"}
 
     def fetch_championsleague_knockout_matches(self):
+        return single_flight.do("cl_knockout", self._fetch_championsleague_knockout_matches)
+
+    def _fetch_championsleague_knockout_matches(self):
         url = f"{self.base_url}/CL/matches"
         headers = {'X-Auth-Token': self.api_key}
         KNOCKOUT_STAGES = {
@@ -432,9 +432,9 @@ import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import logging
-import re
 import pytz
-from .query_analyzer import needs_search  # Import needs_search for query type checking
+from .query_analyzer import analyze_query
+from .singleflight import cached_call, single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -447,35 +447,39 @@ class SeoulHospitalAPI:
 
     BASE_URL = "http://openapi.seoul.go.kr:8088"
 
-    def __init__(self, api_key, cache_handler=None):
+    def __init__(self, api_key, cache_handler=None, cache_ttl=1800):
         self.api_key = api_key
         self.cache_handler = cache_handler
+        self.cache_ttl = cache_ttl
 
-    def search_hospitals(self, query, limit=10):
+    def search_hospitals(self, query, limit=10, plan=None):
         """
         병의원 검색 및 정보 조회 (개선버전)
         - 전체 데이터: 최대 1000개 수집하여 완전한 검색 보장
         - 페이지당 표시: limit개 (기본 10개)로 사용자 친화적 표시
+        - plan: query_analyzer.QueryPlan (없으면 여기서 분석, 지역구/병원명/종류/페이지를 다시 파싱하지 않음)
         """
-        # Check the query type using needs_search
-        query_type = needs_search(query)
-        if query_type != "hospital_search":
+        if plan is None:
+            plan = analyze_query(query)
+        if plan.intent != "hospital_search":
             return "이 쿼리는 병원 API 검색으로 처리될 수 없습니다. '검색해줘'가 포함된 경우 네이버 검색을 사용하세요."
 
         try:
             logger.info(f"병원 검색 요청: '{query}'")
-            page = self._extract_page_number(query)
+            page = plan.page
             cache_key = f"hospital:{query}:{limit}:{page}"
-            
-            if self.cache_handler:
-                cached = self.cache_handler.get(cache_key)
-                if cached:
-                    logger.info("캐시에서 병원 정보 반환")
-                    return cached
+            return cached_call(self.cache_handler, cache_key, lambda: self._search_hospitals(plan, limit, page, cache_key))
 
-            district = self._extract_district(query)
-            hospital_name = self._extract_hospital_name(query)
-            hospital_type = self._extract_hospital_type(query)
+        except Exception as e:
+            logger.error(f"병원 검색 중 오류: {str(e)}")
+            return f"병원 정보를 가져오는 중 오류가 발생했습니다: {str(e)} 😓"
+
+    def _search_hospitals(self, plan, limit, page, cache_key):
+        """병원 데이터를 조회/필터링/포맷팅하고 캐시에 저장합니다."""
+        try:
+            district = plan.district
+            hospital_name = plan.place_name
+            hospital_type = plan.hospital_type
 
             logger.info(f"추출된 지역구: {district}")
             logger.info(f"추출된 병원명: {hospital_name}")
@@ -484,7 +488,10 @@ class SeoulHospitalAPI:
 
             # 항상 최대 1000개 데이터 수집 (필터링의 정확성을 위해)
             MAX_FETCH_SIZE = 1000
-            result = self._fetch_hospital_data(MAX_FETCH_SIZE)
+            result = single_flight.do(
+                f"hospital_data:{MAX_FETCH_SIZE}",
+                lambda: self._fetch_hospital_data(MAX_FETCH_SIZE)
+            )
             if result["status"] == "error":
                 return result["message"]
 
@@ -494,7 +501,7 @@ class SeoulHospitalAPI:
                 district, 
                 hospital_name, 
                 hospital_type,
-                query  # 원본 쿼리도 전달
+                plan  # 원본 쿼리 분석 결과도 전달
             )
 
             total_filtered = len(filtered_hospitals)
@@ -522,14 +529,14 @@ class SeoulHospitalAPI:
 
             formatted_result = self._format_hospital_results(paginated_result, district, hospital_type)
             if self.cache_handler:
-                self.cache_handler.setex(cache_key, 1800, formatted_result)
+                self.cache_handler.setex(cache_key, self.cache_ttl, formatted_result)
             return formatted_result
 
         except Exception as e:
             logger.error(f"병원 검색 중 오류: {str(e)}")
             return f"병원 정보를 가져오는 중 오류가 발생했습니다: {str(e)} 😓"
 
-    def _apply_filters(self, hospitals, district, hospital_name, hospital_type, original_query):
+    def _apply_filters(self, hospitals, district, hospital_name, hospital_type, plan):
         """
         클라이언트 측에서 필터링 적용 (수정버전)
         """
@@ -550,8 +557,8 @@ class SeoulHospitalAPI:
             original_count = len(filtered)
             
             # "지역구 병원" 형태의 쿼리는 모든 의료기관 포함
-            if self._is_general_hospital_query(original_query):
-                logger.info(f"일반 병원 검색으로 판단: '{original_query}' - 모든 의료기관 포함")
+            if self._is_general_hospital_query(plan):
+                logger.info(f"일반 병원 검색으로 판단: '{plan.query}' - 모든 의료기관 포함")
                 # 병원 종류 필터링 건너뛰기
                 pass
             else:
@@ -576,83 +583,18 @@ class SeoulHospitalAPI:
 
         return filtered
 
-    def _is_general_hospital_query(self, query):
+    def _is_general_hospital_query(self, plan):
         """
         일반적인 병원 검색 쿼리인지 판단 (모든 의료기관 포함해야 하는지)
         """
         # 지역구 + "병원" 형태의 일반 검색
-        district = self._extract_district(query)
-        if district and "병원" in query:
+        if plan.district and "병원" in plan.query:
             # 구체적인 병원 종류가 없는 경우 (종합병원, 치과병원, 한방병원 등)
             specific_types = ["종합병원", "치과병원", "한방병원", "한의원"]
-            if not any(t in query for t in specific_types):
+            if plan.hospital_type not in specific_types:
                 return True
         return False
 
-    def _extract_page_number(self, query):
-        page_patterns = [
-            r'(\d+)페이지',
-            r'(\d+)번째',
-            r'페이지\s*(\d+)',
-            r'(\d+)p',
-            r'(\d+)$'
-        ]
-        for pattern in page_patterns:
-            match = re.search(pattern, query)
-            if match:
-                page_num = int(match.group(1))
-                return max(1, page_num)
-        return 1
-
-    def _extract_district(self, query):
-        districts = [
-            "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
-            "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
-            "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
-        ]
-        for district in districts:
-            if district in query:
-                return district
-        return None
-
-    def _extract_hospital_type(self, query):
-        """
-        병원 종류 추출 (개선된 로직)
-        """
-        # 더 구체적인 타입을 우선 검색
-        specific_types = ["종합병원", "치과병원", "한방병원", "한의원"]
-        for t in specific_types:
-            if t in query:
-                return t
-        
-        # 일반적인 타입 검색
-        general_types = ["병원", "의원"]
-        for t in general_types:
-            if t in query:
-                return t
-        
-        return None
-
-    def _extract_hospital_name(self, query):
-        keywords_to_remove = ["병원", "의원", "치과", "한방", "한의원", "종합병원", "병원명", "병원검색", "병원정보", "서울시", "검색"]
-        cleaned_query = query
-        for keyword in keywords_to_remove:
-            cleaned_query = cleaned_query.replace(keyword, "")
-        cleaned_query = cleaned_query.strip()
-        
-        district = self._extract_district(query)
-        if district:
-            cleaned_query = cleaned_query.replace(district, "")
-        
-        hospital_type = self._extract_hospital_type(query)
-        if hospital_type:
-            cleaned_query = cleaned_query.replace(hospital_type, "")
-        
-        cleaned_query = cleaned_query.strip()
-        if len(cleaned_query) < 2:
-            return None
-        return cleaned_query
-
     def _fetch_hospital_data(self, limit=1000):
         """
         서울시 병원 데이터 조회 (개선버전)
@@ -0,0 +1,82 @@
+# utils/keyword_matcher.py
+import re
+
+try:
+    import ahocorasick  # pyahocorasick (C 구현 Aho-Corasick, requirements.txt)
+except ImportError:
+    ahocorasick = None
+
+
+def _trie_pattern(keywords):
+    """키워드 목록 -> 트라이 모양 정규식 (같은 위치에서는 가장 긴 키워드가 잡히도록 greedy)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    여러 키워드를 문자열 한 번 훑기로 모두 찾는 매처
+    - pyahocorasick Aho-Corasick 오토마톤 사용
+    - 설치되지 않은 환경에서만 긴 키워드 우선 lookahead 결합 정규식 1개로 대체
+      (키워드가 빽빽한 쿼리에서는 기존 키워드별 검색보다 느림, benchmarks/query_classifier_throughput.py)
+    - 겹치거나 포함 관계인 키워드도 모두 보고 ("다중지능유형" 안의 "다중지능" 등)
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(k for k in keywords if k))
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            return
+        self._automaton = None
+        # 키워드 트라이를 정규식으로 펼쳐 위치마다 가장 긴 키워드 하나를 잡고 (첫 글자 문자 집합으로 빠르게 건너뜀),
+        # 같은 위치에서 시작하는 더 짧은 키워드(접두사)는 표로 보충
+        first_chars = "".join(sorted({re.escape(k[0]) for k in self.keywords}))
+        self._pattern = re.compile(f"(?=[{first_chars}])(?=({_trie_pattern(self.keywords)}))") if self.keywords else None
+        self._prefixes = {k: [p for p in self.keywords if k.startswith(p)] for k in self.keywords}
+
+    def iter(self, text):
+        """(키워드, 시작, 끝) 을 찾은 순서대로 yield 합니다."""
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                yield keyword, end + 1 - len(keyword), end + 1
+            return
+        if self._pattern is None:
+            return
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword in prefixes[match.group(1)]:
+                yield keyword, start, start + len(keyword)
+
+    def find_all(self, text):
+        """등장한 키워드 -> 첫 번째 (시작, 끝) span"""
+        found = {}
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                found.setdefault(keyword, (end + 1 - len(keyword), end + 1))
+            return found
+        if self._pattern is None:
+            return found
+        # iter()와 같은 순회를 generator 없이 (쿼리마다 호출되는 경로)
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword in prefixes[match.group(1)]:
+                if keyword not in found:
+                    found[keyword] = (start, start + len(keyword))
+        return found
@@ -0,0 +1,166 @@
+# utils/llm_executor.py
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from utils.cache_stats import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# 대기 시간 히스토그램 구간 경계 (ms)
+QUEUE_WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 30000)
+
+
+class LLMBusyError(RuntimeError):
+    """대기열이 가득 차서 LLM 요청을 받을 수 없을 때 발생합니다."""
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future", "enqueued_at")
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class LLMExecutor:
+    """
+    LLM 프로바이더 호출 전용 executor (app.py에서 st.cache_resource로 한 번 생성)
+    - 동시에 실행되는 호출은 max_concurrency개로 제한 (프로바이더 쓰로틀링 방지)
+    - 사용자별 대기열을 라운드 로빈으로 꺼내서 한 사용자가 몰아서 보낸 요청이 다른 사용자를 밀어내지 않음
+    - 전체 대기가 max_queue_depth, 사용자별 대기가 max_queued_per_user를 넘으면 LLMBusyError로 즉시 실패
+    - 대기 시간(큐에 들어간 뒤 실행 시작까지)은 히스토그램으로 집계 (snapshot())
+    """
+
+    def __init__(self, max_concurrency=8, max_queue_depth=32, max_queued_per_user=4):
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.max_queued_per_user = max_queued_per_user
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # user -> deque[_Job], 순서가 라운드 로빈 차례
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait = LatencyHistogram(QUEUE_WAIT_BUCKETS_MS)
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"llm-worker-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, user, fn, *args):
+        """fn(*args)를 user의 대기열에 넣고 concurrent.futures.Future를 반환합니다."""
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("LLMExecutor가 종료되었습니다.")
+            user_queue = self._queues.get(user)
+            if self._queued >= self.max_queue_depth or (
+                    user_queue is not None and len(user_queue) >= self.max_queued_per_user):
+                self._rejected += 1
+                logger.warning(f"⛔ LLM 대기열 초과로 요청 거절 (user={user}, 대기 {self._queued}, 실행 {self._active})")
+                raise LLMBusyError("LLM 요청이 많아 잠시 후 다시 시도해 주세요.")
+            if user_queue is None:
+                user_queue = self._queues[user] = deque()
+            job = _Job(fn, args)
+            user_queue.append(job)
+            self._queued += 1
+            self._cond.notify()
+            return job.future
+
+    async def stream(self, user, chunks):
+        """
+        동기 generator(chunks, 예: ProviderPool.stream_completion)를 슬롯 하나에서 끝까지 소비하며
+        조각을 async generator로 전달합니다 (스트림이 끝날 때까지 동시 실행 슬롯을 점유).
+        소비 쪽이 중간에 멈추면(Streamlit rerun, 사용자 중단) 다음 조각에서 멈추고 chunks.close()로
+        프로바이더 스트림 정리(finally)를 바로 실행해 슬롯을 돌려줍니다.
+        """
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue()
+        stop = threading.Event()
+
+        def drain():
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(pending.put_nowait, chunk)
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+                loop.call_soon_threadsafe(pending.put_nowait, None)
+
+        job = self.submit(user, drain)
+        try:
+            while (chunk := await pending.get()) is not None:
+                yield chunk
+            await asyncio.wrap_future(job)  # drain에서 발생한 예외 전달
+        finally:
+            stop.set()
+            # 아직 대기열에 있으면 실행하지 않음 (실행 중이면 drain이 다음 조각에서 멈춤)
+            if job.cancel():
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+
+    def _next_job(self):
+        """라운드 로빈 차례인 사용자의 가장 오래된 요청 (호출자가 _cond 보유)"""
+        user, user_queue = next(iter(self._queues.items()))
+        job = user_queue.popleft()
+        del self._queues[user]
+        if user_queue:
+            # 남은 요청이 있으면 다음 차례를 다른 사용자에게 넘기고 맨 뒤로
+            self._queues[user] = user_queue
+        self._queued -= 1
+        self._active += 1
+        self._wait.record((time.perf_counter() - job.enqueued_at) * 1000)
+        return job
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queues and not self._shutdown:
+                    self._cond.wait()
+                if not self._queues:
+                    return
+                job = self._next_job()
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn(*job.args))
+                except BaseException as e:
+                    job.future.set_exception(e)
+
+            with self._cond:
+                self._active -= 1
+                self._completed += 1
+
+    def shutdown(self):
+        """새 요청을 받지 않고, 대기 중인 요청까지 처리한 뒤 worker를 종료합니다."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            wait = self._wait.snapshot()
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queued": self._queued,
+                "queued_users": len(self._queues),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_p50_ms": wait["p50_ms"],
+                "wait_p95_ms": wait["p95_ms"],
+                "wait_p99_ms": wait["p99_ms"],
+                "wait_max_ms": wait["max_ms"]
+            }
@@ -0,0 +1,310 @@
+# utils/morph_analyzer.py
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+try:
+    from konlpy import tag as konlpy_tag  # 선택 의존성: konlpy (JVM 필요)
+except ImportError:
+    konlpy_tag = None
+
+try:
+    from soynlp.tokenizer import LTokenizer  # 선택 의존성: soynlp (순수 파이썬, konlpy를 못 쓸 때 사전 기반 분석)
+except ImportError:
+    LTokenizer = None
+
+logger = logging.getLogger(__name__)
+
+
+class MorphAnalyzerBusy(RuntimeError):
+    """모든 워커가 분석 중이라 새 요청을 받지 않을 때 (대기열에 쌓지 않고 바로 기존 매칭 사용)"""
+
+
+Morpheme = namedtuple("Morpheme", ["surface", "tag"])
+
+# 백엔드별 품사를 라우팅/엔티티 추출에 필요한 만큼만 묶은 태그
+NOUN, JOSA, PREDICATE, SYMBOL = "N", "J", "P", "S"
+
+_KONLPY_TAGGERS = {"okt": "Okt", "komoran": "Komoran", "mecab": "Mecab"}
+_OKT_TAGS = {
+    "Noun": NOUN, "Alpha": NOUN, "Number": NOUN, "Foreign": NOUN,
+    "Josa": JOSA, "Punctuation": SYMBOL,
+}
+
+# soynlp 사전 분석기용 조사 / 용언 어미 (긴 것 우선)
+JOSA_SUFFIXES = ("에서는", "에서", "으로", "에게", "까지", "부터", "이랑", "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "랑", "와", "과")
+PREDICATE_ENDINGS = ("주세요", "줄래", "줘", "해요", "해", "요", "야", "어", "니", "나", "까", "다", "지", "래")
+_PUNCTUATION = "?!.,~"
+
+# 사용자 명사 사전 (soynlp 분석기가 L/R 분리와 합성어 분리에 사용)
+_user_nouns = set()
+
+
+def register_nouns(nouns):
+    """도메인 명사(지역구, 시설 종류 등)를 사전에 추가합니다 (분석기 로딩 전에 호출)."""
+    _user_nouns.update(n for n in nouns if n)
+
+
+def _coarse_tag(tag):
+    """konlpy 품사 태그 -> N/J/P/S (Okt 태그 또는 세종 태그)"""
+    if tag in _OKT_TAGS:
+        return _OKT_TAGS[tag]
+    if tag[0] == "N" or tag in ("SL", "SN", "SH"):
+        return NOUN
+    if tag[0] == "J":
+        return JOSA
+    if tag[0] == "S":
+        return SYMBOL
+    return PREDICATE
+
+
+class _LexiconTagger:
+    """
+    soynlp LTokenizer + 사용자 명사 사전으로 어절을 (명사, 조사)로 나누는 간이 분석기
+    - JVM 없이 바로 로딩되고 상태를 바꾸지 않아 여러 스레드에서 공유
+    - 사전에 없는 어절은 조사를 떼고, 사전 명사로 끝나면 합성어로 분리 ("하나약국이" -> 하나/약국/이)
+    """
+
+    def __init__(self, nouns):
+        self._nouns = frozenset(nouns)
+        self._suffix_nouns = sorted(self._nouns, key=len, reverse=True)
+        self._tokenizer = LTokenizer(scores={noun: 1.0 for noun in self._nouns})
+
+    def _split_noun(self, stem):
+        for noun in self._suffix_nouns:
+            if len(stem) > len(noun) and stem.endswith(noun):
+                return [Morpheme(stem[:-len(noun)], NOUN), Morpheme(noun, NOUN)]
+        return [Morpheme(stem, NOUN)]
+
+    def _strip_josa(self, word):
+        for josa in JOSA_SUFFIXES:
+            if word.endswith(josa) and len(word) - len(josa) >= 2:
+                return word[:-len(josa)], josa
+        return word, ""
+
+    def pos(self, text):
+        morphemes = []
+        for word in text.split():
+            stripped = word.rstrip(_PUNCTUATION)
+            if stripped:
+                left, right = self._tokenizer.tokenize(stripped, flatten=False)[0]
+                if left in self._nouns:
+                    morphemes.append(Morpheme(left, NOUN))
+                    if right:
+                        rest, josa = self._strip_josa(right) if right not in self._nouns else (right, "")
+                        morphemes.append(Morpheme(rest, NOUN if rest in self._nouns else JOSA))
+                        if josa:
+                            morphemes.append(Morpheme(josa, JOSA))
+                else:
+                    stem, josa = self._strip_josa(stripped)
+                    if stem in self._nouns or any(stem.endswith(n) for n in self._nouns):
+                        morphemes.extend(self._split_noun(stem))
+                    elif stem.endswith(PREDICATE_ENDINGS):
+                        morphemes.append(Morpheme(stem, PREDICATE))
+                    else:
+                        morphemes.append(Morpheme(stem, NOUN))
+                    if josa:
+                        morphemes.append(Morpheme(josa, JOSA))
+            if len(stripped) < len(word):
+                morphemes.append(Morpheme(word[len(stripped):], SYMBOL))
+        return morphemes
+
+
+class MorphAnalyzer:
+    """
+    프로세스 공유 한국어 형태소 분석 서비스
+    - 처음 사용할 때 백그라운드 스레드에서 로딩 (konlpy 태거는 JVM 기동 때문에 수 초 걸림)
+    - 준비 전, 시간 초과, 오류일 때 tokenize()는 None -> 호출 쪽은 기존 키워드 매칭 사용
+    - konlpy 태거는 스레드 안전하지 않아 워커 스레드마다 하나씩 만들고 분석은 워커 풀에서 실행
+      (진행 중인 분석은 워커 수까지만, 모두 바쁘면 기다리지 않고 None -> 시간 초과된 작업이 대기열을 늘리지 않음)
+    - konlpy를 쓸 수 없으면(JVM 없음 등) soynlp 사전 분석기로 대체 (호출 스레드에서 바로 실행)
+    - 같은 문장의 분석 결과는 LRU로 메모이즈
+    """
+
+    def __init__(self, backend="okt", workers=2, timeout=0.05, cache_size=4096):
+        self._lock = threading.Lock()
+        self._state = "idle"  # idle -> loading -> ready | unavailable
+        self._pool = None
+        self._inflight = None
+        self._tagger = None
+        self._local = threading.local()
+        self._ready_callbacks = []
+        self.backend = None
+        self.configure(backend=backend, workers=workers, timeout=timeout, cache_size=cache_size)
+
+    def configure(self, backend=None, workers=None, timeout=None, cache_size=None):
+        """설정 변경 (로딩 시작 전에만 적용)"""
+        with self._lock:
+            if self._state != "idle":
+                logger.warning("형태소 분석기가 이미 시작되어 설정을 바꾸지 않습니다.")
+                return self
+            if backend is not None:
+                self.requested_backend = backend.lower()
+            if workers is not None:
+                self.workers = max(1, workers)
+            if timeout is not None:
+                self.timeout = timeout
+            if cache_size is not None:
+                self._tokenize_cached = lru_cache(maxsize=cache_size)(self._tokenize)
+        return self
+
+    @property
+    def ready(self):
+        return self._state == "ready"
+
+    def start(self):
+        """백그라운드 로딩 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._state != "idle":
+                return self
+            if self.requested_backend == "off":
+                self._state = "unavailable"
+                return self
+            self._state = "loading"
+        threading.Thread(target=self._load, name="morph-analyzer-loader", daemon=True).start()
+        return self
+
+    def add_ready_callback(self, callback):
+        """로딩이 끝나면 호출할 함수 등록 (이미 준비됐으면 바로 호출)"""
+        with self._lock:
+            if self._state != "ready":
+                self._ready_callbacks.append(callback)
+                return
+        callback()
+
+    def wait_ready(self, timeout=None):
+        """로딩이 끝날 때까지 대기 (벤치마크/워밍업용), 준비됐는지 반환"""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._state == "loading":
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        return self.ready
+
+    def _load(self):
+        started = time.perf_counter()
+        if self.requested_backend in _KONLPY_TAGGERS:
+            self._load_konlpy()
+        if self.backend is None and LTokenizer is not None:
+            self._tagger = _LexiconTagger(_user_nouns)
+            self.backend = "soynlp"
+
+        with self._lock:
+            self._state = "ready" if self.backend else "unavailable"
+            callbacks, self._ready_callbacks = self._ready_callbacks, []
+        if not self.ready:
+            logger.warning("⚠️ 사용할 수 있는 형태소 분석기가 없어 키워드 매칭만 사용합니다.")
+            return
+        logger.info(f"🧩 형태소 분석기 준비 완료: {self.backend} ({time.perf_counter() - started:.2f}초)")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"형태소 분석기 준비 콜백 오류: {str(e)}")
+
+    def _load_konlpy(self):
+        """워커 스레드마다 태거를 미리 만들어 둠 (첫 요청이 태거 생성을 기다리지 않도록)"""
+        if konlpy_tag is None:
+            logger.warning("konlpy가 설치되어 있지 않아 soynlp 사전 분석기를 사용합니다.")
+            return
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="morph-analyzer")
+        barrier = threading.Barrier(self.workers)
+
+        def warm_up():
+            self._worker_pos("형태소 분석기 워밍업")
+            # 모든 워커 스레드가 각자 하나씩 맡도록 대기
+            barrier.wait(timeout=60)
+
+        try:
+            for future in [pool.submit(warm_up) for _ in range(self.workers)]:
+                future.result()
+        except Exception as e:
+            logger.warning(f"⚠️ konlpy {self.requested_backend} 로딩 실패, soynlp 사전 분석기로 대체: {str(e)}")
+            barrier.abort()
+            pool.shutdown(wait=False)
+            return
+        # 시간 초과로 버린 작업도 끝날 때까지 슬롯을 잡고 있으므로 워커 수만큼만 동시에 제출
+        self._inflight = threading.BoundedSemaphore(self.workers)
+        self._pool = pool
+        self.backend = self.requested_backend
+
+    def _worker_pos(self, text):
+        tagger = getattr(self._local, "tagger", None)
+        if tagger is None:
+            tagger = self._local.tagger = getattr(konlpy_tag, _KONLPY_TAGGERS[self.requested_backend])()
+        return tagger.pos(text)
+
+    def _tokenize(self, text):
+        if self._pool is None:
+            return tuple(self._tagger.pos(text))
+        if not self._inflight.acquire(blocking=False):
+            raise MorphAnalyzerBusy()
+        try:
+            future = self._pool.submit(self._worker_pos, text)
+        except BaseException:
+            self._inflight.release()
+            raise
+        future.add_done_callback(lambda _: self._inflight.release())
+        tagged = future.result(self.timeout)
+        return tuple(Morpheme(surface, _coarse_tag(tag)) for surface, tag in tagged)
+
+    def tokenize(self, text):
+        """Morpheme(surface, tag) tuple, 사용할 수 없으면 None (준비 전이면 로딩 시작)"""
+        if self._state != "ready":
+            if self._state == "idle":
+                self.start()
+            if self._state == "loading":
+                self._count_transient()
+            return None
+        try:
+            return self._tokenize_cached(text)
+        except FutureTimeoutError:
+            logger.debug(f"형태소 분석 시간 초과 ({self.timeout}초): {text}")
+        except MorphAnalyzerBusy:
+            logger.debug(f"형태소 분석 워커가 모두 사용 중이라 키워드 매칭 사용: {text}")
+        except Exception as e:
+            logger.warning(f"형태소 분석 오류: {str(e)}")
+        self._count_transient()
+        return None
+
+    def _count_transient(self):
+        self._local.transient_misses = getattr(self._local, "transient_misses", 0) + 1
+
+    def transient_misses(self):
+        """
+        현재 스레드에서 일시적인 이유(로딩 중, 시간 초과, 워커 바쁨, 오류)로 None을 반환한 횟수
+        (호출 전후 값이 다르면 그 사이의 결과는 키워드 매칭으로 대체된 것이므로 캐시하지 않음)
+        """
+        return getattr(self._local, "transient_misses", 0)
+
+    def nouns(self, text):
+        """명사 목록, 사용할 수 없으면 None"""
+        morphemes = self.tokenize(text)
+        if morphemes is None:
+            return None
+        return [m.surface for m in morphemes if m.tag == NOUN]
+
+
+_morph_analyzer = None
+_morph_analyzer_lock = threading.Lock()
+
+
+def get_morph_analyzer():
+    """프로세스 공유 MorphAnalyzer (만들기만 하고 로딩은 처음 tokenize()/start() 할 때)"""
+    global _morph_analyzer
+    with _morph_analyzer_lock:
+        if _morph_analyzer is None:
+            _morph_analyzer = MorphAnalyzer()
+        return _morph_analyzer
+
+
+def set_morph_analyzer(analyzer):
+    """공유 MorphAnalyzer 교체 (벤치마크에서 분석기를 끄거나 빈 캐시로 다시 측정할 때)"""
+    global _morph_analyzer
+    with _morph_analyzer_lock:
+        _morph_analyzer = analyzer
+    return analyzer
@@ -0,0 +1,190 @@
+# utils/near_duplicate.py
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+try:
+    from soynlp.normalizer import repeat_normalize  # 선택 의존성: 반복 문자 정규화 (ㅋㅋㅋㅋ -> ㅋㅋ)
+except ImportError:
+    repeat_normalize = None
+
+from utils.morph_analyzer import get_morph_analyzer
+
+logger = logging.getLogger(__name__)
+
+# MinHash 서명 길이 = LSH 밴드 수 x 밴드당 행 수
+NUM_PERM = 64
+LSH_BANDS = 16
+# 명사 집합이 포함 관계일 때 이 Jaccard 유사도(문자 3-gram) 이상이면 같은 질문으로 봄
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+
+_NON_WORD = re.compile(r"[\s\W_]+")
+_REPEAT_FALLBACK = re.compile(r"(.)\1{2,}")
+# 값이 다르면 유사도와 관계없이 다른 질문 (링크 번호, URL 등)
+_ANCHOR = re.compile(r"https?://\S+|\d+|(?:첫|두|세|네|다섯|여섯|일곱|여덟|아홉|열)\s*번째")
+
+
+def normalize_query(query):
+    """소문자화, 반복 문자 정규화, 공백/문장부호 제거 ("요약해 줘!!" -> "요약해줘")"""
+    text = query.lower()
+    if repeat_normalize is not None:
+        text = repeat_normalize(text, num_repeats=2)
+    else:
+        text = _REPEAT_FALLBACK.sub(r"\1\1", text)
+    return _NON_WORD.sub("", text)
+
+
+def query_anchors(query):
+    """질문을 구분하는 값(숫자, 서수, URL) 목록"""
+    return tuple(re.sub(r"\s+", "", m) for m in _ANCHOR.findall(query.lower()))
+
+
+def query_nouns(query):
+    """형태소 분석기로 뽑은 명사 집합, 분석기를 쓸 수 없으면(준비 전, 시간 초과) None"""
+    nouns = get_morph_analyzer().nouns(query)
+    if nouns is None:
+        return None
+    return frozenset(normalize_query(noun) for noun in nouns) - {""}
+
+
+def shingles(normalized, size=SHINGLE_SIZE):
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash(shingle_set):
+    """shingle 집합의 MinHash 서명 (NUM_PERM개)"""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingle_set]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+class _IndexedQuery:
+    __slots__ = ("key", "scope", "shingles", "anchors", "nouns", "bands")
+
+    def __init__(self, key, scope, shingle_set, anchors, nouns, bands):
+        self.key = key
+        self.scope = scope
+        self.shingles = shingle_set
+        self.anchors = anchors
+        self.nouns = nouns
+        self.bands = bands
+
+
+class NearDuplicateCache:
+    """
+    띄어쓰기/어미/문장부호만 다른 질문에 같은 캐시 답변을 돌려주는 래퍼
+    - 값은 기존 캐시(MemoryCache)에 정확한 키로 저장하고, 이 클래스는 MinHash/LSH 색인만 보관
+    - 색인은 scope(질문 유형 + 검색 컨텍스트 id)별로 분리되어 다른 사용자의 검색 결과에 대한 답변과 섞이지 않음
+    - LSH 후보는 명사 집합 포함 관계, 구분 값(숫자, 서수, URL) 일치, 정확한 Jaccard 유사도로 다시 확인
+      ("파이썬 ..." / "자바 ..."처럼 글자는 거의 같아도 핵심 명사가 다르면 다른 질문)
+    - 형태소 분석기를 쓸 수 없으면 유사 질문 매칭은 건너뛰고 정확한 키만 사용
+    """
+
+    def __init__(self, cache, prefix="conv", threshold=DEFAULT_SIMILARITY_THRESHOLD, max_entries=50_000):
+        self.cache = cache
+        self.prefix = prefix
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._rows = NUM_PERM // LSH_BANDS
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> _IndexedQuery (오래된 순)
+        self._buckets = defaultdict(set)  # (scope, band 번호, band 값) -> key 집합
+        self.near_hits = 0
+
+    def make_key(self, query, scope):
+        return f"{self.prefix}:{':'.join(str(part) for part in scope)}:{query}"
+
+    def get(self, query, scope):
+        """정확한 키 -> 유사 질문 순으로 찾고, 없으면 None"""
+        key = self.make_key(query, scope)
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        normalized = normalize_query(query)
+        if not normalized:
+            return None
+        nouns = query_nouns(query)
+        if nouns is None:
+            return None
+        query_shingles = shingles(normalized)
+        anchors = query_anchors(query)
+        bands = self._bands(minhash(query_shingles))
+
+        with self._lock:
+            candidates = set()
+            for band in bands:
+                candidates |= self._buckets.get((scope, *band), set())
+            scored = []
+            for candidate in candidates:
+                entry = self._entries[candidate]
+                if entry.anchors != anchors or entry.nouns is None:
+                    continue
+                if not (nouns <= entry.nouns or entry.nouns <= nouns):
+                    continue
+                similarity = len(query_shingles & entry.shingles) / len(query_shingles | entry.shingles)
+                if similarity >= self.threshold:
+                    scored.append((similarity, candidate))
+
+        for similarity, candidate in sorted(scored, reverse=True):
+            value = self.cache.get(candidate)
+            if value is None:
+                # 캐시에서 만료/축출된 답변은 색인에서도 제거
+                self._unindex(candidate)
+                continue
+            with self._lock:
+                self.near_hits += 1
+            logger.info(f"🔁 유사 질문 캐시 적중 ({similarity:.2f}): '{query}' -> '{candidate}'")
+            return value
+        return None
+
+    def setex(self, query, scope, ttl, value):
+        key = self.make_key(query, scope)
+        self.cache.setex(key, ttl, value)
+        normalized = normalize_query(query)
+        if not normalized:
+            return
+        query_shingles = shingles(normalized)
+        entry = _IndexedQuery(key, scope, query_shingles, query_anchors(query), query_nouns(query),
+                              self._bands(minhash(query_shingles)))
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = entry
+            for band in entry.bands:
+                self._buckets[(scope, *band)].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove_locked(next(iter(self._entries)))
+
+    def _bands(self, signature):
+        return [(i, signature[i * self._rows:(i + 1) * self._rows]) for i in range(LSH_BANDS)]
+
+    def _unindex(self, key):
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in entry.bands:
+            bucket_key = (entry.scope, *band)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def get_stats(self):
+        with self._lock:
+            return {"indexed": len(self._entries), "buckets": len(self._buckets), "near_hits": self.near_hits}
@@ -4,6 +4,7 @@ import xml.etree.ElementTree as ET
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from utils.singleflight import cached_call
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +29,10 @@ class PaperSearchAPI:
     def get_arxiv_papers(self, query, max_results=3):
         """ArXiv에서 논문을 검색합니다."""
         cache_key = f"arxiv:{query}:{max_results}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_arxiv_papers(query, max_results, cache_key))
+    
+    def _fetch_arxiv_papers(self, query, max_results, cache_key):
+        """ArXiv 검색 결과를 포맷팅하고 캐시에 저장합니다."""
         try:
             search = arxiv.Search(
                 query=query, 
@@ -135,10 +136,10 @@ class PaperSearchAPI:
     def get_pubmed_papers(self, query, max_results=5):
         """PubMed에서 논문을 검색합니다."""
         cache_key = f"pubmed:{query}:{max_results}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_pubmed_papers(query, max_results, cache_key))
+    
+    def _fetch_pubmed_papers(self, query, max_results, cache_key):
+        """PubMed 검색 결과를 포맷팅하고 캐시에 저장합니다."""
         try:
             search_results = self.search_pubmed(query, max_results)
             pubmed_ids = search_results["esearchresult"]["idlist"]
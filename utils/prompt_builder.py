@@ -0,0 +1,166 @@
+# utils/prompt_builder.py
+import logging
+import math
+import re
+
+import pandas as pd
+
+try:
+    import tiktoken  # 선택 의존성: 있으면 정확한 토큰 수 사용
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# 메시지 하나당 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+TRUNCATION_MARK = " …(생략)"
+
+_encoding = tiktoken.get_encoding("o200k_base") if tiktoken is not None else None
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_ASCII = re.compile(r"[\x21-\x7e]")
+
+
+def estimate_tokens(text):
+    """
+    토큰 수 추정 (tiktoken이 없으면 보수적 근사)
+    - 한글 음절/자모 1개 = 1토큰, 그 밖의 비 ASCII 문자(이모지 등) 1개 = 1토큰
+    - ASCII 문자는 4개 = 1토큰, 공백은 무시
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    hangul = len(_HANGUL.findall(text))
+    ascii_chars = len(_ASCII.findall(text))
+    other = len(text) - hangul - ascii_chars - sum(1 for c in text if c.isspace())
+    return hangul + other + math.ceil(ascii_chars / 4)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """text를 max_tokens 이하로 앞부분만 남기고 자릅니다 (잘렸으면 생략 표시 추가)."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARK)
+    if budget <= 0:
+        return ""
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:budget]) + TRUNCATION_MARK
+    # 추정 토큰 수가 budget 이하인 가장 긴 앞부분 (이분 탐색)
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + TRUNCATION_MARK
+
+
+def message_text(content):
+    """채팅 기록의 content(문자열, 표 응답 dict, DataFrame)를 프롬프트용 문자열로 바꿉니다."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, pd.DataFrame):
+        return content.to_csv(index=False)
+    if isinstance(content, dict) and "table" in content:
+        table = content["table"]
+        table_text = table.to_csv(index=False) if isinstance(table, pd.DataFrame) else str(table)
+        return f"{content.get('header', '')}\n{table_text}\n{content.get('footer', '')}".strip()
+    return str(content)
+
+
+class PromptAssembler:
+    """
+    토큰 예산 안에서 LLM 메시지 목록을 조립합니다.
+    우선순위: 시스템 지시 + 현재 질문 > 검색 컨텍스트 > 최근 대화 (최신 턴부터)
+    - 컨텍스트는 항목(검색 결과 1건, 표 1행 등) 단위로 채우고, 넘치는 항목은 생략 개수만 남김
+    - 대화 턴은 최신순으로 넣고, 예산이 애매하게 남으면 그 턴은 앞부분만 잘라서 넣음
+    - 요청마다 구성별 토큰 수를 로그로 남김
+    """
+
+    def __init__(self, max_tokens=3000, max_turns=4, min_turn_tokens=32):
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.min_turn_tokens = min_turn_tokens
+
+    def assemble(self, system_template, query, context_sections=(), history=(), skip_history=None):
+        """
+        system_template의 "{context}" 자리에 예산 안의 컨텍스트 항목을 넣어 (messages, report)를 반환합니다.
+        skip_history(content) -> True인 기록 메시지는 제외합니다.
+        """
+        budget = self.max_tokens
+
+        # 1. 현재 질문 (질문 하나가 예산의 절반을 넘으면 자름)
+        query_text = truncate_to_tokens(query, budget // 2)
+        truncated = query_text != query
+        query_tokens = estimate_tokens(query_text) + MESSAGE_OVERHEAD_TOKENS
+        system_base = system_template.replace("{context}", "")
+        remaining = budget - query_tokens - estimate_tokens(system_base) - MESSAGE_OVERHEAD_TOKENS
+
+        # 2. 검색 컨텍스트 (항목 단위)
+        sections = [section for section in context_sections if section]
+        used_sections = []
+        for section in sections:
+            cost = estimate_tokens(section) + 1
+            if cost <= remaining:
+                used_sections.append(section)
+                remaining -= cost
+                continue
+            truncated = True
+            partial = truncate_to_tokens(section, remaining - 1) if remaining > self.min_turn_tokens else ""
+            if partial:
+                used_sections.append(partial)
+                remaining -= estimate_tokens(partial) + 1
+            break
+        included_sections = len(used_sections)
+        if included_sections < len(sections):
+            note = f"(이하 {len(sections) - included_sections}개 항목 생략)"
+            used_sections.append(note)
+            remaining -= estimate_tokens(note) + 1
+        context_text = "\n".join(used_sections)
+        system_prompt = system_template.replace("{context}", context_text)
+
+        # 3. 최근 대화 (최신 턴부터, 현재 질문과 같은 마지막 사용자 메시지는 중복이므로 제외)
+        turns = [
+            {"role": msg["role"], "content": message_text(msg["content"])}
+            for msg in history
+            if not (skip_history and skip_history(msg["content"]))
+        ]
+        if turns and turns[-1]["role"] == "user" and turns[-1]["content"] == query:
+            turns.pop()
+        turns = turns[-self.max_turns:] if self.max_turns else []
+        selected = []
+        for turn in reversed(turns):
+            cost = estimate_tokens(turn["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if cost > remaining:
+                truncated = True
+                if remaining - MESSAGE_OVERHEAD_TOKENS >= self.min_turn_tokens:
+                    content = truncate_to_tokens(turn["content"], remaining - MESSAGE_OVERHEAD_TOKENS)
+                    selected.append({"role": turn["role"], "content": content})
+                    remaining -= estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+                break
+            selected.append(turn)
+            remaining -= cost
+        selected.reverse()
+
+        messages = [{"role": "system", "content": system_prompt}, *selected, {"role": "user", "content": query_text}]
+        history_tokens = sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in selected)
+        report = {
+            "budget": budget,
+            "total": sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages),
+            "system": estimate_tokens(system_base),
+            "context": estimate_tokens(context_text),
+            "context_sections": f"{included_sections}/{len(sections)}",
+            "history": history_tokens,
+            "history_turns": f"{len(selected)}/{len(turns)}",
+            "query": query_tokens - MESSAGE_OVERHEAD_TOKENS,
+            "truncated": truncated
+        }
+        logger.info(
+            f"🧮 프롬프트 토큰 {report['total']}/{budget} - 시스템 {report['system']}, "
+            f"컨텍스트 {report['context']} ({report['context_sections']}항목), "
+            f"대화 {report['history']} ({report['history_turns']}턴), 질문 {report['query']}"
+            + (" [잘림]" if report["truncated"] else "")
+        )
+        return messages, report
@@ -1,6 +1,8 @@
 # utils/providers.py
 from config.imports import *
 import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
 
 logger = logging.getLogger("HybridChat")
 
@@ -53,3 +55,426 @@ def get_client():
     return _client_instance
 
 _client_instance = None
+
+
+# 프로세스 전체 프로바이더 풀 (세션마다 프로브하지 않음)
+PROVIDERS = ["Liaobots"]
+PROBE_MESSAGES = [{"role": "system", "content": "테스트 메시지입니다."}]
+
+
+class ProviderStats:
+    """프로바이더별 지연/오류 기록"""
+
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.healthy = None  # None: 아직 확인 전 (낙관적으로 사용)
+        self.last_success = 0.0
+        self.last_checked = 0.0
+        self.last_error = None
+        # hedged 요청: 경쟁에 참여한 횟수 / 먼저 응답한 횟수
+        self.races = 0
+        self.wins = 0
+        # 스트리밍 요청의 첫 토큰까지 걸린 시간 (전체 지연과 섞지 않음)
+        self.first_token_latencies = deque(maxlen=window)
+
+    def percentile(self, q):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def median_latency(self):
+        return self.percentile(0.5)
+
+    def snapshot(self):
+        return {
+            "healthy": self.healthy,
+            "successes": self.successes,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "median_latency": round(self.median_latency(), 3),
+            "p95_latency": round(self.percentile(0.95), 3),
+            "races": self.races,
+            "win_rate": round(self.wins / self.races, 3) if self.races else None,
+            "median_ttft": round(sorted(self.first_token_latencies)[len(self.first_token_latencies) // 2], 3)
+            if self.first_token_latencies else None,
+            "last_error": self.last_error
+        }
+
+
+class ProviderPool:
+    """
+    프로세스 전체에서 공유하는 g4f 프로바이더 풀 (app.py에서 st.cache_resource로 한 번 생성)
+    - borrow(): 가장 건강하고 빠른 프로바이더의 client를 즉시 반환 (프로브 요청 없음)
+    - record(): 실제 요청의 지연/성공 여부를 집계, unhealthy_after회 연속 실패 시 unhealthy
+    - 백그라운드 스레드가 health_check_ttl마다 최근 성공 기록이 없는 프로바이더만 프로브
+    - hedged_completion(): 주 프로바이더가 p95 지연 안에 응답하지 않으면 두 번째 프로바이더에
+      같은 요청을 보내고 먼저 온 응답을 사용 (늦은 쪽은 무시, 프로바이더별 승률 기록)
+    - 진행 중인 프로바이더 호출(hedge, 이미 진 요청 포함)은 max_inflight개로 제한
+      (LLM_MAX_CONCURRENCY와 같은 값, 빈 슬롯이 없으면 hedge 생략)
+    - stream_completion(): 텍스트 조각을 바로 yield, 첫 조각이 첫 토큰 p95 안에 오지 않거나 그 전에 실패하면
+      두 번째 프로바이더에도 요청하고 먼저 첫 조각을 보낸 스트림을 사용
+      (첫 조각이 first_token_timeout, 다음 조각이 chunk_timeout 안에 오지 않으면 TimeoutError)
+    """
+
+    # p95 계산에 필요한 최소 표본 수 (부족하면 default_hedge_delay 사용)
+    MIN_HEDGE_SAMPLES = 20
+
+    def __init__(self, providers=None, model="gpt-4o-mini", health_check_ttl=300, unhealthy_after=3,
+                 client_factory=None, hedge_enabled=True, default_hedge_delay=3.0,
+                 min_hedge_delay=0.5, max_hedge_delay=10.0, max_inflight=8,
+                 first_token_timeout=30.0, chunk_timeout=30.0):
+        self.providers = list(providers or PROVIDERS)
+        self.model = model
+        self.health_check_ttl = health_check_ttl
+        self.unhealthy_after = unhealthy_after
+        self._client_factory = client_factory or (lambda provider: Client(include_providers=[provider]))
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._stats = {provider: ProviderStats() for provider in self.providers}
+        self._stop = threading.Event()
+        self._thread = None
+        self.hedge_enabled = hedge_enabled
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.first_token_timeout = first_token_timeout
+        self.chunk_timeout = chunk_timeout
+        # 응답을 기다리는 요청이 끝나도 늦은 요청은 계속 실행되므로 슬롯은 실제 호출이 끝날 때 반환
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="llm-hedge")
+
+    def client_for(self, provider):
+        with self._lock:
+            client = self._clients.get(provider)
+            if client is None:
+                client = self._clients[provider] = self._client_factory(provider)
+            return client
+
+    def borrow(self):
+        """(client, provider_name)을 즉시 반환합니다."""
+        with self._lock:
+            candidates = [p for p in self.providers if self._stats[p].healthy is not False]
+            if not candidates:
+                # 모두 unhealthy면 연속 실패가 가장 적은 프로바이더로 계속 시도
+                candidates = self.providers
+            provider = min(
+                candidates,
+                key=lambda p: (self._stats[p].consecutive_errors, self._stats[p].median_latency(), random.random())
+            )
+        return self.client_for(provider), provider
+
+    def is_healthy(self, provider):
+        with self._lock:
+            stats = self._stats.get(provider)
+            return stats is not None and stats.healthy is not False
+
+    def record(self, provider, latency, ok, error=None, first_token=None):
+        with self._lock:
+            stats = self._stats.get(provider)
+            if stats is None:
+                return
+            if first_token is not None:
+                stats.first_token_latencies.append(first_token)
+            if ok:
+                # 스트리밍 요청은 전체 지연(latency=None)을 hedge 기준 p95에 넣지 않음
+                if latency is not None:
+                    stats.latencies.append(latency)
+                stats.successes += 1
+                stats.consecutive_errors = 0
+                stats.healthy = True
+                stats.last_success = time.time()
+            else:
+                stats.errors += 1
+                stats.consecutive_errors += 1
+                stats.last_error = str(error) if error is not None else None
+                if stats.consecutive_errors >= self.unhealthy_after:
+                    if stats.healthy is not False:
+                        logger.warning(f"프로바이더 비활성화: {provider} (연속 {stats.consecutive_errors}회 실패)")
+                    stats.healthy = False
+
+    def hedge_delay(self, provider):
+        """provider의 p95 지연 기반 hedge 대기 시간 (초)"""
+        with self._lock:
+            stats = self._stats[provider]
+            if len(stats.latencies) < self.MIN_HEDGE_SAMPLES:
+                return self.default_hedge_delay
+            return min(self.max_hedge_delay, max(self.min_hedge_delay, stats.percentile(0.95)))
+
+    def hedged_completion(self, messages, primary=None, model=None):
+        """
+        hedged 요청으로 chat completion을 만들고 (response, 응답한 프로바이더)를 반환합니다.
+        두 프로바이더가 모두 실패하면 마지막 예외를 그대로 발생시킵니다.
+        """
+        primary = primary or self.borrow()[1]
+        model = model or self.model
+        primary_future = self._submit(primary, messages, model, blocking=True)
+        futures = {primary_future: primary}
+
+        done, _ = wait(futures, timeout=self.hedge_delay(primary))
+        # 지연되거나 바로 실패하면 두 번째 프로바이더에 같은 요청
+        if self.hedge_enabled and (not done or primary_future.exception() is not None):
+            secondary = self._pick_secondary(primary)
+            hedge_future = self._submit(secondary, messages, model, blocking=False) if secondary is not None else None
+            if hedge_future is not None:
+                logger.info(f"⏱️ {primary} 응답 지연/실패 -> {secondary}에 hedged 요청")
+                futures[hedge_future] = secondary
+            elif secondary is not None:
+                logger.info(f"⏱️ {primary} 응답 지연/실패, 동시 요청 한도에 걸려 hedge 생략")
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                provider = futures[future]
+                if len(futures) > 1:
+                    with self._lock:
+                        for racer in futures.values():
+                            self._stats[racer].races += 1
+                        self._stats[provider].wins += 1
+                # 늦은 요청은 취소 가능하면 취소, 이미 실행 중이면 결과만 무시 (지연/오류 기록은 유지)
+                for loser in pending:
+                    loser.cancel()
+                return response, provider
+        raise error
+
+    def first_token_hedge_delay(self, provider):
+        """provider의 첫 토큰 p95 기반 스트리밍 hedge 대기 시간 (초)"""
+        with self._lock:
+            ttft = sorted(self._stats[provider].first_token_latencies)
+            if len(ttft) < self.MIN_HEDGE_SAMPLES:
+                return self.default_hedge_delay
+            p95 = ttft[min(len(ttft) - 1, int(0.95 * len(ttft)))]
+            return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    def stream_completion(self, messages, primary=None, model=None):
+        """
+        stream=True로 chat completion을 요청하고 텍스트 조각을 yield 하는 generator입니다.
+        - 주 프로바이더의 첫 조각이 첫 토큰 p95 안에 오지 않거나 첫 조각 전에 실패하면 두 번째 프로바이더에도 요청
+          (hedge, 빈 슬롯이 있을 때만), 먼저 첫 조각을 보낸 스트림만 끝까지 전달하고 나머지는 읽기를 멈춤
+        - 이미 일부를 보낸 뒤의 실패나 모든 프로바이더 실패는 예외로 전달
+        - 첫 조각이 first_token_timeout, 이후 조각이 chunk_timeout 안에 오지 않으면 TimeoutError
+          (연결만 맺고 응답하지 않는 프로바이더가 UI와 슬롯을 붙잡지 않도록, 모든 스트림 중단)
+        """
+        primary = primary or self.borrow()[1]
+        model = model or self.model
+        events = queue.Queue()
+        streams = {}  # provider -> 중단 Event
+        self._slots.acquire()
+        streams[primary] = self._start_stream(primary, messages, model, events)
+        started = time.perf_counter()
+        hedge_at = started + self.first_token_hedge_delay(primary)
+        deadline = started + self.first_token_timeout if self.first_token_timeout else None
+        running = {primary}
+        hedged = False
+        winner = None
+        error = None
+        try:
+            while winner is None:
+                wait_until = hedge_at if self.hedge_enabled and not hedged else None
+                if deadline is not None:
+                    wait_until = deadline if wait_until is None else min(wait_until, deadline)
+                timeout = None if wait_until is None else max(0.0, wait_until - time.perf_counter())
+                try:
+                    provider, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        self._stream_timed_out(running, f"{self.first_token_timeout}초 안에 첫 조각이 오지 않았습니다.")
+                    hedged = True
+                    self._hedge_stream(primary, streams, running, messages, model, events, "첫 토큰 지연")
+                    continue
+                if kind == "chunk":
+                    winner = provider
+                    yield value
+                    break
+                running.discard(provider)
+                if kind == "done":
+                    # 빈 응답으로 끝난 스트림
+                    winner = provider
+                    break
+                error = value
+                # 첫 조각 전 실패는 hedge 설정과 관계없이 다른 프로바이더로 전환
+                if not hedged:
+                    hedged = True
+                    self._hedge_stream(primary, streams, running, messages, model, events, "첫 토큰 전 실패")
+                if not running:
+                    raise error
+
+            if len(streams) > 1:
+                with self._lock:
+                    for racer in streams:
+                        self._stats[racer].races += 1
+                    self._stats[winner].wins += 1
+            # 진 스트림은 읽기를 멈춰 연결/슬롯을 바로 반환
+            for provider, stop in streams.items():
+                if provider != winner:
+                    stop.set()
+            if winner not in running:
+                return
+            deadline = time.perf_counter() + self.chunk_timeout if self.chunk_timeout else None
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                try:
+                    provider, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    self._stream_timed_out([winner], f"{self.chunk_timeout}초 동안 다음 조각이 오지 않았습니다.")
+                if provider != winner:
+                    continue
+                if kind == "chunk":
+                    yield value
+                    if deadline is not None:
+                        deadline = time.perf_counter() + self.chunk_timeout
+                elif kind == "done":
+                    return
+                else:
+                    raise value
+        finally:
+            # 소비자가 중간에 멈추거나 예외가 나도 모든 스트림 중단
+            for stop in streams.values():
+                stop.set()
+
+    def _stream_timed_out(self, providers, message):
+        """응답 없는 스트림을 실패로 기록하고 TimeoutError (호출 쪽 finally에서 스트림 중단)"""
+        error = TimeoutError(message)
+        for provider in providers:
+            self.record(provider, None, False, error)
+        logger.warning(f"⏱️ 스트리밍 응답 시간 초과 ({', '.join(providers)}): {message}")
+        raise error
+
+    def _hedge_stream(self, primary, streams, running, messages, model, events, reason):
+        """두 번째 프로바이더에 스트리밍 요청 (빈 슬롯이 없거나 후보가 없으면 생략)"""
+        secondary = self._pick_secondary(primary)
+        if secondary is None:
+            return
+        if not self._slots.acquire(blocking=False):
+            logger.info(f"⏱️ {primary} {reason}, 동시 요청 한도에 걸려 hedge 생략")
+            return
+        logger.info(f"⏱️ {primary} {reason} -> {secondary}에 hedged 스트리밍 요청")
+        streams[secondary] = self._start_stream(secondary, messages, model, events)
+        running.add(secondary)
+
+    def _start_stream(self, provider, messages, model, events):
+        """
+        executor 스레드에서 provider 스트림을 읽어 (provider, "chunk"|"done"|"error", 값)을 events에 넣습니다.
+        호출 전에 슬롯을 얻어 두어야 하며, 스트림이 끝나거나 중단되면 슬롯을 반환합니다. 반환: 중단 Event
+        """
+        stop = threading.Event()
+        client = self.client_for(provider)
+
+        def pump():
+            started = time.perf_counter()
+            first_token = None
+            try:
+                stream = client.chat.completions.create(model=model, messages=messages, stream=True)
+                for chunk in stream:
+                    if stop.is_set():
+                        close = getattr(stream, "close", None)
+                        if close is not None:
+                            close()
+                        return
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if not text:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    events.put((provider, "chunk", text))
+            except Exception as e:
+                self.record(provider, None, False, e, first_token=first_token)
+                events.put((provider, "error", e))
+            else:
+                self.record(provider, None, True, first_token=first_token)
+                events.put((provider, "done", None))
+            finally:
+                self._slots.release()
+
+        try:
+            self._executor.submit(pump)
+        except BaseException:
+            self._slots.release()
+            raise
+        return stop
+
+    def _submit(self, provider, messages, model, blocking):
+        """슬롯을 얻으면 요청을 executor에 넣고 Future를 반환 (blocking=False인데 빈 슬롯이 없으면 None)"""
+        if not self._slots.acquire(blocking=blocking):
+            return None
+        client = self.client_for(provider)
+        started = time.perf_counter()
+
+        def call():
+            try:
+                response = client.chat.completions.create(model=model, messages=messages)
+            except Exception as e:
+                self.record(provider, time.perf_counter() - started, False, e)
+                raise
+            self.record(provider, time.perf_counter() - started, True)
+            return response
+
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._slots.release()
+            raise
+        # 끝나거나 실행 전에 취소되면 슬롯 반환
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _pick_secondary(self, primary):
+        with self._lock:
+            candidates = [p for p in self.providers if p != primary and self._stats[p].healthy is not False]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda p: (self._stats[p].median_latency(), random.random()))
+
+    def check_health(self):
+        """최근 health_check_ttl 동안 성공 기록이 없는 프로바이더를 프로브합니다."""
+        now = time.time()
+        with self._lock:
+            due = [p for p, s in self._stats.items()
+                   if now - max(s.last_success, s.last_checked) >= self.health_check_ttl]
+            for provider in due:
+                self._stats[provider].last_checked = now
+        for provider in due:
+            started = time.perf_counter()
+            try:
+                self.client_for(provider).chat.completions.create(model=self.model, messages=PROBE_MESSAGES)
+            except Exception as e:
+                self.record(provider, time.perf_counter() - started, False, e)
+                # 프로브 실패는 바로 unhealthy 처리 (실제 요청이 실패하기 전에 제외)
+                with self._lock:
+                    self._stats[provider].healthy = False
+                logger.warning(f"{provider} 프로바이더를 사용할 수 없습니다: {str(e)}")
+            else:
+                self.record(provider, time.perf_counter() - started, True)
+                logger.info(f"프로바이더 상태 확인 완료: {provider}")
+
+    def start(self):
+        """백그라운드 상태 확인 스레드를 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._health_loop, name="provider-health", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self):
+        with self._lock:
+            return {provider: stats.snapshot() for provider, stats in self._stats.items()}
+
+    def _health_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.error(f"프로바이더 상태 확인 오류: {str(e)}")
+            self._stop.wait(min(self.health_check_ttl, 60))
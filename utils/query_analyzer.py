@@ -265,9 +265,17 @@
 
 # utils/query_analyzer.py
 import re
+import json
+import hashlib
+from collections import namedtuple
+from dataclasses import dataclass
 from functools import lru_cache
+from typing import Optional
 import logging
 
+from utils.keyword_matcher import KeywordMatcher
+from utils.morph_analyzer import NOUN, get_morph_analyzer, register_nouns
+
 logger = logging.getLogger(__name__)
 
 # 도시 및 시간 추출
@@ -326,231 +334,238 @@ def extract_league_from_query(query):
             return league_key
     return None
 
-def is_time_query(query):
-    """시간 관련 질문인지 정확하게 판단"""
-    
-    # 긍정적 시간 패턴들
-    positive_patterns = [
-        r'(서울|도쿄|뉴욕|런던|파리|베를린|마드리드|로마|밀라노|시드니|홍콩|싱가포르|모스크바|두바이|라스베이거스|시카고|토론토|멜버른)\s*(시간|time)',
-        r'(현재|지금)\s*(시간|time)',
-        r'몇\s*시',
-        r'(오늘|현재|지금|금일)\s*(날짜|date)',
-        r'what\s*time',
-        r'시간\s*(알려|궁금)',
-        r'몇시인지',
-        r'time\s*in'
-    ]
-    
-    # 부정적 컨텍스트
-    negative_patterns = [
-        r'실시간.*?(축구|야구|농구|경기|스포츠|뉴스|주식|코인|정보)',
-        r'시간.*?(부족|없어|모자라|부족해|없다|남아)',
-        r'언제.*?시간',
-        r'시간대.*?날씨',
-        r'시간당',
-        r'시간.*?(걸려|소요|필요)',
-        r'몇.*?시간.*?(후|뒤|전)',
-        r'시간.*?(맞춰|맞추|조정)',
-        r'시간표',
-        r'시간.*?(예약|약속|일정)'
-    ]
-    
-    # 부정적 컨텍스트 확인
-    for pattern in negative_patterns:
-        if re.search(pattern, query):
+# 서울시 25개 자치구
+SEOUL_DISTRICTS = [
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
+    "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
+    "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
+]
+
+# --- 의도 분류기 ---
+# 시간 질문 패턴 (부정 패턴이 하나라도 맞으면 시간 질문 아님)
+TIME_POSITIVE_PATTERNS = [
+    r'(서울|도쿄|뉴욕|런던|파리|베를린|마드리드|로마|밀라노|시드니|홍콩|싱가포르|모스크바|두바이|라스베이거스|시카고|토론토|멜버른)\s*(시간|time)',
+    r'(현재|지금)\s*(시간|time)',
+    r'몇\s*시',
+    r'(오늘|현재|지금|금일)\s*(날짜|date)',
+    r'what\s*time',
+    r'시간\s*(알려|궁금)',
+    r'몇시인지',
+    r'time\s*in'
+]
+TIME_NEGATIVE_PATTERNS = [
+    r'실시간.*?(축구|야구|농구|경기|스포츠|뉴스|주식|코인|정보)',
+    r'시간.*?(부족|없어|모자라|부족해|없다|남아)',
+    r'언제.*?시간',
+    r'시간대.*?날씨',
+    r'시간당',
+    r'시간.*?(걸려|소요|필요)',
+    r'몇.*?시간.*?(후|뒤|전)',
+    r'시간.*?(맞춰|맞추|조정)',
+    r'시간표',
+    r'시간.*?(예약|약속|일정)'
+]
+TIME_POSITIVE_RE = re.compile("|".join(f"(?:{p})" for p in TIME_POSITIVE_PATTERNS))
+TIME_NEGATIVE_RE = re.compile("|".join(f"(?:{p})" for p in TIME_NEGATIVE_PATTERNS))
+
+# 공백을 제거한 쿼리에서 찾는 키워드 (공공 API 약국/병원 검색)
+WEB_SEARCH_KEYWORDS = ["네이버검색", "웹검색", "인터넷검색", "온라인검색", "검색해줘", "검색해"]
+PHARMACY_KEYWORDS = [
+    "약국", "약국정보", "약국검색", "약국운영", "약국시간",
+    "서울약국", "약국찾기", "약국위치", "약국운영시간"
+]
+HOSPITAL_KEYWORDS = [
+    "병원정보", "병원운영", "병원시간", "서울병원", "병원찾기",
+    "병원위치", "병원운영시간", "의원", "클리닉", "진료소"
+]
+
+# 공백을 유지한 쿼리에서 찾는 키워드: (의도, 키워드 목록)을 우선순위 순으로
+# (약국/병원 검색은 "검색해" 다음, 문화행사 앞에서 판단)
+INTENT_KEYWORDS = [
+    ("naver_search", ["검색해줘", "검색해"]),
+    ("cultural_event", ["문화행사", "문화이벤트"]),
+    ("weather", ["날씨"]),
+    ("time", ["시간", "날짜"]),
+    ("league_standings", ["리그순위"]),
+    ("league_scorers", ["리그득점순위", "득점순위"]),
+    ("drug", ["약품검색"]),
+    ("arxiv_search", ["공학논문", "arxiv"]),
+    ("pubmed_search", ["의학논문"]),
+    ("mbti", ["mbti검사"]),
+    ("mbti_types", ["mbti유형설명", "mbti유형", "mbti설명"]),
+    ("multi_iq_types", ["다중지능유형설명", "다중지능유형", "다중지능설명", "다중지능 유형 설명", "다중지능 유형"]),
+    ("multi_iq_jobs", ["다중지능직업", "다중지능추천", "다중지능 직업", "다중지능 추천"]),
+    ("multi_iq", ["다중지능검사", "다중지능 검사"]),
+    ("multi_iq_full", ["다중지능"]),
+]
+TOMORROW_KEYWORD = "내일"
+CL_KEYWORDS = ["챔피언스리그", "ucl"]
+CL_KNOCKOUT_KEYWORDS = ["토너먼트", "knockout", "16강", "8강", "4강", "결승"]
+# 다른 명사 안에도 흔히 들어가는 짧은 키워드 ("국회의원"의 "의원"): 어절 중간에서 찾으면 형태소 분석으로 확인
+EMBEDDED_KEYWORDS = ["의원"]
+# 키워드로 끝나지만 시설이 아닌 명사
+NON_FACILITY_NOUNS = ["국회의원", "시의원", "구의원", "도의원", "군의원", "의원실"]
+
+_SPACED_MATCHER = KeywordMatcher(
+    [k for _, keywords in INTENT_KEYWORDS for k in keywords]
+    + [TOMORROW_KEYWORD] + CL_KEYWORDS + CL_KNOCKOUT_KEYWORDS + GREETINGS + SEOUL_DISTRICTS
+)
+_COMPACT_MATCHER = KeywordMatcher(WEB_SEARCH_KEYWORDS + PHARMACY_KEYWORDS + HOSPITAL_KEYWORDS + ["병원"])
+_WEB_SEARCH_SET = frozenset(WEB_SEARCH_KEYWORDS)
+_PHARMACY_SET = frozenset(PHARMACY_KEYWORDS)
+_HOSPITAL_SET = frozenset(HOSPITAL_KEYWORDS)
+_DISTRICT_SET = frozenset(SEOUL_DISTRICTS)
+_EMBEDDED_SET = frozenset(EMBEDDED_KEYWORDS)
+_NON_FACILITY_SET = frozenset(NON_FACILITY_NOUNS)
+# 어절이 비시설 명사로 시작하는 경우 ("성북구의원"의 "구의원"처럼 어절 중간은 제외)
+_NON_FACILITY_PATTERN = re.compile(
+    r"(?<!\S)(?:" + "|".join(re.escape(n) for n in sorted(NON_FACILITY_NOUNS, key=len, reverse=True)) + ")"
+)
+# 키워드 -> (의도 우선순위, 목록 내 순서, 의도, (키워드,))
+_KEYWORD_ROUTES = {
+    keyword: (rank, order, intent, (keyword,))
+    for rank, (intent, keywords) in enumerate(INTENT_KEYWORDS)
+    for order, keyword in enumerate(keywords)
+}
+# 챔피언스리그 토너먼트는 득점순위 다음, 약품 검색 앞
+_CL_KNOCKOUT_RANK = [intent for intent, _ in INTENT_KEYWORDS].index("drug") - 0.5
+
+QueryClassification = namedtuple("QueryClassification", ["intent", "keywords", "spans"])
+
+
+def _scan_spaced(query):
+    """strip + 소문자 쿼리에서 의도 키워드/지역구 -> span"""
+    return _SPACED_MATCHER.find_all(query.strip().lower())
+
+
+def _scan_compact(query):
+    """공백 제거 + 소문자 쿼리에서 약국/병원 관련 키워드 -> span (공백 제거 후 위치)"""
+    query_lower = query.lower()
+    found = _COMPACT_MATCHER.find_all(query_lower.replace(" ", ""))
+    if found and not _EMBEDDED_SET.isdisjoint(found):
+        for keyword in _EMBEDDED_SET.intersection(found):
+            if not _is_standalone_keyword(query_lower, keyword):
+                del found[keyword]
+    return found
+
+
+def _is_standalone_keyword(query_lower, keyword):
+    """
+    keyword가 다른 명사의 일부가 아닌지 확인 ("강남구 의원" O, "국회의원 선거" X)
+    - 모든 등장 위치가 어절 시작이면 형태소 분석 없이 True
+    - 분석기 준비 전이면 기존처럼 부분 문자열 매칭 결과(True) 사용
+    - 비시설 명사("국회의원" 등)로 시작하는 어절에서 지우면 남는 등장이 없으면 형태소 분석 없이 False
+    - 그래도 어절 중간에 남은 경우만 형태소 분석 (시간 초과면 True)
+    """
+    if not _has_embedded(query_lower, keyword):
+        return True
+    analyzer = get_morph_analyzer()
+    if not analyzer.ready:
+        analyzer.nouns(query_lower)  # 로딩 시작 (로딩 중이면 이 분석 결과는 캐시되지 않음)
+        return True
+    if _NON_FACILITY_PATTERN.search(query_lower):
+        query_lower = _NON_FACILITY_PATTERN.sub(" ", query_lower)
+        if keyword not in query_lower:
             return False
-    
-    # 긍정적 패턴 확인
-    for pattern in positive_patterns:
-        if re.search(pattern, query):
+        if not _has_embedded(query_lower, keyword):
             return True
-    
+    nouns = analyzer.nouns(query_lower)
+    if nouns is None:
+        return True
+    return any(noun.endswith(keyword) and noun not in _NON_FACILITY_SET for noun in nouns)
+
+
+def _has_embedded(query_lower, keyword):
+    """keyword가 어절 중간(앞 글자가 공백이 아님)에서 등장하는지"""
+    start = query_lower.find(keyword)
+    while start != -1:
+        if start > 0 and not query_lower[start - 1].isspace():
+            return True
+        start = query_lower.find(keyword, start + 1)
     return False
 
+
+def _first(found, keywords):
+    """keywords 중 found에 있는 첫 키워드 (없으면 빈 tuple)"""
+    for keyword in keywords:
+        if keyword in found:
+            return (keyword,)
+    return ()
+
+
+def _facility_search(spaced, compact, keywords, facility):
+    """공공 API 시설 검색 여부 (웹 검색 키워드가 있으면 제외, 시설 키워드 또는 자치구 + 시설명)"""
+    if not compact or not _WEB_SEARCH_SET.isdisjoint(compact):
+        return False
+    if not keywords.isdisjoint(compact):
+        return True
+    return facility in compact and not _DISTRICT_SET.isdisjoint(spaced)
+
+
+def _route(query_lower, spaced, compact):
+    """(의도, 결정에 쓰인 키워드) - 기존 needs_search의 if 순서 그대로"""
+    # 찾은 키워드를 (의도 우선순위, 목록 내 순서)로 정렬하면 if 체인에서 먼저 걸리는 순서가 됨
+    routes = sorted(_KEYWORD_ROUTES[k] for k in spaced if k in _KEYWORD_ROUTES)
+    if routes and routes[0][2] == "naver_search":
+        return "naver_search", routes[0][3]
+    # 약국/병원 공공 API 검색은 "검색해" 다음, 문화행사 앞에서 판단
+    for intent, keywords, facility in (("pharmacy_search", _PHARMACY_SET, "약국"),
+                                       ("hospital_search", _HOSPITAL_SET, "병원")):
+        if _facility_search(spaced, compact, keywords, facility):
+            return intent, tuple(k for k in compact if k in keywords or k == facility) + _first(spaced, SEOUL_DISTRICTS)
+    cl, knockout = _first(spaced, CL_KEYWORDS), _first(spaced, CL_KNOCKOUT_KEYWORDS)
+    if cl and knockout:
+        routes.append((_CL_KNOCKOUT_RANK, 0, "cl_knockout", cl + knockout))
+        routes.sort()
+
+    for _, _, intent, matched in routes:
+        if intent == "weather":
+            return ("tomorrow_weather" if TOMORROW_KEYWORD in spaced else "weather"), matched
+        if intent == "time" and not is_time_query(query_lower):
+            continue
+        return intent, matched
+    return "conversation", _first(spaced, GREETINGS)
+
+
+def classify_query(query):
+    """
+    쿼리 의도를 한 번에 분류합니다 (기존 needs_search 판단 순서와 동일).
+    - 공백 유지 쿼리와 공백 제거 쿼리를 각각 한 번씩만 훑어 모든 키워드와 위치를 찾음
+    - 시간 질문 패턴은 미리 컴파일한 결합 정규식 2개로 판단
+    반환: QueryClassification(intent, 결정에 쓰인 키워드, 찾은 키워드 -> (시작, 끝))
+    """
+    query_lower = query.strip().lower()
+    spaced = _SPACED_MATCHER.find_all(query_lower)
+    compact = _scan_compact(query)
+    if not spaced and not compact:
+        return QueryClassification("conversation", (), {})
+    intent, keywords = _route(query_lower, spaced, compact)
+    spans = spaced
+    if compact:
+        spans = {**spaced, **{f"{k}(공백제거)": span for k, span in compact.items()}}
+    return QueryClassification(intent, keywords, spans)
+
+
+def is_time_query(query):
+    """시간 관련 질문인지 정확하게 판단"""
+    if TIME_NEGATIVE_RE.search(query):
+        return False
+    return TIME_POSITIVE_RE.search(query) is not None
+
+
 def is_hospital_search(query):
     """병원 검색 쿼리인지 확인 (공공 API 사용)"""
-    query_lower = query.lower().replace(" ", "")
-    
-    logger.info(f"🔍 병원 검색 체크: '{query}' -> '{query_lower}'")
-    
-    # 명시적 웹 검색 키워드가 있으면 제외
-    web_search_keywords = [
-        "네이버검색", "웹검색", "인터넷검색", "온라인검색",
-        "검색해줘", "검색해", "웹검색"
-    ]
-    
-    for keyword in web_search_keywords:
-        if keyword in query_lower:
-            logger.info(f"❌ 웹 검색 키워드 '{keyword}'로 인해 병원 검색 제외")
-            return False
-    
-    hospital_keywords = [
-        "병원정보", "병원운영", "병원시간", "서울병원", "병원찾기", 
-        "병원위치", "병원운영시간", "의원", "클리닉", "진료소"
-    ]
-    
-    for keyword in hospital_keywords:
-        if keyword in query_lower:
-            logger.info(f"✅ 병원 키워드 '{keyword}' 매칭됨")
-            return True
-    
-    # 지역구 + 병원 패턴 (단, 검색 키워드 없을 때만)
-    districts = [
-        "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
-        "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
-        "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
-    ]
-    
-    for district in districts:
-        if district in query and "병원" in query_lower:
-            logger.info(f"✅ 지역구 '{district}' + 병원 패턴 매칭됨")
-            return True
-    
-    logger.info("❌ 병원 키워드 매칭 안됨")
-    return False
+    return _facility_search(_scan_spaced(query), _scan_compact(query), _HOSPITAL_SET, "병원")
+
 
 def is_pharmacy_search(query):
     """약국 검색 쿼리인지 확인 (공공 API 사용)"""
-    query_lower = query.lower().replace(" ", "")
-    
-    logger.info(f"🔍 약국 검색 체크: '{query}' -> '{query_lower}'")
-    
-    # 명시적 웹 검색 키워드가 있으면 제외
-    web_search_keywords = [
-        "네이버검색", "웹검색", "인터넷검색", "온라인검색",
-        "검색해줘", "검색해", "웹검색"
-    ]
-    
-    for keyword in web_search_keywords:
-        if keyword in query_lower:
-            logger.info(f"❌ 웹 검색 키워드 '{keyword}'로 인해 약국 검색 제외")
-            return False
-    
-    pharmacy_keywords = [
-        "약국", "약국정보", "약국검색", "약국운영", "약국시간",
-        "서울약국", "약국찾기", "약국위치", "약국운영시간"
-    ]
-    
-    for keyword in pharmacy_keywords:
-        if keyword in query_lower:
-            logger.info(f"✅ 약국 키워드 '{keyword}' 매칭됨")
-            return True
-    
-    # 지역구 + 약국 패턴 (단, 검색 키워드 없을 때만)
-    districts = [
-        "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구",
-        "노원구", "도봉구", "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구",
-        "성북구", "송파구", "양천구", "영등포구", "용산구", "은평구", "종로구", "중구", "중랑구"
-    ]
-    
-    for district in districts:
-        if district in query and "약국" in query_lower:
-            logger.info(f"✅ 지역구 '{district}' + 약국 패턴 매칭됨")
-            return True
-    
-    logger.info("❌ 약국 키워드 매칭 안됨")
-    return False
+    return _facility_search(_scan_spaced(query), _scan_compact(query), _PHARMACY_SET, "약국")
+
 
-@lru_cache(maxsize=100)
 def needs_search(query):
     """쿼리 타입을 분석하여 적절한 검색 타입을 반환"""
-    query_lower = query.strip().lower()
-    
-    logger.info(f"🔍 쿼리 분석: '{query}' -> '{query_lower}'")
-    
-    # 🔴 명시적 웹 검색 요청 (최우선 체크)
-    if "검색해줘" in query_lower or "검색해" in query_lower:
-        logger.info("✅ 네이버 검색으로 분류됨 (검색 키워드 명시)")
-        return "naver_search"
-    
-    # 🔴 약국 검색 (공공 API)
-    if is_pharmacy_search(query):
-        logger.info("✅ 약국 검색으로 분류됨")
-        return "pharmacy_search"
-    
-    # 🔴 병원 검색 (공공 API)
-    if is_hospital_search(query):
-        logger.info("✅ 병원 검색으로 분류됨")
-        return "hospital_search"
-    
-    # 🔴 문화행사 검색
-    if "문화행사" in query_lower or "문화이벤트" in query_lower:
-        logger.info("✅ 문화행사 검색으로 분류됨")
-        return "cultural_event"
-    
-    # 날씨 관련 쿼리
-    if "날씨" in query_lower:
-        logger.info("✅ 날씨 검색으로 분류됨")
-        return "weather" if "내일" not in query_lower else "tomorrow_weather"
-    
-    # 시간 관련 쿼리
-    if "시간" in query_lower or "날짜" in query_lower:
-        if is_time_query(query_lower):
-            logger.info("✅ 시간 검색으로 분류됨")
-            return "time"
-    
-    # 축구 리그 순위
-    if "리그순위" in query_lower:
-        logger.info("✅ 리그순위 검색으로 분류됨")
-        return "league_standings"
-    
-    # 축구 득점 순위
-    if "리그득점순위" in query_lower or "득점순위" in query_lower:
-        logger.info("✅ 득점순위 검색으로 분류됨")
-        return "league_scorers"
-    
-    # 챔피언스리그 관련
-    if ("챔피언스리그" in query_lower or "ucl" in query_lower) and (
-        "토너먼트" in query_lower or "knockout" in query_lower or "16강" in query_lower or "8강" in query_lower or "4강" in query_lower or "결승" in query_lower):
-        logger.info("✅ 챔피언스리그 토너먼트 검색으로 분류됨")
-        return "cl_knockout"
-    
-    # 약품 검색
-    if "약품검색" in query_lower:
-        logger.info("✅ 약품 검색으로 분류됨")
-        return "drug"
-    
-    # 논문 검색
-    if "공학논문" in query_lower or "arxiv" in query_lower:
-        logger.info("✅ 공학논문 검색으로 분류됨")
-        return "arxiv_search"
-    if "의학논문" in query_lower:
-        logger.info("✅ 의학논문 검색으로 분류됨")
-        return "pubmed_search"
-    
-    # MBTI 관련
-    if "mbti검사" in query_lower:
-        logger.info("✅ MBTI 검사로 분류됨")
-        return "mbti"
-    if "mbti유형설명" in query_lower or "mbti유형" in query_lower or "mbti설명" in query_lower:
-        logger.info("✅ MBTI 유형 설명으로 분류됨")
-        return "mbti_types"
-    
-    # 다중지능 관련
-    if "다중지능유형설명" in query_lower or "다중지능유형" in query_lower or "다중지능설명" in query_lower or \
-       "다중지능 유형 설명" in query.strip().lower() or "다중지능 유형" in query.strip().lower():
-        logger.info("✅ 다중지능 유형 설명으로 분류됨")
-        return "multi_iq_types"
-    if "다중지능직업" in query_lower or "다중지능추천" in query_lower or \
-       "다중지능 직업" in query.strip().lower() or "다중지능 추천" in query.strip().lower():
-        logger.info("✅ 다중지능 직업 추천으로 분류됨")
-        return "multi_iq_jobs"
-    if "다중지능검사" in query_lower or "다중지능 검사" in query.strip().lower():
-        logger.info("✅ 다중지능 검사로 분류됨")
-        return "multi_iq"
-    if "다중지능" in query_lower:
-        logger.info("✅ 다중지능 전체 설명으로 분류됨")
-        return "multi_iq_full"
-    
-    # 인사말
-    if any(greeting in query_lower for greeting in GREETINGS):
-        logger.info("✅ 인사말로 분류됨")
-        return "conversation"
-    
-    # 기본값: 대화
-    logger.info("✅ 일반 대화로 분류됨")
-    return "conversation"
-
+    return analyze_query(query).intent
 
 
 # @lru_cache(maxsize=100)
@@ -686,4 +701,314 @@ def extract_keywords_for_paper_search(query):
         match = re.search(pattern, query, re.IGNORECASE)
         if match:
             return match.group(1).strip()
-    return ""
\ No newline at end of file
+    return ""
+
+# 캐시 키 정규화 시 제거하는 요청 어미 (결과에 영향 없음)
+QUERY_FILLER_WORDS = ["알려주세요", "알려줘", "보여주세요", "보여줘", "찾아주세요", "찾아줘", "부탁해요", "부탁해"]
+
+PAGE_PATTERNS = [
+    re.compile(r'(\d+)페이지'),
+    re.compile(r'(\d+)번째'),
+    re.compile(r'페이지\s*(\d+)'),
+    re.compile(r'(\d+)p'),
+    re.compile(r'(\d+)$')
+]
+
+def normalize_query(query):
+    """캐시 키용 쿼리 정규화 (소문자, 공백/문장부호/요청 어미 제거)"""
+    normalized = re.sub(r'\s+', '', query.strip().lower())
+    normalized = normalized.rstrip("?!.~")
+    for filler in QUERY_FILLER_WORDS:
+        normalized = normalized.replace(filler, "")
+    return normalized
+
+def extract_district_from_query(query):
+    """쿼리에서 서울시 자치구 추출"""
+    for district in SEOUL_DISTRICTS:
+        if district in query:
+            return district
+    return None
+
+def extract_page_number(query):
+    """쿼리에서 페이지 번호 추출 (기본 1페이지)"""
+    for pattern in PAGE_PATTERNS:
+        match = pattern.search(query)
+        if match:
+            return max(1, int(match.group(1)))
+    return 1
+
+# URL (webpage_analyzer.extract_urls_from_text와 공유)
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# 순서 참조 ("2번째 링크", "첫 번째 결과")
+ORDINAL_PATTERN = re.compile(r'(\d+|첫|두|세|네|다섯|여섯|일곱|여덟|아홉|열)\s*번째')
+ORDINAL_WORDS = {"첫": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10}
+
+# 병원 종류 (구체적인 종류 우선)
+HOSPITAL_TYPES = ["종합병원", "치과병원", "한방병원", "한의원", "병원", "의원"]
+
+# 시설명 추출 시 제거할 단어
+PLACE_NAME_STOPWORDS = {
+    "hospital_search": ["병원", "의원", "치과", "한방", "한의원", "종합병원", "병원명", "병원검색", "병원정보", "서울시", "검색"],
+    "pharmacy_search": ["약국", "약국명", "약국검색", "약국정보", "서울시", "검색"]
+}
+# 형태소 분석 결과에서 시설명이 아닌 일반 명사 / 페이지 번호
+PLACE_NAME_GENERIC_NOUNS = ["어디", "몇", "근처", "주변", "위치", "운영", "운영시간", "시간", "정보", "목록", "페이지", "지금", "오늘", "곳"]
+PAGE_TOKEN_PATTERN = re.compile(r'\d+(?:페이지|p|번째)?')
+_PLACE_NAME_EXCLUDED = {
+    intent: frozenset(stopwords + PLACE_NAME_GENERIC_NOUNS + PHARMACY_KEYWORDS + HOSPITAL_KEYWORDS)
+    for intent, stopwords in PLACE_NAME_STOPWORDS.items()
+}
+
+# 진료과 (형태소 분석기 사전용: "내과의원" -> 내과/의원)
+MEDICAL_DEPARTMENTS = [
+    "내과", "외과", "소아과", "소아청소년과", "산부인과", "피부과", "안과", "이비인후과", "정형외과",
+    "신경외과", "성형외과", "비뇨기과", "비뇨의학과", "정신건강의학과", "재활의학과", "가정의학과", "치과"
+]
+register_nouns(
+    SEOUL_DISTRICTS + HOSPITAL_TYPES + PHARMACY_KEYWORDS + HOSPITAL_KEYWORDS + MEDICAL_DEPARTMENTS + NON_FACILITY_NOUNS
+)
+
+
+def extract_hospital_type(query):
+    """병원 종류 추출 (종합병원/치과병원/한방병원/한의원 > 병원/의원)"""
+    for hospital_type in HOSPITAL_TYPES:
+        if hospital_type in query:
+            return hospital_type
+    return None
+
+
+def _place_name_from_morphemes(morphemes, intent, district=None, hospital_type=None):
+    """형태소 분석 결과의 명사 중 검색 키워드/지역구/병원 종류/일반 명사를 뺀 나머지 (조사, 용언 제외)"""
+    excluded = _PLACE_NAME_EXCLUDED[intent]
+    words = [
+        m.surface for m in morphemes
+        if m.tag == NOUN and m.surface not in excluded and m.surface not in (district, hospital_type)
+        and not PAGE_TOKEN_PATTERN.fullmatch(m.surface)
+    ]
+    name = " ".join(words)
+    return name if len(name) >= 2 else None
+
+
+def extract_place_name(query, intent, district=None, hospital_type=None):
+    """
+    병원/약국 이름 추출 (검색 키워드, 지역구, 병원 종류를 뺀 나머지, 2글자 미만이면 None)
+    형태소 분석기가 준비되어 있으면 명사만 남겨 조사/어미가 붙은 질문("약국이 어디 있어?")에서도 이름만 추출
+    """
+    morphemes = get_morph_analyzer().tokenize(query)
+    if morphemes is not None:
+        return _place_name_from_morphemes(morphemes, intent, district, hospital_type)
+    cleaned_query = query
+    for keyword in PLACE_NAME_STOPWORDS[intent]:
+        cleaned_query = cleaned_query.replace(keyword, "")
+    cleaned_query = cleaned_query.strip()
+    if district:
+        cleaned_query = cleaned_query.replace(district, "")
+    if hospital_type:
+        cleaned_query = cleaned_query.replace(hospital_type, "")
+    cleaned_query = cleaned_query.strip()
+    if len(cleaned_query) < 2:
+        return None
+    return cleaned_query
+
+
+def extract_ordinals(query):
+    """순서 참조 번호 목록 ("2번째", "첫 번째" -> (2, 1))"""
+    return tuple(
+        int(value) if value.isdigit() else ORDINAL_WORDS[value]
+        for value in ORDINAL_PATTERN.findall(query)
+    )
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    쿼리 분석 결과 (불변): 라우터(process_query)와 API 래퍼가 같은 분석 결과를 공유합니다.
+    엔티티는 의도에 필요한 것만 채웁니다 (도시: 날씨/시간, 리그: 순위, 지역구/페이지: 약국/병원/문화행사 등).
+    """
+    query: str
+    intent: str
+    keywords: tuple = ()
+    district: Optional[str] = None
+    city: Optional[str] = None
+    league: Optional[str] = None
+    drug_name: str = ""
+    page: int = 1
+    urls: tuple = ()
+    ordinals: tuple = ()
+    hospital_type: Optional[str] = None
+    place_name: Optional[str] = None
+
+
+def build_query_plan(query, intent, keywords=(), spans=None):
+    """
+    intent에 맞는 엔티티만 추출해서 QueryPlan 생성
+    - spans(classify_query 결과)가 있으면 지역구는 다시 찾지 않고 재사용
+    - 분류 결과와 다른 의도로 API를 호출할 때도 사용 (예: 약국 래퍼에 직접 들어온 쿼리)
+    """
+    fields = {}
+    if intent in ("weather", "tomorrow_weather"):
+        fields["city"] = extract_city_from_query(query)
+    elif intent == "time":
+        fields["city"] = extract_city_from_time_query(query)
+    elif intent in ("league_standings", "league_scorers"):
+        fields["league"] = extract_league_from_query(query)
+    elif intent == "drug":
+        fields["drug_name"] = query.replace("약품검색", "").strip()
+    elif intent in ("pharmacy_search", "hospital_search", "cultural_event"):
+        if spans is not None:
+            fields["district"] = next(iter(_first(spans, SEOUL_DISTRICTS)), None)
+        else:
+            fields["district"] = extract_district_from_query(query)
+        fields["page"] = extract_page_number(query)
+        if intent == "hospital_search":
+            fields["hospital_type"] = extract_hospital_type(query)
+        if intent != "cultural_event":
+            fields["place_name"] = extract_place_name(query, intent, fields["district"], fields.get("hospital_type"))
+    if "http" in query:
+        fields["urls"] = tuple(URL_PATTERN.findall(query))
+    if "번째" in query:
+        fields["ordinals"] = extract_ordinals(query)
+    return QueryPlan(query=query, intent=intent, keywords=tuple(keywords), **fields)
+
+
+class _TransientPlan(Exception):
+    """형태소 분석기가 일시적으로 답하지 못해 키워드 매칭으로 만든 분석 결과 (lru_cache에 남기지 않도록 예외로 전달)"""
+
+    def __init__(self, plan):
+        super().__init__(plan.query)
+        self.plan = plan
+
+
+def analyze_query_uncached(query):
+    """캐시 없이 쿼리를 분석해서 QueryPlan을 반환합니다 (벤치마크용)."""
+    result = classify_query(query)
+    logger.info(f"🔍 쿼리 분석: '{query}' -> {result.intent} (키워드: {', '.join(result.keywords) or '없음'})")
+    return build_query_plan(query, result.intent, result.keywords, result.spans)
+
+
+@lru_cache(maxsize=256)
+def _analyze_query_cached(query):
+    analyzer = get_morph_analyzer()
+    misses = analyzer.transient_misses()
+    plan = analyze_query_uncached(query)
+    if analyzer.transient_misses() != misses:
+        raise _TransientPlan(plan)
+    return plan
+
+
+def analyze_query(query):
+    """
+    쿼리를 한 번만 분석해서 QueryPlan을 반환합니다 (불변 객체라 캐시해서 공유).
+    process_query와 API 래퍼는 문자열을 다시 파싱하지 않고 이 결과를 사용합니다.
+    형태소 분석기 로딩 중/시간 초과로 키워드 매칭만 쓴 결과는 캐시하지 않음 (다음 호출에서 다시 분석)
+    """
+    try:
+        return _analyze_query_cached(query)
+    except _TransientPlan as e:
+        return e.plan
+
+
+def _clear_analysis_caches():
+    """형태소 분석기 준비 전(키워드 매칭만으로) 분석해 둔 결과를 버림"""
+    _analyze_query_cached.cache_clear()
+
+
+get_morph_analyzer().add_ready_callback(_clear_analysis_caches)
+
+
+# 한 질문에 섞인 여러 요청을 나눠서 동시에 처리할 수 있는 의도 (API 조회만, LLM/웹 검색 제외)
+FANOUT_INTENTS = (
+    "weather", "tomorrow_weather", "league_standings", "league_scorers", "cl_knockout",
+    "pharmacy_search", "hospital_search", "cultural_event", "arxiv_search", "pubmed_search"
+)
+# 절을 나누는 연결어 ("서울 날씨랑 EPL 순위", "강남구 약국이랑 병원", "날씨, 문화행사")
+FANOUT_SEPARATOR = re.compile(r',|\s그리고\s|\s및\s|(?:이랑|랑|하고)(?=\s|$)')
+# 질문 전체의 지역구를 이어받는 의도
+DISTRICT_INTENTS = ("pharmacy_search", "hospital_search", "cultural_event")
+
+
+def _clause_intent(clause, has_district):
+    """절 하나의 의도 (FANOUT_INTENTS 중 하나 또는 None)"""
+    spaced = _scan_spaced(clause)
+    compact = _scan_compact(clause)
+    if not _WEB_SEARCH_SET.isdisjoint(compact):
+        return None
+    for intent, keywords, facility in (("pharmacy_search", _PHARMACY_SET, "약국"),
+                                       ("hospital_search", _HOSPITAL_SET, "병원")):
+        if not keywords.isdisjoint(compact) or (facility in compact and has_district):
+            return intent
+    if "문화행사" in spaced or "문화이벤트" in spaced:
+        return "cultural_event"
+    if "날씨" in spaced:
+        return "tomorrow_weather" if TOMORROW_KEYWORD in spaced else "weather"
+    if _first(spaced, CL_KEYWORDS) and _first(spaced, CL_KNOCKOUT_KEYWORDS):
+        return "cl_knockout"
+    if "순위" in clause and extract_league_from_query(clause):
+        return "league_scorers" if "득점" in clause else "league_standings"
+    if _first(spaced, ("공학논문", "arxiv")):
+        return "arxiv_search"
+    if "의학논문" in spaced:
+        return "pubmed_search"
+    return None
+
+
+def plan_fanout(query, plan=None):
+    """
+    여러 요청이 섞인 질문이면 의도별 QueryPlan tuple을, 아니면 빈 tuple을 반환합니다.
+    - 질문을 연결어로 나눈 절마다 의도를 찾고, 서로 다른 의도가 2개 이상일 때만 나눔
+    - 절에 지역구가 없으면 질문 전체의 지역구를 이어받음 ("강남구 약국이랑 병원" -> "강남구 병원")
+    - 명시적 웹 검색("검색해줘")은 나누지 않음
+    """
+    if plan is None:
+        plan = analyze_query(query)
+    if plan.intent == "naver_search":
+        return ()
+    clauses = [clause.strip() for clause in FANOUT_SEPARATOR.split(query) if clause.strip()]
+    if len(clauses) < 2:
+        return ()
+
+    district = plan.district or extract_district_from_query(query)
+    plans = {}
+    for clause in clauses:
+        intent = _clause_intent(clause, district is not None)
+        if intent is None or intent in plans:
+            continue
+        if intent in DISTRICT_INTENTS and district and extract_district_from_query(clause) is None:
+            clause = f"{district} {clause}"
+        plans[intent] = build_query_plan(clause, intent)
+    if len(plans) < 2:
+        return ()
+    logger.info(f"🔀 복합 질문 분리: '{query}' -> {[(p.intent, p.query) for p in plans.values()]}")
+    return tuple(plans.values())
+
+
+def build_query_cache_key(query, query_type=None, plan=None):
+    """
+    프로세스/재시작과 무관하게 동일한 캐시 키 생성
+    - 정규화된 쿼리 + 의도 + 추출된 엔티티(도시, 지역구, 리그, 페이지)의 안정적인 digest
+    - 파이썬 hash()는 프로세스마다 salt가 달라 디스크 캐시가 적중하지 않음
+    """
+    if plan is None:
+        plan = analyze_query(query)
+    if query_type is None:
+        query_type = plan.intent
+    elif query_type != plan.intent:
+        plan = build_query_plan(query, query_type)
+
+    entities = {}
+    if query_type in ("weather", "tomorrow_weather", "time"):
+        entities["city"] = plan.city
+    elif query_type in ("league_standings", "league_scorers"):
+        entities["league"] = plan.league
+    elif query_type in ("pharmacy_search", "hospital_search", "cultural_event"):
+        entities["district"] = plan.district
+        entities["page"] = plan.page
+
+    payload = json.dumps(
+        {"q": normalize_query(query), "intent": query_type, "entities": entities},
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return f"query:{query_type}:{digest}"
@@ -0,0 +1,97 @@
+# utils/singleflight.py
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.cache import NegativeResult
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 upstream 호출을 하나로 합칩니다.
+    - 첫 호출자가 실제로 가져오고, 동시에 들어온 호출자는 같은 Future 결과를 기다림
+    - 호출이 끝나면 키를 해제 (결과 보관은 캐시의 역할)
+    - refresh: stale 항목의 백그라운드 갱신 (같은 키는 한 번만 진행)
+    """
+
+    def __init__(self, refresh_workers=4):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            logger.info(f"동일 요청 대기 (single-flight): {key}")
+            return future.result()
+        return self._run(key, fn, future)
+
+    def refresh(self, key, fn):
+        """fn을 백그라운드에서 실행합니다. 이미 진행 중인 키면 아무것도 하지 않습니다."""
+        with self._lock:
+            if key in self._calls:
+                return False
+            future = Future()
+            self._calls[key] = future
+        logger.info(f"🔄 stale 캐시 백그라운드 갱신: {key}")
+        self._refresh_executor.submit(self._run_quietly, key, fn, future)
+        return True
+
+    def _run_quietly(self, key, fn, future):
+        try:
+            self._run(key, fn, future)
+        except Exception as e:
+            # 갱신 실패 시 기존 stale 값이 hard TTL까지 계속 제공됨
+            logger.error(f"백그라운드 갱신 실패 ({key}): {str(e)}")
+
+    def _run(self, key, fn, future):
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self):
+        """현재 진행 중인 키 개수"""
+        with self._lock:
+            return len(self._calls)
+
+
+# utils/* API 클래스가 공유하는 인스턴스
+single_flight = SingleFlight()
+
+
+def cached_call(cache, key, loader):
+    """
+    캐시 조회 후 미스면 single-flight로 loader를 실행합니다.
+    loader는 결과를 캐시에 저장할지 스스로 결정합니다 (오류 응답은 저장하지 않음).
+    soft TTL이 지난 값은 즉시 반환하고 loader를 백그라운드에서 실행합니다 (stale-while-revalidate).
+    캐싱된 NegativeResult는 저장된 message로 반환합니다.
+    """
+    if cache is not None:
+        get_with_state = getattr(cache, "get_with_state", None)
+        if get_with_state is not None:
+            cached, is_stale = get_with_state(key)
+        else:
+            cached, is_stale = cache.get(key), False
+        if cached is not None:
+            if is_stale:
+                single_flight.refresh(key, loader)
+            if isinstance(cached, NegativeResult):
+                return cached.message
+            return cached
+    return single_flight.do(key, loader)
@@ -239,13 +239,19 @@ from requests.adapters import HTTPAdapter, Retry
 from functools import lru_cache
 from datetime import datetime, timedelta
 import pytz
+from utils.cache import NegativeResult, namespace_ttl
+from utils.singleflight import cached_call
 
 logger = logging.getLogger(__name__)
 
 class WeatherAPI:
-    def __init__(self, cache_handler, WEATHER_API_KEY, cache_ttl=600):
+    def __init__(self, cache_handler, WEATHER_API_KEY, cache_ttl=None, negative_ttl=600):
+        # cache_ttl: {"city_search" | "weather" | "forecast": ttl 또는 (soft, hard)},
+        #            숫자/튜플 하나면 모든 namespace에 같은 TTL, None이면 namespace별 기본값
+        namespace_ttl(cache_ttl, "weather", None)  # 지원하지 않는 형식은 생성 시점에 TypeError
         self.cache = cache_handler
         self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
         self.WEATHER_API_KEY = WEATHER_API_KEY
         self.base_url = "https://api.openweathermap.org/data/2.5"
         self.geo_url = "https://api.openweathermap.org/geo/1.0"
@@ -273,17 +279,17 @@ class WeatherAPI:
         data = self.fetch_weather(url, params)
         if data and isinstance(data, list) and len(data) > 0:
             city_info = {"name": data[0]["name"], "lat": data[0]["lat"], "lon": data[0]["lon"]}
-            self.cache.setex(cache_key, 86400, city_info)
+            self.cache.setex(cache_key, namespace_ttl(self.cache_ttl, "city_search", 86400), city_info)
             return city_info
         return None
 
     def search_city_by_name(self, city_name):
         """OpenWeatherMap Geocoding API로 도시 검색 (메인 메서드)"""
         cache_key = f"city_search:{city_name}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_city(city_name, cache_key))
+    
+    def _fetch_city(self, city_name, cache_key):
+        """Geocoding API 호출 결과를 캐시에 저장합니다."""
         try:
             url = f"{self.geo_url}/direct"
             params = {
@@ -307,8 +313,11 @@ class WeatherAPI:
                     "search_name": f"{result.get('name')},{result.get('country')}"
                 }
                 
-                self.cache.setex(cache_key, 86400, city_info)  # 24시간 캐싱
+                self.cache.setex(cache_key, namespace_ttl(self.cache_ttl, "city_search", 86400), city_info)  # 24시간 캐싱
                 return city_info
+
+            # 존재하지 않는 도시명은 짧게 캐싱 (요청 실패는 캐싱하지 않음)
+            self.cache.setex(cache_key, self.negative_ttl, NegativeResult())
             
         except Exception as e:
             logger.error(f"City search error for '{city_name}': {str(e)}")
@@ -318,10 +327,10 @@ class WeatherAPI:
     def get_city_weather(self, city_input):
         """도시 날씨를 가져옵니다 (자동 지명 검색)"""
         cache_key = f"weather:{city_input}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_city_weather(city_input, cache_key))
+    
+    def _fetch_city_weather(self, city_input, cache_key):
+        """현재 날씨를 조회/포맷팅하고 캐시에 저장합니다."""
         try:
             # 1. 도시 검색 (한국어/영어 자동 처리)
             city_info = self.search_city_by_name(city_input)
@@ -346,7 +355,7 @@ class WeatherAPI:
             # 3. 날씨 데이터 포맷팅
             result = self.format_weather_data(data, city_input, city_info)
             
-            self.cache.setex(cache_key, 1800, result)  # 30분 캐싱
+            self.cache.setex(cache_key, namespace_ttl(self.cache_ttl, "weather", 1800), result)  # 30분 캐싱
             return result
             
         except Exception as e:
@@ -356,10 +365,10 @@ class WeatherAPI:
     def get_forecast_by_day(self, city_input, days=1):
         """도시의 일기예보를 가져옵니다"""
         cache_key = f"forecast:{city_input}:{days}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_forecast(city_input, days, cache_key))
+    
+    def _fetch_forecast(self, city_input, days, cache_key):
+        """일기예보를 조회/포맷팅하고 캐시에 저장합니다."""
         try:
             # 1. 도시 검색
             city_info = self.search_city_by_name(city_input)
@@ -384,7 +393,7 @@ class WeatherAPI:
             # 3. 예보 데이터 포맷팅
             result = self.format_forecast_data(data, city_input, city_info, days)
             
-            self.cache.setex(cache_key, 3600, result)  # 1시간 캐싱
+            self.cache.setex(cache_key, namespace_ttl(self.cache_ttl, "forecast", 3600), result)  # 1시간 캐싱
             return result
             
         except Exception as e:
@@ -6,15 +6,18 @@ import logging
 from datetime import datetime
 import uuid
 import streamlit as st
+from utils.cache import NegativeResult
+from utils.singleflight import cached_call
 
 logger = logging.getLogger(__name__)
 
 class WebSearchAPI:
-    def __init__(self, client_id, client_secret, cache_handler, cache_ttl=3600, daily_limit=25000):
+    def __init__(self, client_id, client_secret, cache_handler, cache_ttl=3600, daily_limit=25000, negative_ttl=600):
         self.client_id = client_id
         self.client_secret = client_secret
         self.cache = cache_handler
         self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
         self.daily_limit = daily_limit
         self.request_count = 0
         self.base_url = "https://openapi.naver.com/v1/search/webkr"
@@ -34,10 +37,10 @@ class WebSearchAPI:
     def search_web(self, query, display=5, sort="date"):
         """Naver API를 사용하여 웹 검색을 수행합니다."""
         cache_key = f"naver:{query}:{display}:{sort}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            return cached
-        
+        return cached_call(self.cache, cache_key, lambda: self._fetch_search_results(query, display, sort, cache_key))
+    
+    def _fetch_search_results(self, query, display, sort, cache_key):
+        """Naver API를 호출하고 결과를 캐시에 저장합니다."""
         if self.is_over_limit():
             return "검색 한도 초과로 결과를 가져올 수 없습니다. 😓"
         
@@ -57,7 +60,10 @@ class WebSearchAPI:
                 results = data.get('items', [])
                 
                 if not results:
-                    return "검색 결과가 없습니다. 😓"
+                    # 결과 없음은 짧게 캐싱해서 일일 한도 소모 방지
+                    message = "검색 결과가 없습니다. 😓"
+                    self.cache.setex(cache_key, self.negative_ttl, NegativeResult(message))
+                    return message
                 
                 formatted_result = self.format_search_results(results)
                 self.cache.setex(cache_key, self.cache_ttl, formatted_result)
@@ -6,6 +6,7 @@ import xml.etree.ElementTree as ET  # 누락된 import 추가
 from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup
+from utils.query_analyzer import URL_PATTERN
 
 # PyPDF2 조건부 import
 try:
@@ -371,9 +372,7 @@ def summarize_webpage_content(url, user_query="", client=None):
 
 def extract_urls_from_text(text):
     """텍스트에서 URL을 추출합니다"""
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls = re.findall(url_pattern, text)
-    return urls
+    return URL_PATTERN.findall(text)
 
 def is_url_summarization_request(query):
     """URL 요약 요청인지 확인합니다"""